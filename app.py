@@ -2,72 +2,456 @@
 Daily AI Research Feed - Main Application
 A beautiful web application for browsing the latest AI research papers from arXiv
 """
-from fasthtml.common import *
-from backend import PaperService
+import asyncio
+import json
+import os
+from datetime import date
+from email.utils import parsedate_to_datetime
+from fasthtml.common import (
+    FastHTML, Div, EventStream, HttpHeader, JSONResponse, Link, Middleware, Pre, RedirectResponse, Response,
+    StreamingResponse, Style, Titled, serve, signal_shutdown
+)
+from backend import PaperService, SnapshotError
+from backend.serializer import API_FIELDS, encode_cursor, decode_cursor
+from backend.tracing import Tracer, FileSpanExporter, ServerTimingMiddleware, set_tracer, span
+from backend.profiler import SamplingProfiler
 from frontend import (
     create_paper_card, create_stats_section, create_empty_stats_section,
-    create_filter_section, create_empty_papers_message, get_app_styles
+    create_filter_section, create_empty_papers_message, create_related_papers,
+    create_refresh_status, create_feed_header, create_saved_feeds_section, get_app_styles, get_live_updates_script, stream_page, LiveFeed
 )
 
-# Initialize FastHTML app with custom styles
-app, rt = fast_app(hdrs=[get_app_styles()])
+# PicoCSS as fast_app would add it; fast_app itself imports fasthtml.pico, which pulls in IPython
+PICO_HEADERS = (Link(rel="stylesheet", href="https://cdn.jsdelivr.net/npm/@anyblades/pico@latest/css/pico.min.css"),
+                Style(":root { --pico-font-size: 100%; }"))
+
+# Export spans as OTLP/JSON lines to this file; tracing is a no-op when unset
+TRACE_FILE = os.environ.get('TRACE_FILE')
+if TRACE_FILE:
+    set_tracer(Tracer(FileSpanExporter(TRACE_FILE)))
+
+# Expose the on-demand sampling profiler at /debug/profile
+PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED') == '1'
+profiler = SamplingProfiler()
+
+# Number of uvicorn worker processes; more than one enables the shared cache
+WEB_WORKERS = int(os.environ.get('WEB_WORKERS', '1'))
+
+# Auto-reload on code changes; disable in containers to keep startup lean
+RELOAD = os.environ.get('RELOAD', '1') == '1'
+
+# SQLite file shared by all workers; only one lease-holding worker fetches from arXiv
+SHARED_CACHE_PATH = os.environ.get('SHARED_CACHE_PATH')
+
+# Memory-map the related-papers embedding matrix to this file; kept in memory when unset
+EMBEDDINGS_PATH = os.environ.get('EMBEDDINGS_PATH')
+
+# arXiv API endpoint; point at a mock server for load tests
+ARXIV_API_URL = os.environ.get('ARXIV_API_URL')
+
+# Minimum seconds between refreshes; /refresh requests inside this window are throttled
+REFRESH_MIN_INTERVAL_SECONDS = float(os.environ.get('REFRESH_MIN_INTERVAL_SECONDS', '60'))
+
+# SQLite file holding saved feed definitions; their results are recomputed per cache generation.
+# Saved feeds are disabled when unset
+SAVED_FEEDS_PATH = os.environ.get('SAVED_FEEDS_PATH')
+
+# Binary cache snapshot loaded at startup and rewritten after every fetch; unset disables both
+CACHE_SNAPSHOT_PATH = os.environ.get('CACHE_SNAPSHOT_PATH')
+
+# Memory budget in MB for the cached papers and the structures derived from them; unbounded when unset
+CACHE_MEMORY_BUDGET_MB = os.environ.get('CACHE_MEMORY_BUDGET_MB')
 
-# Initialize services
-paper_service = PaperService(cache_duration_minutes=30)
+# Papers evicted first when over budget: lru (least recently served), lfu (least often served) or age
+CACHE_EVICTION_POLICY = os.environ.get('CACHE_EVICTION_POLICY', 'lru')
+
+# Services are built by start_services when a server process starts; importing app.py builds nothing,
+# so the parent of a multi-worker server never fetches or watches the cache itself
+paper_service = None
+live_feed = None
+
+
+async def start_services():
+    """Build the paper service, seed it from the snapshot and start live updates"""
+    global paper_service, live_feed
+    paper_service = PaperService(cache_duration_minutes=30, shared_cache_path=SHARED_CACHE_PATH,
+                                 embeddings_path=EMBEDDINGS_PATH, arxiv_api_url=ARXIV_API_URL,
+                                 refresh_min_interval_seconds=REFRESH_MIN_INTERVAL_SECONDS,
+                                 saved_feeds_path=SAVED_FEEDS_PATH,
+                                 snapshot_path=CACHE_SNAPSHOT_PATH,
+                                 memory_budget_bytes=int(float(CACHE_MEMORY_BUDGET_MB) * 1024 * 1024)
+                                 if CACHE_MEMORY_BUDGET_MB else None,
+                                 eviction_policy=CACHE_EVICTION_POLICY)
+    await asyncio.to_thread(paper_service.warm_start)
+    
+    # Push the cards of newly arrived papers to open pages over /events
+    live_feed = LiveFeed(paper_service, shutdown_event=signal_shutdown())
+
+
+# Initialize FastHTML app with custom styles; every response reports its stages in Server-Timing
+app = FastHTML(hdrs=[*PICO_HEADERS, get_app_styles(), get_live_updates_script()],
+               middleware=[Middleware(ServerTimingMiddleware)], on_startup=[start_services])
+app.static_route_exts()
+rt = app.route
+
+# Number of paper cards flushed per chunk when streaming the home page
+STREAM_CHUNK_SIZE = 25
+
+# Page size limits for the JSON API
+API_DEFAULT_LIMIT = 50
+API_MAX_LIMIT = 500
 
 
 @rt("/")
-def home(category: str = None):
+def home(req, category: str = None, retry_after: int = None):
     """Main page - display papers with optional category filtering"""
-    # Get papers from service
-    papers = paper_service.get_papers()
+    # Get papers from service; the snapshot's columnar table serves the category filter
+    all_papers = paper_service.get_snapshot().papers
     
     # Filter papers by category if specified
+    papers = all_papers
     if category and category != 'all':
         papers = paper_service.filter_papers_by_category(papers, category)
     
+    paper_service.record_access(papers)
+    
     # Get stats
     total_papers = len(papers)
-    all_papers = paper_service.get_papers()  # Get all papers for stats
     all_papers_count = len(all_papers)
     categories = paper_service.get_all_categories(all_papers)
     cache_info = paper_service.get_cache_info()
     
+    # While a refresh is in flight the page polls until the next generation lands
+    refreshing_since = cache_info['generation'] if paper_service.is_refreshing() else None
+    
     # Handle empty state
     if not all_papers:
         return Titled("Daily AI Research Feed",
-            create_empty_stats_section()
+            create_empty_stats_section(refreshing_since, retry_after)
         )
     
-    # Create main page
-    return Titled("Daily AI Research Feed",
+    sections = (
         # Stats section with glittery header
         create_stats_section(
             total_papers=total_papers,
             all_papers_count=all_papers_count,
             categories_count=len(categories),
             cache_age_minutes=cache_info['age_minutes'],
-            category=category
+            category=category,
+            refreshing_since=refreshing_since,
+            retry_after=retry_after
         ),
         
         # Filter section
         create_filter_section(categories, category),
-        
-        # Papers list (single column)
-        Div(
-            *[create_paper_card(paper) for paper in papers] if papers else [
+    )
+    
+    # htmx partial requests keep the regular in-memory render
+    if 'hx-request' in req.headers:
+        with span("render.cards", papers=len(papers)):
+            cards = [create_paper_card(paper) for paper in papers] if papers else [
                 create_empty_papers_message()
-            ],
-            cls="grid-container"
+            ]
+        return Titled("Daily AI Research Feed",
+            *sections,
+            Div(*cards, cls="grid-container", data_generation=cache_info['generation'])
         )
+    
+    # Full page loads flush the head and header sections first, then stream cards in chunks
+    return StreamingResponse(
+        stream_page(req, "Daily AI Research Feed", sections, papers, chunk_size=STREAM_CHUNK_SIZE,
+                    generation=cache_info['generation']),
+        media_type="text/html; charset=utf-8"
+    )
+
+
+@rt("/api/papers")
+def api_papers(req, category: str = None, since: str = None, until: str = None, q: str = None,
+               fields: str = None, cursor: str = None, limit: int = API_DEFAULT_LIMIT,
+               sort: str = None, order: str = 'desc'):
+    """JSON / NDJSON feed of cached papers with filtering, field selection and cursor pagination"""
+    try:
+        since_date = date.fromisoformat(since) if since else None
+        until_date = date.fromisoformat(until) if until else None
+        offset, cursor_generation = decode_cursor(cursor) if cursor else (0, None)
+    except ValueError as e:
+        return JSONResponse({'error': f"Invalid parameter: {e}"}, status_code=400)
+    
+    selected_fields = [f.strip() for f in fields.split(',') if f.strip()] if fields else None
+    unknown = [f for f in selected_fields or [] if f not in API_FIELDS]
+    if unknown:
+        return JSONResponse({'error': f"Unknown fields: {', '.join(unknown)}"}, status_code=400)
+    
+    fmt = req.query_params.get('format')
+    ndjson = fmt == 'ndjson' or 'application/x-ndjson' in req.headers.get('accept', '')
+    
+    snapshot = paper_service.get_snapshot()
+    
+    # Offsets only line up within one generation; a client must restart rather than skip or repeat papers
+    if cursor_generation is not None and cursor_generation != snapshot.generation:
+        return JSONResponse({'error': "The cursor belongs to an older cache generation; "
+                                      "restart from the first page", 'generation': snapshot.generation},
+                            status_code=409)
+    
+    # The response only depends on the cache generation, the query string and the negotiated format
+    etag = snapshot.etag(req.url.query, 'ndjson' if ndjson else 'json')
+    headers = {'ETag': etag, 'Cache-Control': 'no-cache', 'Vary': 'Accept'}
+    if req.headers.get('if-none-match') == etag:
+        return Response(status_code=304, headers=headers)
+    
+    with span("api.select"):
+        try:
+            indices = snapshot.select(category, since_date, until_date, q,
+                                      sort_by=sort, descending=order != 'asc')
+        except ValueError as e:
+            return JSONResponse({'error': str(e)}, status_code=400)
+    
+    # NDJSON streams every match unless the client pages it with limit or cursor
+    if ndjson and 'limit' not in req.query_params and not cursor:
+        page, next_cursor = indices, None
+    else:
+        limit = max(1, min(limit, API_MAX_LIMIT))
+        page = indices[offset:offset + limit]
+        next_cursor = encode_cursor(offset + limit, snapshot.generation) if offset + limit < len(indices) else None
+    paper_service.record_access(snapshot.papers[i] for i in page)
+    
+    if ndjson:
+        # Lines carry papers only, so the next page's cursor travels in a header
+        if next_cursor:
+            headers['X-Next-Cursor'] = next_cursor
+        return StreamingResponse(snapshot.iter_ndjson(page, selected_fields),
+                                 media_type="application/x-ndjson", headers=headers)
+    
+    with span("render.json", papers=len(page)):
+        body = snapshot.render_json(page, selected_fields, next_cursor=next_cursor, total=len(indices))
+    return Response(body, media_type="application/json", headers=headers)
+
+
+@rt("/related")
+def related(arxiv_id: str, k: int = 5):
+    """Card fragment listing the papers most similar to `arxiv_id`"""
+    related_papers = paper_service.get_related_papers(arxiv_id, max(1, min(k, 20)))
+    with span("render.related"):
+        return create_related_papers(related_papers, pending=paper_service.is_embedding())
+
+
+@rt("/api/papers/related")
+def api_related(arxiv_id: str, k: int = 10):
+    """JSON list of the papers most similar to `arxiv_id` with cosine similarities"""
+    related_papers = paper_service.get_related_papers(arxiv_id, max(1, min(k, 100)))
+    return JSONResponse({
+        'arxiv_id': arxiv_id,
+        'pending': not related_papers and paper_service.is_embedding(),
+        'related': [
+            {'arxiv_id': paper.get('arxiv_id'), 'title': paper.get('title'), 'score': round(score, 4)}
+            for paper, score in related_papers
+        ]
+    })
+
+
+def saved_feeds_page(error: str = None):
+    """Render the saved feeds list and form"""
+    categories = paper_service.get_all_categories(paper_service.get_snapshot().papers)
+    return Titled("Saved Feeds", create_saved_feeds_section(paper_service.list_saved_feeds(), categories, error))
+
+
+@rt("/feeds", methods=["get"])
+def list_feeds():
+    """Saved feeds and a form to create one"""
+    return saved_feeds_page()
+
+
+@rt("/feeds", methods=["post"])
+def create_feed(name: str = '', categories: list[str] = None, keywords: str = '', authors: str = ''):
+    """Save a feed from the form and open it"""
+    try:
+        saved = paper_service.save_feed(name, categories or [], keywords.splitlines(), authors.splitlines())
+    except ValueError as e:
+        return saved_feeds_page(str(e))
+    return RedirectResponse(f"/feeds/{saved['id']}", status_code=303)
+
+
+@rt("/feeds/{feed_id}", methods=["get"])
+def show_feed(req, feed_id: int):
+    """Personalized page served from the feed's precomputed results"""
+    result = paper_service.get_saved_feed(feed_id)
+    if result is None:
+        return Response("No such feed", status_code=404)
+    saved, papers = result
+    sections = (create_feed_header(saved, len(papers)),)
+    return StreamingResponse(
+        stream_page(req, f"{saved['name']} - Daily AI Research Feed", sections, papers,
+                    chunk_size=STREAM_CHUNK_SIZE),
+        media_type="text/html; charset=utf-8"
     )
 
 
-@rt("/refresh")
-def refresh():
-    """Force refresh papers from API"""
-    paper_service.get_papers(force_refresh=True)
-    return RedirectResponse("/", status_code=303)
+@rt("/feeds/{feed_id}/delete", methods=["post"])
+def delete_feed(feed_id: int):
+    """Delete a saved feed"""
+    paper_service.delete_feed(feed_id)
+    return RedirectResponse("/feeds", status_code=303)
+
+
+@rt("/api/feeds", methods=["get"])
+def api_list_feeds():
+    """JSON list of saved feeds with their match counts"""
+    return JSONResponse({'feeds': [{**saved, 'count': count} for saved, count in paper_service.list_saved_feeds()]})
+
+
+def parse_feed_body(data) -> dict:
+    """Check a saved feed JSON body: a string name and lists of strings; raises ValueError otherwise"""
+    if not isinstance(data, dict):
+        raise ValueError("Expected a JSON object")
+    name = data.get('name', '')
+    if not isinstance(name, str):
+        raise ValueError("'name' must be a string")
+    fields = {'name': name}
+    for field in ('categories', 'keywords', 'authors'):
+        values = data.get(field, [])
+        if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+            raise ValueError(f"'{field}' must be a list of strings")
+        fields[field] = values
+    return fields
+
+
+async def api_create_feed(req):
+    """Create a saved feed from a JSON body with name, categories, keywords and authors"""
+    try:
+        data = json.loads(await req.body())
+    except ValueError:
+        return JSONResponse({'error': "Invalid JSON body"}, status_code=400)
+    try:
+        fields = parse_feed_body(data)
+        saved = await asyncio.to_thread(
+            paper_service.save_feed, fields['name'], fields['categories'],
+            fields['keywords'], fields['authors']
+        )
+    except ValueError as e:
+        return JSONResponse({'error': str(e)}, status_code=400)
+    return JSONResponse(saved, status_code=201, headers={'Location': f"/api/feeds/{saved['id']}"})
+
+
+# A plain Starlette route: fasthtml routes parse JSON bodies before the handler runs, so a
+# malformed body would fail with a 500 before it could be rejected here
+app.router.add_route("/api/feeds", api_create_feed, methods=["POST"])
+
+
+@rt("/api/feeds/{feed_id}", methods=["get"])
+def api_feed(feed_id: int):
+    """A saved feed's definition and its precomputed arXiv ids in cache order"""
+    result = paper_service.get_saved_feed(feed_id)
+    if result is None:
+        return JSONResponse({'error': "No such feed"}, status_code=404)
+    saved, papers = result
+    return JSONResponse({**saved, 'generation': paper_service.cache_manager.get_generation(),
+                         'arxiv_ids': [paper.get('arxiv_id') for paper in papers]})
+
+
+@rt("/api/feeds/{feed_id}", methods=["delete"])
+def api_delete_feed(feed_id: int):
+    """Delete a saved feed"""
+    if not paper_service.delete_feed(feed_id):
+        return JSONResponse({'error': "No such feed"}, status_code=404)
+    return Response(status_code=204)
+
+
+@rt("/feed.xml")
+def feed(req, category: str = None):
+    """Atom feed of cached papers, optionally for a single category"""
+    document = paper_service.get_feed(category, base_url=str(req.base_url))
+    headers = {'ETag': document.etag, 'Last-Modified': document.last_modified, 'Cache-Control': 'no-cache'}
+    
+    # Conditional requests: ETag takes precedence over If-Modified-Since
+    if_none_match = req.headers.get('if-none-match')
+    if if_none_match is not None:
+        if if_none_match == document.etag:
+            return Response(status_code=304, headers=headers)
+    elif req.headers.get('if-modified-since'):
+        try:
+            if document.updated <= parsedate_to_datetime(req.headers['if-modified-since']):
+                return Response(status_code=304, headers=headers)
+        except (TypeError, ValueError):
+            pass
+    
+    return Response(document.xml, media_type="application/atom+xml; charset=utf-8", headers=headers)
+
+
+# fast_app registers a static file route for *.xml first; give the feed route priority over it
+app.routes.insert(0, app.routes.pop())
+
+
+@rt("/refresh", methods=["post"])
+def refresh(req, reload: bool = False):
+    """Submit a background refresh, coalesced with any in-flight fetch and throttled"""
+    result = paper_service.request_refresh()
+    throttled = result['status'] == 'throttled'
+    headers = {'Retry-After': str(result['retry_after_seconds'])} if throttled else {}
+    
+    if 'application/json' in req.headers.get('accept', ''):
+        return JSONResponse(result, status_code=429 if throttled else 202, headers=headers)
+    
+    # htmx swaps the indicator in place; it only swaps 2xx replies, so throttling is shown with a 200
+    if 'hx-request' in req.headers:
+        if throttled:
+            return (create_refresh_status(result['generation'], refreshing=False,
+                                          retry_after=result['retry_after_seconds']),
+                    HttpHeader('Retry-After', headers['Retry-After']))
+        return create_refresh_status(result['generation'], reload=reload)
+    
+    # Plain form posts land back on the page, which polls /refresh/status or shows the wait
+    return RedirectResponse(f"/?retry_after={result['retry_after_seconds']}" if throttled else "/", status_code=303)
+
+
+@rt("/refresh/status")
+def refresh_status(req, since: int = None, reload: bool = False):
+    """Report whether a newer generation than `since` has landed"""
+    generation = paper_service.cache_manager.get_generation()
+    refreshing = paper_service.is_refreshing()
+    updated = since is not None and generation > since
+    
+    if 'hx-request' not in req.headers:
+        return JSONResponse({'generation': generation, 'refreshing': refreshing, 'updated': updated})
+    # New cards reach the page over /events; only pages without a card grid reload
+    if updated and reload:
+        return Response(status_code=204, headers={'HX-Refresh': 'true'})
+    return create_refresh_status(generation if since is None else since, refreshing, updated, reload)
+
+
+@rt("/events")
+async def events(req, category: str = None, since: int = None):
+    """Server-sent events carrying the cards of papers added by each new cache generation"""
+    last_event_id = req.headers.get('last-event-id', '')
+    if last_event_id.isdigit():
+        since = max(since or 0, int(last_event_id))
+    return EventStream(live_feed.stream(category, since))
+
+
+def snapshot_etag(generation: int, compression: str) -> str:
+    """ETag of the snapshot of one cache generation in one compression"""
+    return f'"snapshot-{generation}-{compression}"'
+
+
+@rt("/api/snapshot")
+def api_snapshot(req, compression: str = 'gzip'):
+    """Binary snapshot of the latest cache generation, for seeding another host"""
+    # A client that already holds this generation is answered before anything is encoded
+    if req.headers.get('if-none-match') == snapshot_etag(paper_service.cache_manager.get_generation(), compression):
+        return Response(status_code=304, headers={'ETag': req.headers['if-none-match']})
+    try:
+        generation, body = paper_service.export_snapshot_bytes(compression)
+    except SnapshotError as e:
+        return JSONResponse({'error': str(e)}, status_code=400)
+    return Response(body, media_type="application/octet-stream", headers={
+        'Content-Disposition': 'attachment; filename="cache.snapshot"',
+        'ETag': snapshot_etag(generation, compression)
+    })
+
+
+@rt("/healthz")
+def healthz():
+    """Liveness check that never touches arXiv or the cache contents"""
+    return JSONResponse({'status': 'ok', 'generation': paper_service.cache_manager.get_generation()})
 
 
 @rt("/debug")
@@ -75,6 +459,9 @@ def debug():
     """Debug endpoint to check cache status"""
     cache_info = paper_service.get_cache_info()
     papers = paper_service.get_papers()
+    upstream = paper_service.get_upstream_status()
+    breaker = upstream['circuit_breaker']
+    limiter = upstream['rate_limiter']
     
     debug_info = f"""
 Cache Status:
@@ -83,10 +470,70 @@ Cache Status:
 - Cache age: {cache_info['age_minutes']} minutes
 - Cache valid: {cache_info['is_valid']}
 - Papers count: {cache_info['papers_count']}
+- Generation: {cache_info['generation']}
+
+arXiv Upstream:
+- Circuit breaker: {breaker['state']}
+- Consecutive failures: {breaker['failures']}
+- Retry in: {breaker['retry_in_seconds'] if breaker['retry_in_seconds'] is not None else '-'} seconds
+- Last error: {breaker['last_error'] or 'none'}
+- Rate limit tokens: {limiter['tokens']}/{limiter['capacity']} ({limiter['rate_per_second']:.2f}/s)
+"""
+    memory = cache_info['memory']
+    budget = f"{memory['budget_bytes']:,} bytes" if memory['budget_bytes'] is not None else 'unbounded'
+    derived = ", ".join(f"{name} {size:,}" for name, size in memory['derived_bytes'].items())
+    debug_info += f"""
+Cache Memory:
+- Total: {memory['total_bytes']:,} bytes of {budget}
+- Papers: {memory['papers_bytes']:,} bytes
+- Derived: {derived or 'none'}
+- Eviction policy: {memory['policy']}
+- Evictions: {memory['evictions']} ({memory['evicted_papers']} papers, {memory['evicted_bytes']:,} bytes; last {memory['last_evicted_papers']} papers)
+"""
+    live = live_feed.get_status()
+    debug_info += f"""
+Live Updates:
+- Subscribers: {live['subscribers']} across {live['topics']} topics
+- Watched generation: {live['generation'] if live['generation'] is not None else '-'}
+- Events published: {live['published']} (buffer overflows: {live['overflows']})
+"""
+    if paper_service.saved_feeds is not None:
+        feeds = paper_service.saved_feeds.get_status()
+        debug_info += f"""
+Saved Feeds:
+- Feeds: {feeds['feeds']} ({feeds['matches']} precomputed matches)
+- Evaluated generation: {feeds['generation'] if feeds['generation'] is not None else '-'}
+- Last update: {feeds['last_sync_ms']} ms
+"""
+    if 'shared_store' in cache_info:
+        debug_info += f"""
+Shared Cache:
+- Store: {cache_info['shared_store']}
+- Worker: {cache_info['worker']}
+- Fetcher: {cache_info['fetcher'] or 'none'}
 """
     
     return Pre(debug_info)
 
 
+@rt("/debug/profile")
+def debug_profile(seconds: float = 5.0):
+    """Sample all threads for a few seconds and return collapsed stacks for a flame graph"""
+    if not PROFILING_ENABLED:
+        return Response("Profiling is disabled; set PROFILING_ENABLED=1", status_code=404)
+    try:
+        stacks = profiler.profile(max(0.1, min(seconds, 60.0)))
+    except RuntimeError as e:
+        return Response(str(e), status_code=409)
+    return Response(stacks, media_type="text/plain")
+
+
 if __name__ == "__main__":
-    serve()
\ No newline at end of file
+    if WEB_WORKERS > 1:
+        import uvicorn
+        # The parent only supervises; workers import this module afresh, pick the store up from the
+        # environment and build their services on startup
+        os.environ.setdefault('SHARED_CACHE_PATH', 'data/cache.sqlite3')
+        uvicorn.run("app:app", host="0.0.0.0", port=int(os.environ.get('PORT', 5001)), workers=WEB_WORKERS)
+    else:
+        serve(reload=RELOAD)
\ No newline at end of file
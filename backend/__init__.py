@@ -4,5 +4,23 @@ Backend package for Daily AI Research Feed
 from .paper_service import PaperService
 from .arxiv_service import ArxivService
 from .cache_manager import CacheManager
+from .eviction import EvictionPolicy, LRUPolicy, LFUPolicy, AgePolicy, make_eviction_policy
+from .serializer import PaperSnapshot
+from .feed_builder import AtomFeedBuilder
+from .sqlite_store import SQLiteStore
+from .shared_cache import SharedCacheManager, SharedStore
+from .resilience import ArxivFetchError, CircuitBreaker, TokenBucket
+from .columnar import PaperTable
+from .embeddings import EmbeddingIndex
+from .broadcast import Broadcaster
+from .backfill import BackfillJob, CorpusStore
+from .saved_feeds import FeedStore, SavedFeeds
+from .snapshot import SnapshotError, load_snapshot, write_snapshot
+from .tracing import Tracer, FileSpanExporter, get_tracer, set_tracer
 
-__all__ = ['PaperService', 'ArxivService', 'CacheManager']
\ No newline at end of file
+__all__ = ['PaperService', 'ArxivService', 'CacheManager', 'EvictionPolicy', 'LRUPolicy', 'LFUPolicy', 'AgePolicy',
+           'make_eviction_policy', 'PaperSnapshot', 'PaperTable', 'EmbeddingIndex',
+           'AtomFeedBuilder', 'SQLiteStore', 'SharedCacheManager', 'SharedStore', 'ArxivFetchError', 'CircuitBreaker',
+           'TokenBucket', 'Broadcaster', 'BackfillJob', 'CorpusStore', 'FeedStore', 'SavedFeeds', 'SnapshotError',
+           'load_snapshot', 'write_snapshot', 'Tracer', 'FileSpanExporter',
+           'get_tracer', 'set_tracer']
\ No newline at end of file
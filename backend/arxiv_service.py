@@ -1,15 +1,137 @@
 """
 ArXiv API Service - Backend service for fetching AI research papers
 """
-import requests
 import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta, timezone
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterator, Optional
+from .resilience import ArxivFetchError, CircuitBreaker, TokenBucket, ARXIV_RATE_LIMITER
+from .tracing import span, traced
+
+
+ARXIV_API_URL = "http://export.arxiv.org/api/query"
+
+NAMESPACES = {'atom': 'http://www.w3.org/2005/Atom',
+              'arxiv': 'http://arxiv.org/schemas/atom',
+              'opensearch': 'http://a9.com/-/spec/opensearch/1.1/'}
+
+FEED_TAG = f"{{{NAMESPACES['atom']}}}feed"
+ENTRY_TAG = f"{{{NAMESPACES['atom']}}}entry"
+TOTAL_RESULTS_TAG = f"{{{NAMESPACES['opensearch']}}}totalResults"
+
+
+def parse_entry(entry: ET.Element) -> Dict:
+    """Convert one Atom <entry> element into a paper dict"""
+    ns = NAMESPACES
+    paper = {}
+    
+    # Title
+    title_elem = entry.find('atom:title', ns)
+    paper['title'] = title_elem.text.strip().replace('\n', ' ') if title_elem is not None else "N/A"
+    
+    # Authors
+    authors = []
+    author_elems = entry.findall('atom:author', ns)
+    for author in author_elems:
+        name_elem = author.find('atom:name', ns)
+        if name_elem is not None:
+            authors.append(name_elem.text.strip())
+    paper['authors'] = authors
+    
+    # Abstract
+    summary_elem = entry.find('atom:summary', ns)
+    paper['abstract'] = summary_elem.text.strip().replace('\n', ' ') if summary_elem is not None else "N/A"
+    
+    # Published date
+    published_elem = entry.find('atom:published', ns)
+    if published_elem is not None:
+        # Parse date string like "2024-01-15T18:00:01Z"
+        date_str = published_elem.text.strip()
+        try:
+            parsed_date = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+            paper['published_date'] = parsed_date
+            paper['published_date_str'] = parsed_date.strftime("%Y-%m-%d %H:%M:%S UTC")
+        except ValueError:
+            paper['published_date'] = None
+            paper['published_date_str'] = date_str
+    else:
+        paper['published_date'] = None
+        paper['published_date_str'] = "N/A"
+    
+    # arXiv ID and link
+    id_elem = entry.find('atom:id', ns)
+    paper['arxiv_id'] = id_elem.text.strip() if id_elem is not None else "N/A"
+    
+    # Categories
+    categories = []
+    category_elems = entry.findall('atom:category', ns)
+    for cat in category_elems:
+        term = cat.get('term')
+        if term:
+            categories.append(term)
+    paper['categories'] = categories
+    
+    return paper
+
+
+class QueryStream:
+    """One page of an arXiv API query, parsed entry by entry while the response streams in"""
+    
+    def __init__(self, response, circuit_breaker: CircuitBreaker):
+        self.response = response
+        self.circuit_breaker = circuit_breaker
+        self.total_results = None
+        self.entries = 0
+    
+    def __iter__(self) -> Iterator[Dict]:
+        import requests
+        try:
+            with self.response:
+                self.response.raw.decode_content = True
+                parser = ET.iterparse(self.response.raw, events=('start', 'end'))
+                root = None
+                for event, elem in parser:
+                    if root is None:
+                        root = elem
+                    if event != 'end':
+                        continue
+                    if elem.tag == TOTAL_RESULTS_TAG:
+                        self.total_results = int(elem.text)
+                    elif elem.tag == ENTRY_TAG:
+                        paper = parse_entry(elem)
+                        # Drop parsed entries so memory stays flat however long the page is
+                        root.clear()
+                        self.entries += 1
+                        yield paper
+        except GeneratorExit:
+            # Abandoned part-way; neither a success nor a failure of arXiv
+            self.circuit_breaker.cancel_request()
+            raise
+        except (requests.RequestException, ET.ParseError, ValueError) as e:
+            self.circuit_breaker.record_failure(e)
+            raise ArxivFetchError(f"Error reading arXiv response: {e}") from e
+        self.circuit_breaker.record_success()
+    
+    def read(self) -> str:
+        """Read the whole page as text; the caller records success or failure once it has parsed it"""
+        import requests
+        try:
+            with self.response:
+                return self.response.text
+        except requests.RequestException as e:
+            self.circuit_breaker.record_failure(e)
+            raise ArxivFetchError(f"Error reading arXiv response: {e}") from e
 
 
 class ArxivService:
-    def __init__(self):
-        self.base_url = "http://export.arxiv.org/api/query"
+    def __init__(self, circuit_breaker: Optional[CircuitBreaker] = None,
+                 rate_limiter: Optional[TokenBucket] = None, base_url: Optional[str] = None):
+        self.base_url = base_url or ARXIV_API_URL
+        # (connect, read) timeouts for a single request
+        self.request_timeout = (5, 20)
+        # Longest a fetch waits for a rate limiter token before giving up
+        self.rate_limit_wait_seconds = 5
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.rate_limiter = rate_limiter or ARXIV_RATE_LIMITER
         # AI-related categories on arXiv
         self.ai_categories = [
             "cs.AI",    # Artificial Intelligence
@@ -32,94 +154,72 @@ class ArxivService:
         full_query = f"({category_query}) OR ({keyword_query})"
         return full_query
     
-    def fetch_papers_xml(self, max_results: int = 100, days_back: int = 1) -> Optional[str]:
-        """Fetch AI papers from arXiv API"""
-        query = self.build_search_query(days_back)
-        
+    def build_date_range_query(self, start: datetime, end: datetime) -> str:
+        """Build the AI papers query restricted to submissions between two UTC times, inclusive to the minute"""
+        return f"({self.build_search_query()}) AND submittedDate:[{start:%Y%m%d%H%M} TO {end:%Y%m%d%H%M}]"
+    
+    def open_query(self, search_query: str, start: int = 0, max_results: int = 100,
+                   rate_limit_wait_seconds: Optional[float] = None) -> QueryStream:
+        """Request one page of a query, newest submissions first, for parsing as it streams in"""
         params = {
-            'search_query': query,
-            'start': 0,
+            'search_query': search_query,
+            'start': start,
             'max_results': max_results,
             'sortBy': 'submittedDate',
             'sortOrder': 'descending'
         }
         
+        if not self.circuit_breaker.allow_request():
+            raise ArxivFetchError("arXiv circuit breaker is open")
+        
+        wait = self.rate_limit_wait_seconds if rate_limit_wait_seconds is None else rate_limit_wait_seconds
+        if not self.rate_limiter.acquire(wait):
+            self.circuit_breaker.cancel_request()
+            raise ArxivFetchError("arXiv rate limit reached")
+        
+        import requests
+        
+        response = None
         try:
-            response = requests.get(self.base_url, params=params, timeout=30)
-            response.raise_for_status()
-            return response.text
+            with span("arxiv.open_query", start=start, max_results=max_results):
+                response = requests.get(self.base_url, params=params, timeout=self.request_timeout, stream=True)
+                response.raise_for_status()
         except requests.RequestException as e:
-            print(f"Error fetching data from arXiv: {e}")
+            if response is not None:
+                response.close()
+            self.circuit_breaker.record_failure(e)
+            raise ArxivFetchError(f"Error fetching data from arXiv: {e}") from e
+        return QueryStream(response, self.circuit_breaker)
+    
+    def fetch_papers_xml(self, max_results: int = 100, days_back: int = 1) -> Optional[str]:
+        """Fetch AI papers from arXiv API; the caller records success once the body has parsed"""
+        try:
+            with span("arxiv.fetch", max_results=max_results):
+                return self.open_query(self.build_search_query(days_back), 0, max_results).read()
+        except ArxivFetchError as e:
+            # The breaker has already been updated, or the call was never made
+            print(e)
             return None
     
+    @traced("arxiv.parse")
     def parse_xml_response(self, xml_content: str) -> List[Dict]:
-        """Parse XML response from arXiv API"""
+        """Parse XML response from arXiv API, raising ArxivFetchError if it is not an Atom feed"""
         try:
             root = ET.fromstring(xml_content)
-            # Define namespace
-            ns = {'atom': 'http://www.w3.org/2005/Atom',
-                  'arxiv': 'http://arxiv.org/schemas/atom'}
-            
-            papers = []
-            entries = root.findall('atom:entry', ns)
-            
-            for entry in entries:
-                paper = {}
-                
-                # Title
-                title_elem = entry.find('atom:title', ns)
-                paper['title'] = title_elem.text.strip().replace('\n', ' ') if title_elem is not None else "N/A"
-                
-                # Authors
-                authors = []
-                author_elems = entry.findall('atom:author', ns)
-                for author in author_elems:
-                    name_elem = author.find('atom:name', ns)
-                    if name_elem is not None:
-                        authors.append(name_elem.text.strip())
-                paper['authors'] = authors
-                
-                # Abstract
-                summary_elem = entry.find('atom:summary', ns)
-                paper['abstract'] = summary_elem.text.strip().replace('\n', ' ') if summary_elem is not None else "N/A"
-                
-                # Published date
-                published_elem = entry.find('atom:published', ns)
-                if published_elem is not None:
-                    # Parse date string like "2024-01-15T18:00:01Z"
-                    date_str = published_elem.text.strip()
-                    try:
-                        parsed_date = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-                        paper['published_date'] = parsed_date
-                        paper['published_date_str'] = parsed_date.strftime("%Y-%m-%d %H:%M:%S UTC")
-                    except ValueError:
-                        paper['published_date'] = None
-                        paper['published_date_str'] = date_str
-                else:
-                    paper['published_date'] = None
-                    paper['published_date_str'] = "N/A"
-                
-                # arXiv ID and link
-                id_elem = entry.find('atom:id', ns)
-                paper['arxiv_id'] = id_elem.text.strip() if id_elem is not None else "N/A"
-                
-                # Categories
-                categories = []
-                category_elems = entry.findall('atom:category', ns)
-                for cat in category_elems:
-                    term = cat.get('term')
-                    if term:
-                        categories.append(term)
-                paper['categories'] = categories
-                
-                papers.append(paper)
-            
-            return papers
-            
         except ET.ParseError as e:
-            print(f"Error parsing XML: {e}")
-            return []
+            raise ArxivFetchError(f"Error parsing XML: {e}") from e
+        if root.tag != FEED_TAG:
+            raise ArxivFetchError(f"Expected an Atom feed, got <{root.tag}>")
+        return [parse_entry(entry) for entry in root.findall('atom:entry', NAMESPACES)]
     
+    def get_upstream_status(self) -> Dict:
+        """Get circuit breaker and rate limiter state"""
+        return {
+            'circuit_breaker': self.circuit_breaker.get_status(),
+            'rate_limiter': self.rate_limiter.get_status()
+        }
+    
+    @traced("arxiv.filter_date")
     def filter_by_date(self, papers: List[Dict], days_back: int = 1) -> List[Dict]:
         """Filter papers by publication date"""
         cutoff_date = datetime.now(timezone.utc) - timedelta(days=days_back)
@@ -137,13 +237,19 @@ class ArxivService:
         
         # Fetch papers
         xml_content = self.fetch_papers_xml(max_results, days_back)
-        if not xml_content:
-            return []
+        if xml_content is None:
+            raise ArxivFetchError("Could not fetch papers from arXiv")
         
-        # Parse papers
-        papers = self.parse_xml_response(xml_content)
+        # Parse papers; an empty body or one that is not a feed counts as a failed call, not as "no papers"
+        try:
+            papers = self.parse_xml_response(xml_content)
+        except ArxivFetchError as e:
+            print(e)
+            self.circuit_breaker.record_failure(e)
+            raise
+        self.circuit_breaker.record_success()
         if not papers:
-            print("No papers found or error parsing response")
+            print("No papers found in response")
             return []
         
         # Filter by date
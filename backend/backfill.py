@@ -0,0 +1,275 @@
+"""
+Backfill - Resumable job that walks arXiv submission dates backward into a local paper corpus
+"""
+import json
+import threading
+import time
+from datetime import datetime, date, timedelta, timezone
+from typing import List, Dict, Iterator, Optional, Tuple
+from .arxiv_service import ArxivService
+from .resilience import ArxivFetchError
+from .sqlite_store import SQLiteStore
+
+
+class CorpusStore(SQLiteStore):
+    """SQLite file of backfilled papers, one row per arXiv id, plus per-job checkpoints"""
+
+    schema = (
+        """
+        CREATE TABLE IF NOT EXISTS papers (
+            arxiv_id TEXT PRIMARY KEY,
+            published REAL,
+            published_date_str TEXT,
+            title TEXT NOT NULL,
+            abstract TEXT NOT NULL,
+            authors TEXT NOT NULL,
+            categories TEXT NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS papers_published ON papers (published)",
+        """
+        CREATE TABLE IF NOT EXISTS checkpoints (
+            job TEXT PRIMARY KEY,
+            state TEXT NOT NULL,
+            updated_at REAL NOT NULL
+        )
+        """,
+    )
+
+    @staticmethod
+    def _paper_to_row(paper: Dict) -> tuple:
+        published = paper.get('published_date')
+        return (
+            paper.get('arxiv_id'),
+            published.timestamp() if published else None,
+            paper.get('published_date_str'),
+            paper.get('title', ''),
+            paper.get('abstract', ''),
+            json.dumps(paper.get('authors', [])),
+            json.dumps(paper.get('categories', []))
+        )
+
+    @staticmethod
+    def _row_to_paper(row) -> Dict:
+        return {
+            'title': row[3],
+            'authors': json.loads(row[5]),
+            'abstract': row[4],
+            'published_date': datetime.fromtimestamp(row[1], timezone.utc) if row[1] is not None else None,
+            'published_date_str': row[2],
+            'arxiv_id': row[0],
+            'categories': json.loads(row[6]),
+        }
+
+    def write_batch(self, papers: List[Dict], job: Optional[str] = None, state: Optional[Dict] = None) -> None:
+        """Upsert papers and, in the same transaction, move `job`'s checkpoint to `state`"""
+        with self.transaction() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO papers "
+                "(arxiv_id, published, published_date_str, title, abstract, authors, categories) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [self._paper_to_row(paper) for paper in papers]
+            )
+            if job is not None:
+                conn.execute("INSERT OR REPLACE INTO checkpoints (job, state, updated_at) VALUES (?, ?, ?)",
+                             (job, json.dumps(state), time.time()))
+
+    def save_checkpoint(self, job: str, state: Dict) -> None:
+        """Record a job's progress"""
+        self.write_batch([], job, state)
+
+    def get_checkpoint(self, job: str) -> Optional[Dict]:
+        """Get a job's last recorded progress"""
+        row = self._connect().execute("SELECT state FROM checkpoints WHERE job = ?", (job,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def list_checkpoints(self) -> List[Tuple[str, Dict, float]]:
+        """Get (job, state, updated_at) for every job"""
+        rows = self._connect().execute("SELECT job, state, updated_at FROM checkpoints ORDER BY job")
+        return [(job, json.loads(state), updated_at) for job, state, updated_at in rows]
+
+    def delete_checkpoint(self, job: str) -> None:
+        """Forget a job's progress so it starts over"""
+        self._connect().execute("DELETE FROM checkpoints WHERE job = ?", (job,))
+
+    def count(self) -> int:
+        """Number of papers in the corpus"""
+        return self._connect().execute("SELECT COUNT(*) FROM papers").fetchone()[0]
+
+    def date_range(self) -> Tuple[Optional[datetime], Optional[datetime]]:
+        """Publication times of the oldest and newest papers"""
+        low, high = self._connect().execute("SELECT MIN(published), MAX(published) FROM papers").fetchone()
+        return tuple(datetime.fromtimestamp(value, timezone.utc) if value is not None else None
+                     for value in (low, high))
+
+    def iter_papers(self, since: Optional[datetime] = None, until: Optional[datetime] = None,
+                    batch_size: int = 500) -> Iterator[Dict]:
+        """Stream papers published within [since, until], newest first"""
+        cursor = self._connect().execute(
+            "SELECT arxiv_id, published, published_date_str, title, abstract, authors, categories FROM papers "
+            "WHERE published >= ? AND published <= ? ORDER BY published DESC",
+            (since.timestamp() if since else float('-inf'), until.timestamp() if until else float('inf'))
+        )
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            for row in rows:
+                yield self._row_to_paper(row)
+
+
+def _day_start(day: date) -> datetime:
+    """Midnight UTC at the start of `day`"""
+    return datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+
+
+class BackfillJob:
+    """Walks [since, until] backward one window at a time, paging each window into a CorpusStore
+
+    The checkpoint (window cursor and page offset) is committed together with every batch of
+    papers, so an interrupted job resumes where the last batch landed.
+    """
+
+    def __init__(self, arxiv_service: ArxivService, store: CorpusStore, since: date,
+                 until: Optional[date] = None, job: str = 'default', window_days: int = 1,
+                 page_size: int = 200, batch_size: int = 100, max_retries: int = 5,
+                 backoff_seconds: float = 3.0, max_backoff_seconds: float = 300.0,
+                 rate_limit_wait_seconds: float = 60.0):
+        self.arxiv_service = arxiv_service
+        self.store = store
+        self.since = since
+        self.until = until or datetime.now(timezone.utc).date()
+        self.job = job
+        self.window = timedelta(days=max(1, window_days))
+        self.page_size = page_size
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.rate_limit_wait_seconds = rate_limit_wait_seconds
+        self.state = None
+        self._stop = threading.Event()
+
+        if self.since > self.until:
+            raise ValueError(f"Backfill start {self.since} is after its end {self.until}")
+
+    def stop(self) -> None:
+        """Ask the job to stop after the batch in flight; it resumes from there on the next run"""
+        self._stop.set()
+
+    def load_state(self, restart: bool = False) -> Dict:
+        """Resume the job's checkpoint, or start over from `until` when there is none or on restart"""
+        state = None if restart else self.store.get_checkpoint(self.job)
+        if state is not None and state['until'] != self.until.isoformat():
+            raise ValueError(f"Job {self.job!r} is backfilling up to {state['until']}, not {self.until}; "
+                             f"restart it or use another job name")
+        if state is None:
+            state = {
+                'until': self.until.isoformat(),
+                'cursor': (_day_start(self.until) + timedelta(days=1)).isoformat(),
+                'offset': 0,
+                'windows': 0,
+                'papers': 0,
+                'started_at': time.time()
+            }
+        # Moving `since` further back extends a finished job instead of redoing it
+        state['since'] = self.since.isoformat()
+        state['status'] = 'running' if self._cursor(state) > _day_start(self.since) else 'complete'
+        self.state = state
+        return state
+
+    @staticmethod
+    def _cursor(state: Dict) -> datetime:
+        """Exclusive upper bound of the window being fetched"""
+        return datetime.fromisoformat(state['cursor'])
+
+    def run(self, restart: bool = False) -> Dict:
+        """Fetch windows until the job reaches `since`, is stopped, or runs out of retries"""
+        state = self.load_state(restart)
+        self.store.save_checkpoint(self.job, state)
+        start = _day_start(self.since)
+
+        while state['status'] == 'running' and not self._stop.is_set():
+            cursor = self._cursor(state)
+            window_start = max(start, cursor - self.window)
+            if not self._fetch_window(window_start, cursor):
+                break
+            state['cursor'] = window_start.isoformat()
+            state['offset'] = 0
+            state['windows'] += 1
+            if window_start <= start:
+                state['status'] = 'complete'
+            self.store.save_checkpoint(self.job, state)
+            print(f"Backfilled {window_start:%Y-%m-%d} to {cursor - timedelta(minutes=1):%Y-%m-%d} "
+                  f"({state['papers']} papers so far)")
+
+        if self._stop.is_set() and state['status'] == 'running':
+            state['status'] = 'stopped'
+            self.store.save_checkpoint(self.job, state)
+        return state
+
+    def _fetch_window(self, window_start: datetime, window_end: datetime) -> bool:
+        """Page through one window, committing each batch with the checkpoint; False if the job must end"""
+        state = self.state
+        query = self.arxiv_service.build_date_range_query(window_start, window_end - timedelta(minutes=1))
+        failures = 0
+        while not self._stop.is_set():
+            offset = state['offset']
+            try:
+                stream = self.arxiv_service.open_query(query, offset, self.page_size,
+                                                       self.rate_limit_wait_seconds)
+                papers = iter(stream)
+                batch = []
+                for paper in papers:
+                    batch.append(paper)
+                    if len(batch) >= self.batch_size:
+                        self._commit(batch)
+                        batch = []
+                        if self._stop.is_set():
+                            papers.close()
+                            return False
+                self._commit(batch)
+            except ArxivFetchError as e:
+                failures += 1
+                if failures > self.max_retries:
+                    state['status'] = 'failed'
+                    state['error'] = str(e)
+                    self.store.save_checkpoint(self.job, state)
+                    print(f"Backfill failed after {self.max_retries} retries: {e}")
+                    return False
+                self._backoff(failures, e)
+                continue
+
+            received = stream.entries
+            # arXiv occasionally answers with a short or empty page mid-range; ask for it again
+            if received < self.page_size and stream.total_results is not None and state['offset'] < stream.total_results:
+                failures += 1
+                if failures > self.max_retries:
+                    print(f"Giving up on {state['offset']} of {stream.total_results} papers "
+                          f"in the window ending {window_end:%Y-%m-%d}")
+                    return True
+                self._backoff(failures, ArxivFetchError(f"short page of {received} papers"))
+                continue
+
+            failures = 0
+            if received < self.page_size:
+                return True
+        return False
+
+    def _commit(self, batch: List[Dict]) -> None:
+        """Write a batch of papers and advance the page offset past them in one transaction"""
+        if not batch:
+            return
+        self.state['offset'] += len(batch)
+        self.state['papers'] += len(batch)
+        self.state.pop('error', None)
+        self.store.write_batch(batch, self.job, self.state)
+
+    def _backoff(self, failures: int, error: Exception) -> None:
+        """Sleep before a retry, doubling each time and waiting out an open circuit breaker"""
+        delay = min(self.max_backoff_seconds, self.backoff_seconds * 2 ** (failures - 1))
+        retry_in = self.arxiv_service.circuit_breaker.get_status()['retry_in_seconds']
+        if retry_in:
+            delay = max(delay, retry_in)
+        print(f"Backfill retry {failures}/{self.max_retries} in {delay:.0f}s: {error}")
+        self._stop.wait(delay)
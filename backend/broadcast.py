@@ -0,0 +1,84 @@
+"""
+Broadcaster - Fan-out of server-sent events to many idle connections from one event loop
+"""
+import asyncio
+from typing import Dict, Optional
+
+
+def format_event(event: str, data: str = "", event_id: Optional[int] = None) -> str:
+    """Serialize one server-sent event; multi-line data is split over several data fields"""
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.extend(f"data: {line}" for line in (data.splitlines() or [""]))
+    return "\n".join(lines) + "\n\n"
+
+
+# Sent when a subscriber falls too far behind; the client reloads instead of replaying the backlog
+RESYNC_EVENT = format_event("reload")
+
+
+class Broadcaster:
+    """Topic-keyed subscriber queues, each bounded so one slow client cannot grow memory"""
+
+    def __init__(self, queue_size: int = 8):
+        self.queue_size = queue_size
+        self.topics = {}
+        self.published = 0
+        self.overflows = 0
+
+    def __len__(self) -> int:
+        return sum(len(queues) for queues in self.topics.values())
+
+    def subscribe(self, topic: str) -> asyncio.Queue:
+        """Register a new subscriber queue for `topic`"""
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self.topics.setdefault(topic, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, topic: str, queue: asyncio.Queue) -> None:
+        """Drop a subscriber queue"""
+        queues = self.topics.get(topic)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self.topics[topic]
+
+    def has_subscribers(self, topic: str) -> bool:
+        """Check whether anyone listens on `topic`"""
+        return bool(self.topics.get(topic))
+
+    def publish(self, topic: str, message: str) -> int:
+        """Queue a serialized event for every subscriber of `topic` and return how many got it"""
+        delivered = 0
+        for queue in self.topics.get(topic, ()):
+            try:
+                queue.put_nowait(message)
+                delivered += 1
+            except asyncio.QueueFull:
+                # Replace the backlog with a single resync so the client catches up with one reload
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(RESYNC_EVENT)
+                self.overflows += 1
+        self.published += 1
+        return delivered
+
+    def close(self) -> None:
+        """Tell every subscriber to finish by queueing None in place of its backlog"""
+        for queues in self.topics.values():
+            for queue in queues:
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+
+    def get_status(self) -> Dict:
+        """Get subscriber and delivery counters"""
+        return {
+            'subscribers': len(self),
+            'topics': len(self.topics),
+            'published': self.published,
+            'overflows': self.overflows,
+            'queue_size': self.queue_size
+        }
@@ -1,18 +1,50 @@
 """
 Cache Manager - Handles in-memory caching for papers
 """
+import threading
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import List, Dict, Callable, Iterable, Optional
+from .eviction import estimate_size, make_eviction_policy
+from .snapshot import load_snapshot, write_snapshot
+
+
+# Room reserved for derived structures (snapshot, feeds, indexes) per byte of papers until they are
+# measured; the API snapshot alone is about twice the size of the papers it encodes
+DEFAULT_DERIVED_RATIO = 2.5
+
+# Eviction frees down to this fraction of the budget, so small growth of the derived structures
+# afterwards does not evict again right away
+EVICTION_TARGET_RATIO = 0.9
+
+
+def papers_budget(budget: float, fixed: int, ratio: float) -> float:
+    """Bytes of papers that fit in `budget` next to `fixed` bytes and `ratio` derived bytes per paper byte"""
+    return max(0.0, budget - fixed) / (1 + ratio)
 
 
 class CacheManager:
-    def __init__(self, cache_duration_minutes: int = 30):
+    def __init__(self, cache_duration_minutes: int = 30, memory_budget_bytes: Optional[int] = None,
+                 eviction_policy: str = 'lru'):
         self.cache = {
             'papers': [],
             'last_updated': None,
             'cache_date': None,
+            'generation': 0,
             'cache_duration': timedelta(minutes=cache_duration_minutes)
         }
+        self._fetch_lock = threading.Lock()
+        self.memory_budget_bytes = memory_budget_bytes
+        self.eviction_policy = make_eviction_policy(eviction_policy)
+        self.memory = {
+            'papers_bytes': 0,
+            'evictions': 0,
+            'evicted_papers': 0,
+            'evicted_bytes': 0,
+            'last_evicted_papers': 0,
+            'last_eviction': None
+        }
+        self._derived_sizes = {}
+        self._derived_fixed_sizes = {}
     
     def is_cache_valid(self) -> bool:
         """Check if cache is still valid"""
@@ -35,8 +67,123 @@ class CacheManager:
             return self.cache['papers']
         return []
     
-    def update_cache(self, papers: List[Dict]) -> None:
-        """Update cache with new papers"""
+    def get_latest_papers(self) -> List[Dict]:
+        """Get the most recently cached papers, even if the cache has expired"""
+        return self.cache['papers']
+    
+    def wait_for_papers(self) -> List[Dict]:
+        """Get the latest papers, waiting for the in-flight fetch only while nothing is cached"""
+        papers = self.get_latest_papers()
+        if papers:
+            return papers
+        with self._fetch_lock:
+            return self.get_latest_papers()
+    
+    def acquire_fetch_lock(self) -> bool:
+        """Claim the right to fetch from arXiv unless another thread is already fetching"""
+        return self._fetch_lock.acquire(blocking=False)
+    
+    def release_fetch_lock(self) -> None:
+        """Give up the right to fetch from arXiv"""
+        self._fetch_lock.release()
+    
+    def is_fetching(self) -> bool:
+        """Check whether a fetch from arXiv is in flight"""
+        return self._fetch_lock.locked()
+    
+    def register_derived(self, name: str, size_func: Callable[[], int],
+                         fixed_size_func: Optional[Callable[[], int]] = None) -> None:
+        """Count a structure derived from the cached papers against the memory budget
+
+        `fixed_size_func` reports the part of its size that does not grow with the number of papers.
+        """
+        self._derived_sizes[name] = size_func
+        if fixed_size_func is not None:
+            self._derived_fixed_sizes[name] = fixed_size_func
+    
+    def get_derived_bytes(self) -> Dict[str, int]:
+        """Get the current size in bytes of each registered derived structure"""
+        return {name: size_func() for name, size_func in self._derived_sizes.items()}
+    
+    def get_derived_fixed_bytes(self) -> Dict[str, int]:
+        """Get the bytes of each derived structure that do not scale with the number of papers"""
+        return {name: size_func() for name, size_func in self._derived_fixed_sizes.items()}
+    
+    def record_access(self, arxiv_ids: Iterable[str]) -> None:
+        """Tell the eviction policy that these papers were served"""
+        self.eviction_policy.record_access(arxiv_ids)
+    
+    def fit_budget(self, papers: List[Dict]) -> List[Dict]:
+        """Account for a new list of papers and evict from it until the cache fits the memory budget"""
+        sizes = [estimate_size(paper) for paper in papers]
+        total = sum(sizes)
+        self.eviction_policy.retain({paper.get('arxiv_id') for paper in papers})
+        
+        budget = self.memory_budget_bytes
+        if budget is None or not papers:
+            self.memory['papers_bytes'] = total
+            return papers
+        
+        # Derived structures are rebuilt from the kept papers, so reserve room for their fixed parts
+        # (such as a fitted vocabulary) as measured, and for the rest at the ratio per paper byte
+        # measured on the current generation
+        derived = self.get_derived_bytes()
+        fixed_sizes = self.get_derived_fixed_bytes()
+        fixed = sum(fixed_sizes.values())
+        scaling = sum(max(0, size - fixed_sizes.get(name, 0)) for name, size in derived.items())
+        previous = self.memory['papers_bytes']
+        ratio = scaling / previous if scaling and previous else DEFAULT_DERIVED_RATIO
+        if total <= papers_budget(budget, fixed, ratio):
+            self.memory['papers_bytes'] = total
+            return papers
+        
+        target = papers_budget(budget * EVICTION_TARGET_RATIO, fixed, ratio)
+        evicted = set()
+        freed = 0
+        for i in self.eviction_policy.eviction_order(papers):
+            if total - freed <= target:
+                break
+            evicted.add(i)
+            freed += sizes[i]
+        kept = [paper for i, paper in enumerate(papers) if i not in evicted]
+        self.eviction_policy.retain({paper.get('arxiv_id') for paper in kept})
+        
+        self.memory['papers_bytes'] = total - freed
+        self.memory['evictions'] += 1
+        self.memory['evicted_papers'] += len(evicted)
+        self.memory['evicted_bytes'] += freed
+        self.memory['last_evicted_papers'] = len(evicted)
+        self.memory['last_eviction'] = datetime.now()
+        print(f"Evicted {len(evicted)} of {len(papers)} papers ({freed:,} bytes, {self.eviction_policy.name}) "
+              f"to stay within the {budget:,} byte memory budget")
+        return kept
+    
+    def check_budget(self) -> bool:
+        """Evict papers if derived structures have grown the cache past its memory budget since it was fitted"""
+        budget = self.memory_budget_bytes
+        if budget is None or not self.cache['papers']:
+            return False
+        total = self.memory['papers_bytes'] + sum(self.get_derived_bytes().values())
+        if total <= budget:
+            return False
+        
+        # A fetch in flight fits its own papers into the budget when it installs them
+        if not self.acquire_fetch_lock():
+            return False
+        try:
+            papers = self.get_latest_papers()
+            if not papers:
+                return False
+            print(f"Cache and derived structures grew to {total:,} bytes, over the {budget:,} byte memory budget")
+            # Installing the kept papers as a new generation makes every derived structure rebuild from them;
+            # a shared cache publishes that generation, so every worker drops the same papers
+            self.load_papers(papers, self.cache['last_updated'])
+        finally:
+            self.release_fetch_lock()
+        return True
+    
+    def update_cache(self, papers: List[Dict]) -> List[Dict]:
+        """Update cache with new papers and return the ones kept within the memory budget"""
         now = datetime.now()
         today = now.date()
         
@@ -45,11 +192,53 @@ class CacheManager:
             print(f"New day detected ({today}), clearing cache from {self.cache['cache_date']}")
             self.cache['papers'] = []
         
+        papers = self.fit_budget(papers)
         self.cache['papers'] = papers
         self.cache['last_updated'] = now
         self.cache['cache_date'] = today
+        self.cache['generation'] += 1
         
         print(f"Cache updated with {len(papers)} papers for {today}")
+        return papers
+    
+    def load_papers(self, papers: List[Dict], updated: datetime) -> None:
+        """Install papers fetched at local time `updated` as a new generation, keeping their age"""
+        self.cache['papers'] = self.fit_budget(papers)
+        self.cache['last_updated'] = updated
+        self.cache['cache_date'] = updated.date()
+        self.cache['generation'] += 1
+    
+    def export_snapshot(self, path: str, compression: str = 'gzip') -> Dict:
+        """Write the cached papers and their age to a binary snapshot file"""
+        return write_snapshot(path, self.get_latest_papers(), self.get_generation(),
+                              self.get_last_updated(), compression)
+    
+    def import_snapshot(self, path: str) -> Dict:
+        """Load papers from a binary snapshot file; they stay valid only as long as their age allows"""
+        metadata, papers = load_snapshot(path)
+        updated = datetime.fromtimestamp(metadata['last_updated']) if metadata['last_updated'] else datetime.now()
+        self.load_papers(papers, updated)
+        print(f"Imported {len(self.cache['papers'])} papers from snapshot {path} (updated {updated:%Y-%m-%d %H:%M})")
+        return metadata
+    
+    def get_generation(self) -> int:
+        """Get the cache generation, bumped whenever the cached papers change"""
+        return self.cache['generation']
+    
+    def get_last_updated(self) -> Optional[datetime]:
+        """Get the local time the cache was last updated"""
+        return self.cache['last_updated']
+    
+    def get_memory_info(self) -> Dict:
+        """Get the byte sizes of the cached papers and derived structures, and eviction counters"""
+        derived = self.get_derived_bytes()
+        return {
+            **self.memory,
+            'derived_bytes': derived,
+            'total_bytes': self.memory['papers_bytes'] + sum(derived.values()),
+            'budget_bytes': self.memory_budget_bytes,
+            'policy': self.eviction_policy.name
+        }
     
     def get_cache_info(self) -> Dict:
         """Get cache status information"""
@@ -58,7 +247,9 @@ class CacheManager:
                 'age_minutes': 0,
                 'cache_date': None,
                 'is_valid': False,
-                'papers_count': 0
+                'papers_count': 0,
+                'generation': self.cache['generation'],
+                'memory': self.get_memory_info()
             }
         
         now = datetime.now()
@@ -68,7 +259,9 @@ class CacheManager:
             'age_minutes': age_minutes,
             'cache_date': self.cache['cache_date'],
             'is_valid': self.is_cache_valid(),
-            'papers_count': len(self.cache['papers'])
+            'papers_count': len(self.cache['papers']),
+            'generation': self.cache['generation'],
+            'memory': self.get_memory_info()
         }
     
     def clear_cache(self) -> None:
@@ -76,4 +269,7 @@ class CacheManager:
         self.cache['papers'] = []
         self.cache['last_updated'] = None
         self.cache['cache_date'] = None
+        self.cache['generation'] += 1
+        self.memory['papers_bytes'] = 0
+        self.eviction_policy.retain(set())
         print("Cache cleared manually")
\ No newline at end of file
@@ -0,0 +1,124 @@
+"""
+Columnar Paper Table - NumPy arrays over the cached papers for vectorized filtering and sorting
+"""
+import sys
+from datetime import date
+from typing import List, Dict, Optional, Sequence
+
+# numpy is optional and imported on first use to keep it off the startup path;
+# without it callers fall back to per-dict filtering
+np = None
+_numpy_missing = False
+
+
+SORT_KEYS = ('date', 'title', 'authors')
+
+
+def numpy_available() -> bool:
+    """Import numpy if needed and report whether the columnar table can be built"""
+    global np, _numpy_missing
+    if np is None and not _numpy_missing:
+        try:
+            import numpy
+            np = numpy
+        except ImportError:
+            _numpy_missing = True
+    return np is not None
+
+
+class PaperTable:
+    """Column arrays for one list of papers: timestamps, category bitmasks and sort keys"""
+
+    def __init__(self, papers: List[Dict]):
+        if not numpy_available():
+            raise RuntimeError("numpy is required for PaperTable")
+
+        self.papers = papers
+        self.size = len(papers)
+        self.ids = np.arange(self.size, dtype=np.int64)
+        self.id_by_arxiv_id = {paper.get('arxiv_id'): i for i, paper in enumerate(papers)}
+
+        # Epoch seconds, with missing dates as NaT
+        seconds = np.array(
+            [paper['published_date'].timestamp() if paper.get('published_date') else np.nan for paper in papers],
+            dtype=np.float64
+        )
+        self.timestamps = np.full(self.size, np.datetime64('NaT'), dtype='datetime64[s]')
+        known = ~np.isnan(seconds)
+        self.timestamps[known] = seconds[known].astype(np.int64).astype('datetime64[s]')
+        self.author_counts = np.array([len(paper.get('authors', [])) for paper in papers], dtype=np.int32)
+
+        # Rank of each title in case-insensitive order, so title sorts are integer argsorts;
+        # equal titles share a rank and keep cache order in both directions
+        titles = [paper.get('title', '').lower() for paper in papers]
+        rank_by_title = {title: rank for rank, title in enumerate(sorted(set(titles)))}
+        self.title_ranks = np.array([rank_by_title[title] for title in titles], dtype=np.int64)
+
+        # One bit per category, packed into as many 64-bit words as the vocabulary needs
+        self.category_bits = {}
+        for paper in papers:
+            for cat in paper.get('categories', []):
+                self.category_bits.setdefault(cat, len(self.category_bits))
+        row_bits = [
+            sum(1 << self.category_bits[cat] for cat in set(paper.get('categories', [])))
+            for paper in papers
+        ]
+        words = max(1, (len(self.category_bits) + 63) // 64)
+        self.category_masks = np.zeros((self.size, words), dtype=np.uint64)
+        for word in range(words):
+            shift = 64 * word
+            self.category_masks[:, word] = [(bits >> shift) & 0xFFFFFFFFFFFFFFFF for bits in row_bits]
+
+    def memory_bytes(self) -> int:
+        """Bytes of the column arrays and lookup dicts"""
+        arrays = (self.ids, self.timestamps, self.author_counts, self.title_ranks, self.category_masks)
+        return sum(array.nbytes for array in arrays) + sys.getsizeof(self.id_by_arxiv_id) + sys.getsizeof(self.category_bits)
+
+    def _query_mask(self, categories: Sequence[str]):
+        """Pack category names into a bitmask row, ignoring unknown categories"""
+        mask = np.zeros(self.category_masks.shape[1], dtype=np.uint64)
+        for cat in categories:
+            bit = self.category_bits.get(cat)
+            if bit is not None:
+                mask[bit // 64] |= np.uint64(1 << (bit % 64))
+        return mask
+
+    def date_mask(self, since: Optional[date] = None, until: Optional[date] = None):
+        """Boolean mask of papers published on or after `since` and on or before `until`"""
+        mask = ~np.isnat(self.timestamps) if (since or until) else np.ones(self.size, dtype=bool)
+        if since:
+            mask &= self.timestamps >= np.datetime64(since, 's')
+        if until:
+            mask &= self.timestamps < np.datetime64(until, 'D') + np.timedelta64(1, 'D')
+        return mask
+
+    def category_mask(self, categories: Sequence[str]):
+        """Boolean mask of papers in any of `categories`"""
+        return (self.category_masks & self._query_mask(categories)).any(axis=1)
+
+    def sort(self, indices, sort_by: str = 'date', descending: bool = True):
+        """Order `indices` by publication date, title or author count"""
+        # Descending sorts negate the keys rather than reverse the order, so ties keep cache order
+        sign = -1 if descending else 1
+        if sort_by == 'date':
+            # Missing dates always sort last
+            timestamps = self.timestamps[indices]
+            keys = np.where(np.isnat(timestamps), np.iinfo(np.int64).max, sign * timestamps.astype(np.int64))
+        elif sort_by == 'title':
+            keys = sign * self.title_ranks[indices]
+        elif sort_by == 'authors':
+            keys = sign * self.author_counts[indices].astype(np.int64)
+        else:
+            raise ValueError(f"Unknown sort key: {sort_by}")
+        return indices[np.argsort(keys, kind='stable')]
+
+    def select(self, categories: Optional[Sequence[str]] = None, since: Optional[date] = None,
+               until: Optional[date] = None, sort_by: Optional[str] = None, descending: bool = True):
+        """Get ids of papers matching the date window and categories, optionally sorted"""
+        mask = self.date_mask(since, until)
+        if categories:
+            mask &= self.category_mask(categories)
+        indices = self.ids[mask]
+        if sort_by:
+            indices = self.sort(indices, sort_by, descending)
+        return indices
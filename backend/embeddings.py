@@ -0,0 +1,224 @@
+"""
+Embedding Index - Local TF-IDF + truncated SVD embeddings for "related papers" lookups
+"""
+import math
+import os
+import re
+import sys
+import threading
+from collections import Counter
+from typing import List, Dict, Optional, Tuple
+from .columnar import numpy_available
+
+
+TOKEN_PATTERN = re.compile(r"[a-z][a-z0-9\-]{2,}")
+
+STOPWORDS = frozenset("""
+the and for with that this from are was were which these those their there than then into onto our
+its also can has have had not but all any each other such more most both only over under between
+using use used based via paper propose proposed approach method methods results show shows shown
+new novel well while when where what how however further first two one study work
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stopwords"""
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+# Sampled TF-IDF rows densified at a time while fitting; bounds the fit's scratch memory
+FIT_CHUNK_ROWS = 256
+
+
+def paper_text(paper: Dict) -> str:
+    """Text embedded for a paper: the title counts twice"""
+    title = paper.get('title', '')
+    return f"{title} {title} {paper.get('abstract', '')}"
+
+
+class EmbeddingIndex:
+    """Float32 matrix of unit-length paper embeddings with top-k cosine lookups"""
+
+    def __init__(self, dim: int = 128, max_vocab: int = 8000, fit_sample: int = 3000,
+                 refit_growth: float = 2.0, path: Optional[str] = None):
+        self.dim = dim
+        self.max_vocab = max_vocab
+        self.fit_sample = fit_sample
+        self.refit_growth = refit_growth
+        self.path = path
+        self.generation = None
+        # (ids, row_by_id, matrix) of the latest sync, replaced as a whole so lookups never mix generations
+        self.published = ([], {}, None)
+        self.vocab = {}
+        self.idf = None
+        self.basis = None
+        self._fitted_size = 0
+        self._vocab_bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.published[0])
+
+    def memory_bytes(self) -> int:
+        """Approximate bytes held in memory; a memory-mapped matrix lives in the page cache instead"""
+        ids, row_by_id, matrix = self.published
+        arrays = [self.idf, self.basis] + ([] if self.path else [matrix])
+        size = sum(array.nbytes for array in arrays if array is not None)
+        return size + self._vocab_bytes + sys.getsizeof(row_by_id) + sys.getsizeof(ids)
+
+    def fixed_bytes(self) -> int:
+        """Bytes of the vocabulary, IDF weights and SVD basis, which do not grow with the number of papers"""
+        arrays = [self.idf, self.basis]
+        return sum(array.nbytes for array in arrays if array is not None) + self._vocab_bytes
+
+    def _allocate(self, rows: int, dim: int):
+        """Allocate the embedding matrix, memory-mapped to a temporary file when a path is configured"""
+        import numpy as np
+        rows = max(rows, 1)
+        if not self.path:
+            return np.zeros((rows, dim), dtype=np.float32)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        return np.lib.format.open_memmap(f"{self.path}.tmp", mode='w+', dtype=np.float32, shape=(rows, dim))
+
+    def _fit(self, texts: List[List[str]]) -> None:
+        """Fit the vocabulary, IDF weights and SVD basis on a sample of tokenized texts"""
+        import numpy as np
+        step = max(1, len(texts) // self.fit_sample)
+        sample = texts[::step][:self.fit_sample]
+        n = len(sample)
+
+        doc_freq = Counter()
+        for tokens in sample:
+            doc_freq.update(set(tokens))
+        # Skip terms that appear in a single sampled paper or in most of them
+        max_df = max(2, int(0.5 * n))
+        terms = [t for t, df in doc_freq.most_common() if (df >= 2 or n < 20) and df <= max_df]
+        terms = terms[:self.max_vocab]
+        self.vocab = {term: i for i, term in enumerate(terms)}
+        self._vocab_bytes = sys.getsizeof(self.vocab) + sum(sys.getsizeof(term) for term in terms)
+        self.idf = np.array(
+            [math.log((1 + n) / (1 + doc_freq[t])) + 1 for t in terms], dtype=np.float32
+        )
+
+        # The TF-IDF matrix is kept as sparse rows and only densified FIT_CHUNK_ROWS rows at a time
+        rows = [self._weights(tokens) for tokens in sample]
+        vocab_size = len(terms)
+
+        def chunks():
+            for first in range(0, n, FIT_CHUNK_ROWS):
+                block = rows[first:first + FIT_CHUNK_ROWS]
+                dense = np.zeros((len(block), vocab_size), dtype=np.float32)
+                for row, (indices, weights) in enumerate(block):
+                    dense[row, indices] = weights
+                yield first, dense
+
+        def times(right):
+            """TF-IDF @ right"""
+            out = np.empty((n, right.shape[1]), dtype=np.float32)
+            for first, dense in chunks():
+                out[first:first + len(dense)] = dense @ right
+            return out
+
+        def transposed_times(left):
+            """TF-IDF.T @ left"""
+            out = np.zeros((vocab_size, left.shape[1]), dtype=np.float32)
+            for first, dense in chunks():
+                out += dense.T @ left[first:first + len(dense)]
+            return out
+
+        # Randomized truncated SVD (Halko et al.): project, orthonormalize, decompose the small matrix
+        k = max(1, min(self.dim, n - 1, vocab_size - 1))
+        rng = np.random.default_rng(0)
+        omega = rng.standard_normal((vocab_size, k + 10)).astype(np.float32)
+        q, _ = np.linalg.qr(times(omega))
+        for _ in range(2):
+            q, _ = np.linalg.qr(times(transposed_times(q)))
+        _, _, vt = np.linalg.svd(transposed_times(q).T, full_matrices=False)
+        self.basis = np.ascontiguousarray(vt[:k].T, dtype=np.float32)
+
+    def _weights(self, tokens: List[str]) -> Tuple[List[int], List[float]]:
+        """Sublinear TF-IDF weights of in-vocabulary tokens, L2-normalized"""
+        counts = Counter(token for token in tokens if token in self.vocab)
+        if not counts:
+            return [], []
+        indices = [self.vocab[token] for token in counts]
+        weights = [(1 + math.log(c)) * float(self.idf[i]) for i, c in zip(indices, counts.values())]
+        norm = math.sqrt(sum(w * w for w in weights)) or 1.0
+        return indices, [w / norm for w in weights]
+
+    def _embed(self, tokens: List[str]):
+        """Fold a tokenized paper into the SVD basis as a unit vector"""
+        import numpy as np
+        indices, weights = self._weights(tokens)
+        if not indices:
+            return np.zeros(self.basis.shape[1], dtype=np.float32)
+        vector = np.asarray(weights, dtype=np.float32) @ self.basis[indices]
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def sync(self, papers: List[Dict], generation: Optional[int] = None) -> int:
+        """Mirror the index onto `papers`, embedding only papers not already indexed"""
+        if not numpy_available():
+            return 0
+        import numpy as np
+
+        with self._lock:
+            if generation is not None and generation == self.generation:
+                return 0
+
+            # The vocabulary and SVD basis are fitted on a sample; new papers are folded into
+            # that basis until the corpus has grown by `refit_growth` since the last fit
+            papers_by_id = {paper.get('arxiv_id'): paper for paper in papers}
+            ids = list(papers_by_id)
+            refit = self.basis is None or len(ids) >= self.refit_growth * max(self._fitted_size, 1)
+            if refit and ids:
+                tokens_by_id = {arxiv_id: tokenize(paper_text(p)) for arxiv_id, p in papers_by_id.items()}
+                self._fit(list(tokens_by_id.values()))
+                self._fitted_size = len(ids)
+                previous = {}
+            else:
+                tokens_by_id = {}
+                previous = self.published[1]
+            old_matrix = self.published[2]
+
+            dim = self.basis.shape[1] if self.basis is not None else self.dim
+            matrix = self._allocate(len(ids), dim)
+            added = 0
+            for row, arxiv_id in enumerate(ids):
+                old_row = previous.get(arxiv_id)
+                if old_row is not None:
+                    matrix[row] = old_matrix[old_row]
+                else:
+                    tokens = tokens_by_id.get(arxiv_id)
+                    if tokens is None:
+                        tokens = tokenize(paper_text(papers_by_id[arxiv_id]))
+                    matrix[row] = self._embed(tokens)
+                    added += 1
+            if isinstance(matrix, np.memmap):
+                # Swap the file in atomically; the previous mapping stays valid until released
+                matrix.flush()
+                os.replace(f"{self.path}.tmp", self.path)
+
+            self.published = (ids, {arxiv_id: row for row, arxiv_id in enumerate(ids)}, matrix)
+            self.generation = generation
+            return added
+
+    def related(self, arxiv_id: str, k: int = 5) -> List[Tuple[str, float]]:
+        """Get the `k` most similar papers to `arxiv_id` as (arxiv_id, cosine similarity)"""
+        import numpy as np
+        ids, row_by_id, matrix = self.published
+        row = row_by_id.get(arxiv_id)
+        if row is None or matrix is None:
+            return []
+
+        matrix = matrix[:len(ids)]
+        scores = matrix @ matrix[row]
+        scores[row] = -np.inf
+        k = min(k, len(ids) - 1)
+        if k <= 0:
+            return []
+        top = np.argpartition(scores, -k)[-k:]
+        top = top[np.argsort(scores[top])[::-1]]
+        return [(ids[i], float(scores[i])) for i in top if scores[i] > 0]
@@ -0,0 +1,112 @@
+"""
+Eviction - Byte-size accounting and eviction policies for a memory-bounded paper cache
+"""
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import List, Dict, Iterable, Set
+
+
+# Approximate cost of one entry in a Python set or dict, on top of the object it refers to
+CONTAINER_ENTRY_BYTES = 32
+
+
+def estimate_size(value) -> int:
+    """Approximate bytes held by a paper or other nest of dicts, lists, sets and scalars"""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        # Keys are the same few field names in every paper and are shared, so only values count
+        size += sum(estimate_size(item) for item in value.values())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item) for item in value)
+    return size
+
+
+def _published_key(paper: Dict) -> float:
+    """Publication time as a sortable number; papers without a date sort oldest"""
+    published = paper.get('published_date')
+    return published.timestamp() if published else float('-inf')
+
+
+class EvictionPolicy(ABC):
+    """Orders cached papers for eviction from their access statistics; subclasses choose the order"""
+
+    name = None
+
+    def __init__(self):
+        self.admitted = {}      # arxiv_id -> monotonic time the paper entered the cache
+        self.last_access = {}   # arxiv_id -> monotonic time of the latest access
+        self.hits = {}          # arxiv_id -> number of accesses
+        self._lock = threading.Lock()
+
+    def record_access(self, arxiv_ids: Iterable[str]) -> None:
+        """Count one access to each of the given papers"""
+        now = time.monotonic()
+        with self._lock:
+            for arxiv_id in arxiv_ids:
+                self.last_access[arxiv_id] = now
+                self.hits[arxiv_id] = self.hits.get(arxiv_id, 0) + 1
+
+    def retain(self, arxiv_ids: Set[str]) -> None:
+        """Admit newly cached papers and forget the statistics of papers that left the cache"""
+        now = time.monotonic()
+        with self._lock:
+            for stats in (self.admitted, self.last_access, self.hits):
+                for arxiv_id in stats.keys() - arxiv_ids:
+                    del stats[arxiv_id]
+            for arxiv_id in arxiv_ids - self.admitted.keys():
+                self.admitted[arxiv_id] = now
+
+    def recency(self, arxiv_id: str) -> float:
+        """Time of the latest access, or of admission for papers never accessed"""
+        return self.last_access.get(arxiv_id, self.admitted.get(arxiv_id, 0.0))
+
+    @abstractmethod
+    def sort_key(self, paper: Dict) -> tuple:
+        """Eviction rank of a cached paper; the lowest is evicted first"""
+
+    def eviction_order(self, papers: List[Dict]) -> List[int]:
+        """Indices of `papers`, first to evict first"""
+        with self._lock:
+            keys = [self.sort_key(paper) for paper in papers]
+        return sorted(range(len(papers)), key=keys.__getitem__)
+
+
+class LRUPolicy(EvictionPolicy):
+    """Evict the least recently accessed papers first, oldest publications breaking ties"""
+
+    name = 'lru'
+
+    def sort_key(self, paper: Dict) -> tuple:
+        return self.recency(paper.get('arxiv_id')), _published_key(paper)
+
+
+class LFUPolicy(EvictionPolicy):
+    """Evict the least often accessed papers first, then the least recent, then the oldest"""
+
+    name = 'lfu'
+
+    def sort_key(self, paper: Dict) -> tuple:
+        arxiv_id = paper.get('arxiv_id')
+        return self.hits.get(arxiv_id, 0), self.recency(arxiv_id), _published_key(paper)
+
+
+class AgePolicy(EvictionPolicy):
+    """Evict the oldest publications first, regardless of access"""
+
+    name = 'age'
+
+    def sort_key(self, paper: Dict) -> tuple:
+        return (_published_key(paper),)
+
+
+EVICTION_POLICIES = {policy.name: policy for policy in (LRUPolicy, LFUPolicy, AgePolicy)}
+
+
+def make_eviction_policy(name: str) -> EvictionPolicy:
+    """Create an eviction policy by name, raising ValueError for unknown names"""
+    policy = EVICTION_POLICIES.get((name or '').lower())
+    if policy is None:
+        raise ValueError(f"Unknown eviction policy {name!r}; expected one of {', '.join(EVICTION_POLICIES)}")
+    return policy()
@@ -0,0 +1,134 @@
+"""
+Feed Builder - Incrementally generated Atom feeds of the cached papers
+"""
+import sys
+import threading
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import List, Dict, Optional
+from html import escape
+from .eviction import CONTAINER_ENTRY_BYTES
+
+
+ATOM_NS = "http://www.w3.org/2005/Atom"
+
+
+class FeedDocument:
+    """A serialized feed for one cache generation"""
+
+    def __init__(self, key: str, xml: str, generation: int, updated: datetime, base_url: str = ''):
+        self.xml = xml
+        self.generation = generation
+        self.updated = updated
+        self.base_url = base_url
+        self.etag = f'"feed-{key}-g{generation}"'
+        self.last_modified = format_datetime(updated, usegmt=True)
+
+
+class AtomFeedBuilder:
+    """Builds Atom feeds per category, reusing serialized entries across cache generations"""
+
+    def __init__(self, feed_url: str = "/feed.xml", max_entries: int = 100):
+        self.feed_url = feed_url
+        self.max_entries = max_entries
+        self._entries = {}     # feed key -> {arxiv_id: serialized <entry>}
+        self._documents = {}   # feed key -> FeedDocument
+        self._sizes = {}       # feed key -> approximate bytes of its entries and document
+        self._generation = None
+        self._lock = threading.Lock()
+
+    def _serialize_entry(self, paper: Dict, updated: datetime) -> str:
+        """Serialize a single paper as an Atom <entry>; undated papers take the feed's `updated` time"""
+        arxiv_id = paper.get('arxiv_id', '')
+        link = arxiv_id if 'arxiv.org' in arxiv_id else f"https://arxiv.org/abs/{arxiv_id}"
+        published = paper.get('published_date')
+        timestamp = published.isoformat() if published else ''
+
+        parts = [
+            "<entry>",
+            f"<id>{escape(arxiv_id)}</id>",
+            f"<title>{escape(paper.get('title', 'Untitled'))}</title>",
+            f"<link href=\"{escape(link)}\"/>",
+        ]
+        if timestamp:
+            parts.append(f"<published>{timestamp}</published><updated>{timestamp}</updated>")
+        else:
+            # Atom requires <updated> on every entry
+            parts.append(f"<updated>{updated.isoformat()}</updated>")
+        parts.extend(f"<author><name>{escape(name)}</name></author>" for name in paper.get('authors', []))
+        parts.extend(f"<category term=\"{escape(cat)}\"/>" for cat in paper.get('categories', []))
+        parts.append(f"<summary>{escape(paper.get('abstract', ''))}</summary>")
+        parts.append("</entry>")
+        return "".join(parts)
+
+    def _serialize_header(self, key: str, updated: datetime, base_url: str = '') -> str:
+        """Serialize the feed-level elements; the feed id and self link are absolute against `base_url`"""
+        title = "Daily AI Research Feed"
+        url = base_url.rstrip('/') + self.feed_url
+        if key != 'all':
+            title = f"{title} - {key}"
+            url = f"{url}?category={key}"
+        return (
+            '<?xml version="1.0" encoding="utf-8"?>'
+            f'<feed xmlns="{ATOM_NS}">'
+            f"<id>{escape(url)}</id>"
+            f"<title>{escape(title)}</title>"
+            f"<link rel=\"self\" href=\"{escape(url)}\"/>"
+            f"<updated>{updated.isoformat()}</updated>"
+        )
+
+    def memory_bytes(self) -> int:
+        """Approximate bytes of the serialized entries and feed documents"""
+        with self._lock:
+            return sum(self._sizes.values())
+
+    def clear(self) -> None:
+        """Drop every cached feed and serialized entry"""
+        with self._lock:
+            self._entries.clear()
+            self._documents.clear()
+            self._sizes.clear()
+
+    def build(self, papers: List[Dict], generation: int, updated: Optional[datetime] = None,
+              category: Optional[str] = None, base_url: str = '') -> FeedDocument:
+        """Get the feed for a cache generation served from `base_url`, serializing only entries not seen before"""
+        key = category if category and category != 'all' else 'all'
+        updated = (updated or datetime.now(timezone.utc)).astimezone(timezone.utc).replace(microsecond=0)
+
+        # Categories without papers get an empty feed that is never cached, so arbitrary
+        # ?category= values cannot grow the cache
+        if not papers and key != 'all':
+            return FeedDocument(key, self._serialize_header(key, updated, base_url) + "</feed>",
+                                generation, updated, base_url)
+
+        with self._lock:
+            document = self._documents.get(key)
+            # One document per feed; a request for another base URL re-renders it from the cached entries
+            if document is not None and document.generation == generation and document.base_url == base_url:
+                return document
+
+            if generation != self._generation:
+                # Keep only feeds requested during the previous generation; the rest are stale
+                for stale in [k for k, doc in self._documents.items() if doc.generation != self._generation]:
+                    del self._documents[stale]
+                    self._entries.pop(stale, None)
+                    self._sizes.pop(stale, None)
+                self._generation = generation
+
+            previous = self._entries.get(key, {})
+            entries = {}
+            for paper in papers[:self.max_entries]:
+                arxiv_id = paper.get('arxiv_id', '')
+                entry = previous.get(arxiv_id)
+                if entry is None:
+                    entry = self._serialize_entry(paper, updated)
+                entries[arxiv_id] = entry
+
+            xml = self._serialize_header(key, updated, base_url) + "".join(entries.values()) + "</feed>"
+            document = FeedDocument(key, xml, generation, updated, base_url)
+            self._entries[key] = entries
+            self._documents[key] = document
+            self._sizes[key] = sys.getsizeof(xml) + sum(
+                sys.getsizeof(entry) + CONTAINER_ENTRY_BYTES for entry in entries.values()
+            )
+            return document
@@ -1,26 +1,84 @@
 """
 Paper Service - Main backend service combining ArXiv API and caching
 """
-from typing import List, Dict
+import math
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import List, Dict, Optional, Tuple
 from .arxiv_service import ArxivService
 from .cache_manager import CacheManager
+from .shared_cache import SharedCacheManager
+from .tracing import span, traced
+from .serializer import PaperSnapshot
+from .feed_builder import AtomFeedBuilder, FeedDocument
+from .embeddings import EmbeddingIndex
+from .columnar import numpy_available
+from .saved_feeds import FeedStore, SavedFeeds
+from .snapshot import SnapshotError, encode_snapshot
 
 
 class PaperService:
-    def __init__(self, cache_duration_minutes: int = 30):
-        self.arxiv_service = ArxivService()
-        self.cache_manager = CacheManager(cache_duration_minutes)
+    def __init__(self, cache_duration_minutes: int = 30, shared_cache_path: Optional[str] = None,
+                 embeddings_path: Optional[str] = None, arxiv_api_url: Optional[str] = None,
+                 refresh_min_interval_seconds: float = 60, saved_feeds_path: Optional[str] = None,
+                 snapshot_path: Optional[str] = None, memory_budget_bytes: Optional[int] = None,
+                 eviction_policy: str = 'lru'):
+        self.arxiv_service = ArxivService(base_url=arxiv_api_url)
+        if shared_cache_path:
+            # Multi-worker mode: workers share one store and a single elected worker fetches
+            self.cache_manager = SharedCacheManager(shared_cache_path, cache_duration_minutes,
+                                                    memory_budget_bytes=memory_budget_bytes,
+                                                    eviction_policy=eviction_policy)
+        else:
+            self.cache_manager = CacheManager(cache_duration_minutes, memory_budget_bytes, eviction_policy)
+        self._snapshot = None
+        self.feed_builder = AtomFeedBuilder()
+        self.embedding_index = EmbeddingIndex(path=embeddings_path)
+        self.refresh_min_interval_seconds = refresh_min_interval_seconds
+        self.saved_feeds = self._open_saved_feeds(saved_feeds_path) if saved_feeds_path else None
+        self.snapshot_path = snapshot_path
+        self._refresh_lock = threading.Lock()
+        self._refresh_thread = None
+        self._last_refresh_request = None
+        self._embedding_lock = threading.Lock()
+        self._embedding_thread = None
+        
+        # Structures built from the cached papers count against the memory budget too
+        self.cache_manager.register_derived('snapshot', lambda: self._snapshot.memory_bytes() if self._snapshot else 0)
+        self.cache_manager.register_derived('feeds', self.feed_builder.memory_bytes)
+        self.cache_manager.register_derived('embeddings', self.embedding_index.memory_bytes,
+                                            self.embedding_index.fixed_bytes)
+        if self.saved_feeds is not None:
+            self.cache_manager.register_derived('saved_feeds', self.saved_feeds.memory_bytes)
+    
+    @staticmethod
+    def _open_saved_feeds(path: str) -> Optional[SavedFeeds]:
+        """Open the saved feeds store, disabling saved feeds instead of failing when it cannot be opened"""
+        try:
+            return SavedFeeds(FeedStore(path))
+        except (sqlite3.Error, OSError) as e:
+            print(f"Saved feeds disabled, could not open {path}: {e}")
+            return None
     
     def get_papers(self, force_refresh: bool = False, days_back: int = 2, max_results: int = 100) -> List[Dict]:
         """Get papers from cache or fetch from API"""
         
         # Check cache first unless force refresh
         if not force_refresh:
-            cached_papers = self.cache_manager.get_cached_papers()
+            with span("cache.lookup"):
+                cached_papers = self.cache_manager.get_cached_papers()
             if cached_papers:
                 print(f"Using cached papers ({len(cached_papers)} papers)")
                 return cached_papers
         
+        # Only the holder of the fetch lock talks to arXiv; concurrent callers wait for its result
+        if not self.cache_manager.acquire_fetch_lock():
+            print("Another fetch is in flight, waiting for its papers")
+            return self.cache_manager.wait_for_papers()
+        
         # Fetch fresh papers from API
         print("Fetching fresh papers from arXiv API...")
         try:
@@ -29,33 +87,278 @@ class PaperService:
                 max_results=max_results
             )
             
-            # Update cache
-            self.cache_manager.update_cache(papers)
+            # Update cache, keeping what fits in the memory budget
+            papers = self.cache_manager.update_cache(papers)
+            self._sync_saved_feeds(papers)
+            self._sync_embeddings()
+            self._save_snapshot()
             return papers
             
         except Exception as e:
             print(f"Error fetching papers: {e}")
-            # Return cached papers if available, empty list otherwise
-            return self.cache_manager.get_cached_papers()
+            # Fall back to the last known good papers, however old
+            return self.cache_manager.get_latest_papers()
+        finally:
+            self.cache_manager.release_fetch_lock()
+    
+    def warm_start(self) -> Optional[Dict]:
+        """Seed an empty cache from the snapshot file so a restart does not start from nothing"""
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return None
+        if self.cache_manager.get_latest_papers():
+            return None
+        # With a shared cache only the worker holding the fetch lease imports; the others
+        # pick up the generation it publishes
+        if not self.cache_manager.acquire_fetch_lock():
+            return None
+        try:
+            if self.cache_manager.get_latest_papers():
+                return None
+            with span("cache.import_snapshot"):
+                metadata = self.cache_manager.import_snapshot(self.snapshot_path)
+        except (SnapshotError, OSError) as e:
+            print(f"Could not load snapshot {self.snapshot_path}: {e}")
+            return None
+        finally:
+            self.cache_manager.release_fetch_lock()
+        self._sync_saved_feeds(self.cache_manager.get_latest_papers())
+        self._sync_embeddings()
+        return metadata
+    
+    def _save_snapshot(self) -> None:
+        """Write the freshly fetched generation to the snapshot file, if one is configured"""
+        if not self.snapshot_path:
+            return
+        try:
+            with span("cache.export_snapshot"):
+                self.cache_manager.export_snapshot(self.snapshot_path)
+        except (SnapshotError, OSError) as e:
+            print(f"Could not write snapshot {self.snapshot_path}: {e}")
+    
+    def export_snapshot_bytes(self, compression: str = 'gzip') -> Tuple[int, bytes]:
+        """Serialize the latest cache generation, without fetching from arXiv, as (generation, snapshot bytes)"""
+        generation, papers = self.get_current_generation()
+        return generation, encode_snapshot(papers, generation, self.cache_manager.get_last_updated(), compression)
+    
+    def request_refresh(self) -> Dict:
+        """Submit a background refresh unless a fetch is in flight or the data is too recent"""
+        generation = self.cache_manager.get_generation()
+        retry_after = 0.0
+        with self._refresh_lock:
+            if self.is_refreshing():
+                status = 'in_progress'
+            else:
+                retry_after = self._refresh_retry_after()
+                if retry_after > 0:
+                    status = 'throttled'
+                else:
+                    self._last_refresh_request = time.monotonic()
+                    self._refresh_thread = threading.Thread(
+                        target=self.get_papers, kwargs={'force_refresh': True},
+                        name="paper-refresh", daemon=True
+                    )
+                    self._refresh_thread.start()
+                    status = 'started'
+        return {
+            'status': status,
+            'generation': generation,
+            'retry_after_seconds': math.ceil(retry_after)
+        }
+    
+    def _refresh_retry_after(self) -> float:
+        """Seconds until another refresh is allowed, counting from the last request or update"""
+        elapsed = []
+        if self._last_refresh_request is not None:
+            elapsed.append(time.monotonic() - self._last_refresh_request)
+        last_updated = self.cache_manager.get_last_updated()
+        if last_updated is not None:
+            elapsed.append((datetime.now() - last_updated).total_seconds())
+        if not elapsed:
+            return 0.0
+        return max(0.0, self.refresh_min_interval_seconds - min(elapsed))
+    
+    def is_refreshing(self) -> bool:
+        """Check whether a refresh job or any other fetch from arXiv is in flight"""
+        thread = self._refresh_thread
+        return (thread is not None and thread.is_alive()) or self.cache_manager.is_fetching()
+    
+    def get_current_generation(self) -> Tuple[int, List[Dict]]:
+        """Get the current cache generation and its papers without fetching from arXiv"""
+        papers = self.cache_manager.get_latest_papers()
+        return self.cache_manager.get_generation(), papers
+    
+    def get_snapshot(self, check_budget: bool = True) -> PaperSnapshot:
+        """Get the serialized snapshot of the current cache generation, rebuilding it if stale"""
+        papers = self.get_papers()
+        generation = self.cache_manager.get_generation()
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.generation != generation:
+            with span("papers.snapshot", papers=len(papers)):
+                snapshot = PaperSnapshot(papers, generation)
+                # Build the columnar view up front so the budget check counts it
+                snapshot.table
+            self._snapshot = snapshot
+            # One retry: the snapshot rebuilt from the kept papers is served even if it is still over
+            if check_budget and self._check_budget():
+                return self.get_snapshot(check_budget=False)
+        return snapshot
+    
+    def get_feed(self, category: str = None, check_budget: bool = True, base_url: str = '') -> FeedDocument:
+        """Get the Atom feed of the current cache generation served from `base_url`, optionally for one category"""
+        papers = self.filter_papers_by_category(self.get_snapshot(check_budget).papers, category)
+        with span("papers.feed"):
+            document = self.feed_builder.build(
+                papers,
+                generation=self.cache_manager.get_generation(),
+                updated=self.cache_manager.get_last_updated(),
+                category=category,
+                base_url=base_url
+            )
+        if check_budget and self._check_budget():
+            return self.get_feed(category, check_budget=False, base_url=base_url)
+        return document
+    
+    def get_related_papers(self, arxiv_id: str, k: int = 5) -> List[Tuple[Dict, float]]:
+        """Get the papers most similar to `arxiv_id` as (paper, cosine similarity) pairs"""
+        papers = self.get_papers()
+        # Generations this worker did not fetch itself are embedded in the background too;
+        # until that finishes, lookups use the previous generation's embeddings
+        self._sync_embeddings()
+        with span("papers.related"):
+            related = self.embedding_index.related(arxiv_id, k)
+        papers_by_id = {paper.get('arxiv_id'): paper for paper in papers}
+        self.cache_manager.record_access([arxiv_id] + [rid for rid, _ in related])
+        return [(papers_by_id[rid], score) for rid, score in related if rid in papers_by_id]
+    
+    def _sync_embeddings(self) -> None:
+        """Embed the current generation in a background thread unless it is already indexed"""
+        # Without numpy nothing is embedded and the index never catches up
+        if not numpy_available() or self.embedding_index.generation == self.cache_manager.get_generation():
+            return
+        with self._embedding_lock:
+            thread = self._embedding_thread
+            if thread is not None and thread.is_alive():
+                return
+            self._embedding_thread = threading.Thread(
+                target=self._run_embedding_sync, name="embedding-sync", daemon=True
+            )
+            self._embedding_thread.start()
+    
+    def is_embedding(self) -> bool:
+        """Check whether a generation is being embedded in the background"""
+        thread = self._embedding_thread
+        return thread is not None and thread.is_alive()
+    
+    def _run_embedding_sync(self) -> None:
+        """Embed generations until the index has caught up with the cache"""
+        while True:
+            generation, papers = self.get_current_generation()
+            if self.embedding_index.generation == generation:
+                # Evicting for the budget starts a new generation, which is embedded in turn
+                if not self._check_budget():
+                    return
+                continue
+            with span("papers.embed", papers=len(papers)):
+                self.embedding_index.sync(papers, generation)
+    
+    def _check_budget(self) -> bool:
+        """Evict papers if the structures derived from them have pushed the cache over its memory budget"""
+        # An index still holding the previous generation is checked by the embedding thread once it catches up
+        if self.is_embedding() and threading.current_thread() is not self._embedding_thread:
+            return False
+        if not self.cache_manager.check_budget():
+            return False
+        # Drop what was built for the replaced generation; it is rebuilt from the kept papers
+        self._snapshot = None
+        self.feed_builder.clear()
+        self._sync_saved_feeds(self.cache_manager.get_latest_papers())
+        self._sync_embeddings()
+        return True
+    
+    def _sync_saved_feeds(self, papers: List[Dict], force: bool = False) -> None:
+        """Bring the precomputed saved feed results up to the current generation and definitions"""
+        if self.saved_feeds is None:
+            return
+        with span("feeds.sync", papers=len(papers)):
+            self.saved_feeds.sync(papers, self.cache_manager.get_generation(), force)
+    
+    def list_saved_feeds(self, check_budget: bool = True) -> List[Tuple[Dict, int]]:
+        """Get every saved feed with its number of matching papers"""
+        if self.saved_feeds is None:
+            return []
+        self._sync_saved_feeds(self.get_papers())
+        feeds = [
+            (feed, len(self.saved_feeds.get_result_ids(feed_id) or []))
+            for feed_id, feed in self.saved_feeds.feeds.items()
+        ]
+        if check_budget and self._check_budget():
+            return self.list_saved_feeds(check_budget=False)
+        return feeds
+    
+    def get_saved_feed(self, feed_id: int, check_budget: bool = True) -> Optional[Tuple[Dict, List[Dict]]]:
+        """Get a saved feed and its precomputed papers, or None if there is no such feed"""
+        if self.saved_feeds is None:
+            return None
+        self._sync_saved_feeds(self.get_papers())
+        feed = self.saved_feeds.feeds.get(feed_id)
+        if feed is None:
+            return None
+        papers = self.saved_feeds.get_papers(feed_id) or []
+        if check_budget and self._check_budget():
+            return self.get_saved_feed(feed_id, check_budget=False)
+        self.record_access(papers)
+        return feed, papers
+    
+    def save_feed(self, name: str, categories: List[str] = (), keywords: List[str] = (),
+                  authors: List[str] = (), feed_id: Optional[int] = None) -> Dict:
+        """Create or edit a saved feed; raises ValueError for an empty definition"""
+        if self.saved_feeds is None:
+            raise ValueError("Saved feeds are disabled")
+        feed = self.saved_feeds.store.save_feed(name, categories, keywords, authors, feed_id)
+        self._sync_saved_feeds(self.get_papers(), force=True)
+        return feed
+    
+    def delete_feed(self, feed_id: int) -> bool:
+        """Delete a saved feed"""
+        if self.saved_feeds is None:
+            return False
+        deleted = self.saved_feeds.store.delete_feed(feed_id)
+        self._sync_saved_feeds(self.get_papers(), force=True)
+        return deleted
+    
+    def record_access(self, papers: List[Dict]) -> None:
+        """Count papers served to a client for the eviction policy"""
+        self.cache_manager.record_access(paper.get('arxiv_id') for paper in papers)
     
     def get_cache_info(self) -> Dict:
         """Get cache status information"""
         return self.cache_manager.get_cache_info()
     
+    def get_upstream_status(self) -> Dict:
+        """Get arXiv circuit breaker and rate limiter state"""
+        return self.arxiv_service.get_upstream_status()
+    
     def clear_cache(self) -> None:
         """Clear the cache"""
         self.cache_manager.clear_cache()
     
+    @traced("papers.filter_category")
     def filter_papers_by_category(self, papers: List[Dict], category: str) -> List[Dict]:
         """Filter papers by category"""
         if not category or category == 'all':
             return papers
-        
+        # The current generation is filtered through its snapshot's columnar table
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.papers is papers:
+            return [papers[i] for i in snapshot.select(category)]
         return [paper for paper in papers if category in paper.get('categories', [])]
     
     def get_all_categories(self, papers: List[Dict]) -> set:
         """Get all unique categories from papers"""
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.papers is papers:
+            return snapshot.all_categories()
         categories = set()
         for paper in papers:
             categories.update(paper.get('categories', []))
-        return categories
\ No newline at end of file
+        return categories
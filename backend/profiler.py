@@ -0,0 +1,50 @@
+"""
+Sampling Profiler - On-demand stack sampling that produces flame graph data
+"""
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Optional
+
+
+class SamplingProfiler:
+    """Samples the stacks of all threads and aggregates them as collapsed stacks"""
+
+    def __init__(self, interval_seconds: float = 0.005):
+        self.interval_seconds = interval_seconds
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _collapse(frame) -> str:
+        """Render a frame's stack root-first as 'file:function;file:function'"""
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(f"{code.co_filename.rsplit('/', 1)[-1]}:{code.co_name}")
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+    def sample(self, duration_seconds: float, thread_id: Optional[int] = None) -> Counter:
+        """Sample every other thread (or just `thread_id`) for `duration_seconds`"""
+        own_id = threading.get_ident()
+        stacks = Counter()
+        deadline = time.monotonic() + duration_seconds
+        while time.monotonic() < deadline:
+            for ident, frame in sys._current_frames().items():
+                if ident == own_id or (thread_id is not None and ident != thread_id):
+                    continue
+                stacks[self._collapse(frame)] += 1
+            time.sleep(self.interval_seconds)
+        return stacks
+
+    def profile(self, duration_seconds: float) -> str:
+        """Sample for `duration_seconds` and return collapsed stacks for flamegraph.pl or speedscope"""
+        # One profile at a time; concurrent samplers would only skew each other
+        if not self._lock.acquire(blocking=False):
+            raise RuntimeError("A profile is already running")
+        try:
+            stacks = self.sample(duration_seconds)
+        finally:
+            self._lock.release()
+        return "\n".join(f"{stack} {count}" for stack, count in stacks.most_common())
@@ -0,0 +1,122 @@
+"""
+Resilience - Circuit breaker and rate limiter guarding calls to the arXiv API
+"""
+import threading
+import time
+from typing import Dict
+
+
+class ArxivFetchError(Exception):
+    """Raised when papers could not be fetched from arXiv"""
+
+
+class CircuitBreaker:
+    """Fails fast after repeated upstream errors, retrying once the reset timeout has passed"""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout_seconds: float = 60):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.last_error = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """Check whether a call may go upstream; in half-open state only one trial call is allowed"""
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout_seconds:
+                    return False
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN:
+                if self._trial_in_flight:
+                    return False
+                self._trial_in_flight = True
+            return True
+
+    def cancel_request(self) -> None:
+        """Give back an allowed call that was never made"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call"""
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self, error: Exception = None) -> None:
+        """Count a failed call, opening the circuit at the threshold or after a failed trial"""
+        with self._lock:
+            self.failures += 1
+            self.last_error = str(error) if error else None
+            self._trial_in_flight = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def get_status(self) -> Dict:
+        """Get breaker state information"""
+        with self._lock:
+            retry_in = None
+            if self.state == self.OPEN:
+                retry_in = max(0, int(self.reset_timeout_seconds - (time.monotonic() - self.opened_at)))
+            return {
+                'state': self.state,
+                'failures': self.failures,
+                'retry_in_seconds': retry_in,
+                'last_error': self.last_error
+            }
+
+
+class TokenBucket:
+    """Token-bucket rate limiter; callers wait up to a timeout for a token"""
+
+    def __init__(self, rate_per_second: float, capacity: int = 1):
+        self.rate_per_second = rate_per_second
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate_per_second)
+        self.updated_at = now
+
+    def acquire(self, timeout_seconds: float = 0) -> bool:
+        """Take a token, waiting up to `timeout_seconds` for one to become available"""
+        deadline = time.monotonic() + timeout_seconds
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) / self.rate_per_second
+            if time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+    def get_status(self) -> Dict:
+        """Get rate limiter information"""
+        with self._lock:
+            self._refill()
+            return {
+                'rate_per_second': self.rate_per_second,
+                'capacity': self.capacity,
+                'tokens': round(self.tokens, 2)
+            }
+
+
+# arXiv asks API clients to make no more than one request every three seconds;
+# every ArxivService in the process shares this bucket
+ARXIV_RATE_LIMITER = TokenBucket(rate_per_second=1 / 3, capacity=1)
@@ -0,0 +1,301 @@
+"""
+Saved Feeds - Locally stored feed definitions with result sets precomputed per cache generation
+"""
+import json
+import re
+import sqlite3
+import sys
+import threading
+import time
+from typing import List, Dict, Iterable, Optional, Set
+from .eviction import CONTAINER_ENTRY_BYTES, estimate_size
+from .sqlite_store import SQLiteStore
+
+
+WORD_PATTERN = re.compile(r"[a-z0-9]+(?:-[a-z0-9]+)*")
+
+# Upper bound on each criterion list of a feed definition
+MAX_CRITERIA = 25
+
+
+def text_terms(text: str) -> Set[str]:
+    """Lowercase word terms of a title or abstract"""
+    return set(WORD_PATTERN.findall(text.lower()))
+
+
+def normalize_author(name: str) -> str:
+    """Case- and whitespace-insensitive form of an author name"""
+    return " ".join(name.casefold().split())
+
+
+def normalize_feed(name: str, categories: Iterable[str] = (), keywords: Iterable[str] = (),
+                   authors: Iterable[str] = ()) -> Dict:
+    """Clean up a feed definition, raising ValueError if it cannot match anything"""
+    name = (name or "").strip()
+    categories = sorted({cat.strip() for cat in categories if cat and cat.strip()})
+    keywords = list(dict.fromkeys(" ".join(WORD_PATTERN.findall(k.lower())) for k in keywords if k))
+    keywords = [k for k in keywords if k]
+    authors = list(dict.fromkeys(" ".join(a.split()) for a in authors if a and a.strip()))
+
+    if not name:
+        raise ValueError("A feed needs a name")
+    if not (categories or keywords or authors):
+        raise ValueError("A feed needs at least one category, keyword or author")
+    for label, values in (('categories', categories), ('keywords', keywords), ('authors', authors)):
+        if len(values) > MAX_CRITERIA:
+            raise ValueError(f"A feed can have at most {MAX_CRITERIA} {label}")
+    return {'name': name[:100], 'categories': categories, 'keywords': keywords, 'authors': authors}
+
+
+class FeedStore(SQLiteStore):
+    """SQLite file holding saved feed definitions and a revision bumped on every change"""
+
+    schema = (
+        """
+        CREATE TABLE IF NOT EXISTS feeds (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            definition TEXT NOT NULL,
+            created_at REAL NOT NULL
+        )
+        """,
+        "CREATE TABLE IF NOT EXISTS revision (id INTEGER PRIMARY KEY CHECK (id = 0), value INTEGER)",
+        "INSERT OR IGNORE INTO revision (id, value) VALUES (0, 0)",
+    )
+
+    def _write(self, sql: str, params: tuple) -> sqlite3.Cursor:
+        """Run one change and bump the revision in the same transaction"""
+        with self.transaction() as conn:
+            cursor = conn.execute(sql, params)
+            conn.execute("UPDATE revision SET value = value + 1 WHERE id = 0")
+        return cursor
+
+    @staticmethod
+    def _row_to_feed(row) -> Dict:
+        return {'id': row[0], 'name': row[1], **json.loads(row[2]), 'created_at': row[3]}
+
+    def revision(self) -> int:
+        """Get the revision, which changes whenever a feed is added, edited or deleted"""
+        return self._connect().execute("SELECT value FROM revision WHERE id = 0").fetchone()[0]
+
+    def list_feeds(self) -> List[Dict]:
+        """Get every saved feed, oldest first"""
+        rows = self._connect().execute("SELECT id, name, definition, created_at FROM feeds ORDER BY id")
+        return [self._row_to_feed(row) for row in rows]
+
+    def get_feed(self, feed_id: int) -> Optional[Dict]:
+        """Get one saved feed"""
+        row = self._connect().execute(
+            "SELECT id, name, definition, created_at FROM feeds WHERE id = ?", (feed_id,)
+        ).fetchone()
+        return self._row_to_feed(row) if row else None
+
+    def save_feed(self, name: str, categories: Iterable[str] = (), keywords: Iterable[str] = (),
+                  authors: Iterable[str] = (), feed_id: Optional[int] = None) -> Dict:
+        """Create a feed, or replace the definition of `feed_id`, and return it"""
+        feed = normalize_feed(name, categories, keywords, authors)
+        definition = json.dumps({k: feed[k] for k in ('categories', 'keywords', 'authors')})
+        if feed_id is None:
+            cursor = self._write(
+                "INSERT INTO feeds (name, definition, created_at) VALUES (?, ?, ?)",
+                (feed['name'], definition, time.time())
+            )
+            feed_id = cursor.lastrowid
+        else:
+            cursor = self._write("UPDATE feeds SET name = ?, definition = ? WHERE id = ?",
+                                 (feed['name'], definition, feed_id))
+            if cursor.rowcount == 0:
+                raise KeyError(feed_id)
+        return self.get_feed(feed_id)
+
+    def delete_feed(self, feed_id: int) -> bool:
+        """Delete a feed and report whether it existed"""
+        return self._write("DELETE FROM feeds WHERE id = ?", (feed_id,)).rowcount > 0
+
+
+class PostingIndex:
+    """Inverted index from categories, normalized authors and text terms to arXiv ids"""
+
+    def __init__(self):
+        self.categories = {}
+        self.authors = {}
+        self.terms = {}
+        self.keys_by_id = {}
+        self.nbytes = 0
+
+    @staticmethod
+    def _keys_bytes(keys: tuple) -> int:
+        """Approximate bytes of one paper's keys plus its entries in the postings"""
+        return estimate_size(keys) + CONTAINER_ENTRY_BYTES * (1 + sum(len(values) for values in keys))
+
+    def add(self, paper: Dict) -> None:
+        """Index one paper"""
+        arxiv_id = paper.get('arxiv_id')
+        keys = (
+            set(paper.get('categories', [])),
+            {normalize_author(author) for author in paper.get('authors', [])},
+            text_terms(f"{paper.get('title', '')} {paper.get('abstract', '')}")
+        )
+        self.keys_by_id[arxiv_id] = keys
+        self.nbytes += self._keys_bytes(keys)
+        for postings, values in zip((self.categories, self.authors, self.terms), keys):
+            for value in values:
+                postings.setdefault(value, set()).add(arxiv_id)
+
+    def remove(self, arxiv_id: str) -> None:
+        """Drop one paper from the index"""
+        keys = self.keys_by_id.pop(arxiv_id, None)
+        if keys is None:
+            return
+        self.nbytes -= self._keys_bytes(keys)
+        for postings, values in zip((self.categories, self.authors, self.terms), keys):
+            for value in values:
+                ids = postings.get(value)
+                if ids is not None:
+                    ids.discard(arxiv_id)
+                    if not ids:
+                        del postings[value]
+
+    def match_all_terms(self, terms: List[str]) -> Set[str]:
+        """Ids of papers containing every term, intersecting the shortest postings first"""
+        postings = sorted((self.terms.get(term, set()) for term in terms), key=len)
+        if not postings or not postings[0]:
+            return set()
+        return set.intersection(*postings)
+
+    def evaluate(self, feed: Dict) -> Set[str]:
+        """Ids of papers matching a feed: any keyword or followed author, within any of its categories"""
+        matched = None
+        if feed['keywords'] or feed['authors']:
+            matched = set()
+            for keyword in feed['keywords']:
+                matched |= self.match_all_terms(keyword.split())
+            for author in feed['authors']:
+                matched |= self.authors.get(normalize_author(author), set())
+        if feed['categories']:
+            in_categories = set().union(*(self.categories.get(cat, set()) for cat in feed['categories']))
+            matched = in_categories if matched is None else matched & in_categories
+        return matched or set()
+
+
+class SavedFeeds:
+    """Per-feed result id lists, updated from each generation's added and dropped papers"""
+
+    def __init__(self, store: FeedStore, poll_interval_seconds: float = 1.0):
+        self.store = store
+        self.poll_interval_seconds = poll_interval_seconds
+        self.feeds = {}
+        self.results = {}
+        self.ordered = {}
+        self.index = PostingIndex()
+        self.papers_by_id = {}
+        self.generation = None
+        self.revision = None
+        self.last_sync_ms = 0.0
+        self._positions = {}
+        self._last_poll = 0.0
+        self._lock = threading.Lock()
+
+    def sync(self, papers: List[Dict], generation: int, force: bool = False) -> None:
+        """Apply a new generation and any changed feed definitions to the precomputed results"""
+        now = time.monotonic()
+        if (generation == self.generation and not force
+                and now - self._last_poll < self.poll_interval_seconds):
+            return
+
+        with self._lock:
+            started = time.perf_counter()
+            self._last_poll = now
+            touched = set()
+            if generation != self.generation:
+                touched |= self._apply_generation(papers)
+                self.generation = generation
+            revision = self.store.revision()
+            if revision != self.revision:
+                touched |= self._apply_definitions(self.store.list_feeds())
+                self.revision = revision
+            # Orders are rebuilt on the next read of each changed feed, not for every feed up front
+            for feed_id in touched:
+                self.ordered.pop(feed_id, None)
+            if touched:
+                self.last_sync_ms = (time.perf_counter() - started) * 1000
+
+    def _apply_generation(self, papers: List[Dict]) -> Set[int]:
+        """Drop papers that left the cache and match the added ones against every feed"""
+        papers_by_id = {paper.get('arxiv_id'): paper for paper in papers}
+        removed = self.papers_by_id.keys() - papers_by_id.keys()
+        added = [paper for arxiv_id, paper in papers_by_id.items() if arxiv_id not in self.papers_by_id]
+        self.papers_by_id = papers_by_id
+        self._positions = {arxiv_id: i for i, arxiv_id in enumerate(papers_by_id)}
+
+        for arxiv_id in removed:
+            self.index.remove(arxiv_id)
+        touched = set()
+        if removed:
+            for feed_id, ids in self.results.items():
+                if ids and not ids.isdisjoint(removed):
+                    ids -= removed
+                    touched.add(feed_id)
+
+        # Match the (small) set of added papers against every feed using an index of just those papers
+        delta = PostingIndex()
+        for paper in added:
+            delta.add(paper)
+            self.index.add(paper)
+        if added:
+            for feed_id, feed in self.feeds.items():
+                matched = delta.evaluate(feed)
+                if matched:
+                    self.results[feed_id] |= matched
+                    touched.add(feed_id)
+        return touched
+
+    def _apply_definitions(self, feeds: List[Dict]) -> Set[int]:
+        """Evaluate new or edited feeds against the whole cache and forget deleted ones"""
+        current = {feed['id']: feed for feed in feeds}
+        for feed_id in self.feeds.keys() - current.keys():
+            self.results.pop(feed_id, None)
+            self.ordered.pop(feed_id, None)
+
+        touched = set()
+        for feed_id, feed in current.items():
+            old = self.feeds.get(feed_id)
+            if old is None or any(old[k] != feed[k] for k in ('categories', 'keywords', 'authors')):
+                self.results[feed_id] = self.index.evaluate(feed)
+                touched.add(feed_id)
+        self.feeds = current
+        return touched
+
+    def get_result_ids(self, feed_id: int) -> Optional[List[str]]:
+        """Get the precomputed arXiv ids of a feed in cache order"""
+        ids = self.ordered.get(feed_id)
+        if ids is None:
+            with self._lock:
+                results = self.results.get(feed_id)
+                if results is None:
+                    return None
+                ids = self.ordered[feed_id] = sorted(results, key=self._positions.__getitem__)
+        return ids
+
+    def get_papers(self, feed_id: int) -> Optional[List[Dict]]:
+        """Get the precomputed papers of a feed in cache order"""
+        ids = self.get_result_ids(feed_id)
+        if ids is None:
+            return None
+        return [self.papers_by_id[arxiv_id] for arxiv_id in ids]
+
+    def memory_bytes(self) -> int:
+        """Approximate bytes of the index and the per-feed results"""
+        results = sum(len(ids) for ids in list(self.results.values())) * CONTAINER_ENTRY_BYTES
+        ordered = sum(sys.getsizeof(ids) for ids in list(self.ordered.values()))
+        return self.index.nbytes + results + ordered + sys.getsizeof(self.papers_by_id) + sys.getsizeof(self._positions)
+
+    def get_status(self) -> Dict:
+        """Get feed counts and the cost of the last update"""
+        return {
+            'feeds': len(self.feeds),
+            'generation': self.generation,
+            'revision': self.revision,
+            'matches': sum(len(ids) for ids in self.results.values()),
+            'last_sync_ms': round(self.last_sync_ms, 2)
+        }
@@ -0,0 +1,173 @@
+"""
+Paper Serializer - Precomputed JSON encodings of the cached papers for API clients
+"""
+import base64
+import binascii
+import hashlib
+import json
+from datetime import date
+from typing import List, Dict, Optional, Sequence, Iterator, Tuple
+from .columnar import PaperTable, SORT_KEYS, numpy_available
+from .eviction import estimate_size
+
+
+# Fields exposed through the API, in output order
+API_FIELDS = ('arxiv_id', 'title', 'authors', 'abstract', 'published_date', 'categories')
+
+
+def _encode(value) -> str:
+    """Compact JSON encoding used for every value"""
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+def encode_cursor(offset: int, generation: int) -> str:
+    """Encode a pagination offset into the cache generation it belongs to as an opaque cursor"""
+    return base64.urlsafe_b64encode(f"{generation}:{offset}".encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[int, int]:
+    """Decode an opaque cursor back into (offset, generation), raising ValueError if malformed"""
+    padded = cursor + '=' * (-len(cursor) % 4)
+    try:
+        generation, offset = base64.urlsafe_b64decode(padded.encode()).decode().split(':')
+    except (ValueError, UnicodeDecodeError, binascii.Error):
+        raise ValueError("Malformed cursor")
+    offset, generation = int(offset), int(generation)
+    if offset < 0:
+        raise ValueError("Negative cursor offset")
+    return offset, generation
+
+
+class PaperSnapshot:
+    """Serialized view of one cache generation; each field is JSON-encoded once at build time"""
+
+    def __init__(self, papers: List[Dict], generation: int):
+        self.generation = generation
+        self.papers = papers
+        self.size = len(papers)
+        self._table = None
+        self._nbytes = None
+        self.categories = [set(paper.get('categories', [])) for paper in papers]
+        self.dates = [
+            paper['published_date'].date() if paper.get('published_date') else None
+            for paper in papers
+        ]
+        self.search_text = [
+            f"{paper.get('title', '')} {paper.get('abstract', '')}".lower()
+            for paper in papers
+        ]
+        self.encoded_fields = [self._encode_fields(paper) for paper in papers]
+        self.encoded_records = [
+            '{' + ','.join(f'"{name}":{fields[name]}' for name in API_FIELDS) + '}'
+            for fields in self.encoded_fields
+        ]
+
+    @staticmethod
+    def _encode_fields(paper: Dict) -> Dict[str, str]:
+        """Encode each API field of a paper separately"""
+        published = paper.get('published_date')
+        return {
+            'arxiv_id': _encode(paper.get('arxiv_id')),
+            'title': _encode(paper.get('title')),
+            'authors': _encode(paper.get('authors', [])),
+            'abstract': _encode(paper.get('abstract')),
+            'published_date': _encode(published.isoformat() if published else None),
+            'categories': _encode(paper.get('categories', [])),
+        }
+
+    def etag(self, query: str = '', media_type: str = 'json') -> str:
+        """Get an ETag for a response derived from this generation, a request query string and its format"""
+        digest = hashlib.sha1(f"{media_type}?{query}".encode()).hexdigest()[:16]
+        return f'"g{self.generation}-{digest}"'
+
+    def memory_bytes(self) -> int:
+        """Approximate bytes of the encodings and columns built for this generation, excluding the papers"""
+        if self._nbytes is None:
+            self._nbytes = sum(estimate_size(column) for column in (
+                self.categories, self.dates, self.search_text, self.encoded_fields, self.encoded_records
+            ))
+        table = self._table
+        return self._nbytes + (table.memory_bytes() if table is not None else 0)
+
+    @property
+    def table(self) -> Optional[PaperTable]:
+        """Columnar view of the papers, built on first use; None without numpy"""
+        if self._table is None and numpy_available():
+            self._table = PaperTable(self.papers)
+        return self._table
+
+    def all_categories(self) -> set:
+        """Get every category of the papers in this generation"""
+        table = self.table
+        if table is not None:
+            return set(table.category_bits)
+        return set().union(*self.categories)
+
+    def select(self, category: Optional[str] = None, since: Optional[date] = None,
+               until: Optional[date] = None, query: Optional[str] = None,
+               sort_by: Optional[str] = None, descending: bool = True) -> List[int]:
+        """Get indices of papers matching all given filters, in cache order unless sorted"""
+        if sort_by and sort_by not in SORT_KEYS:
+            raise ValueError(f"Unknown sort key: {sort_by}")
+        categories = [category] if category and category != 'all' else None
+
+        table = self.table
+        if table is not None:
+            indices = table.select(categories, since, until, sort_by, descending).tolist()
+        else:
+            indices = self._select_rows(categories, since, until)
+            if sort_by:
+                indices = self._sort_rows(indices, sort_by, descending)
+
+        if query:
+            query = query.lower()
+            indices = [i for i in indices if query in self.search_text[i]]
+        return indices
+
+    def _select_rows(self, categories: Optional[List[str]], since: Optional[date],
+                     until: Optional[date]) -> List[int]:
+        """Per-paper filtering used when numpy is not installed"""
+        indices = []
+        for i in range(self.size):
+            if categories and not self.categories[i].intersection(categories):
+                continue
+            if since and (self.dates[i] is None or self.dates[i] < since):
+                continue
+            if until and (self.dates[i] is None or self.dates[i] > until):
+                continue
+            indices.append(i)
+        return indices
+
+    def _sort_rows(self, indices: List[int], sort_by: str, descending: bool) -> List[int]:
+        """Per-paper sorting used when numpy is not installed; missing dates sort last"""
+        if sort_by == 'date':
+            dated = [i for i in indices if self.papers[i].get('published_date')]
+            undated = [i for i in indices if not self.papers[i].get('published_date')]
+            dated.sort(key=lambda i: self.papers[i]['published_date'], reverse=descending)
+            return dated + undated
+        if sort_by == 'title':
+            key = lambda i: self.papers[i].get('title', '').lower()
+        else:
+            key = lambda i: len(self.papers[i].get('authors', []))
+        return sorted(indices, key=key, reverse=descending)
+
+    def encode(self, index: int, fields: Optional[Sequence[str]] = None) -> str:
+        """Get the JSON object for one paper, optionally projected to `fields`"""
+        if not fields:
+            return self.encoded_records[index]
+        encoded = self.encoded_fields[index]
+        return '{' + ','.join(f'"{name}":{encoded[name]}' for name in fields) + '}'
+
+    def render_json(self, indices: Sequence[int], fields: Optional[Sequence[str]] = None,
+                    next_cursor: Optional[str] = None, total: int = 0) -> str:
+        """Render a page of papers as a single JSON document"""
+        papers = ','.join(self.encode(i, fields) for i in indices)
+        return (
+            f'{{"generation":{self.generation},"total":{total},"count":{len(indices)},'
+            f'"next_cursor":{_encode(next_cursor)},"papers":[{papers}]}}'
+        )
+
+    def iter_ndjson(self, indices: Sequence[int], fields: Optional[Sequence[str]] = None) -> Iterator[str]:
+        """Yield one JSON line per paper"""
+        for i in indices:
+            yield self.encode(i, fields) + '\n'
@@ -0,0 +1,250 @@
+"""
+Shared Cache - SQLite-backed cache shared by several worker processes
+"""
+import json
+import os
+import socket
+import threading
+import time
+import zlib
+from datetime import datetime, date
+from typing import List, Dict, Optional, Tuple
+from .cache_manager import CacheManager
+from .sqlite_store import SQLiteStore
+
+
+def encode_papers(papers: List[Dict]) -> bytes:
+    """Encode papers as compressed JSON, with dates stored as ISO strings"""
+    records = []
+    for paper in papers:
+        record = dict(paper)
+        if record.get('published_date'):
+            record['published_date'] = record['published_date'].isoformat()
+        records.append(record)
+    return zlib.compress(json.dumps(records, separators=(',', ':')).encode())
+
+
+def decode_papers(payload: bytes) -> List[Dict]:
+    """Decode papers written by `encode_papers`"""
+    papers = json.loads(zlib.decompress(payload))
+    for paper in papers:
+        if paper.get('published_date'):
+            paper['published_date'] = datetime.fromisoformat(paper['published_date'])
+    return papers
+
+
+class SharedStore(SQLiteStore):
+    """SQLite file holding published cache generations and leader leases"""
+
+    schema = (
+        """
+        CREATE TABLE IF NOT EXISTS generations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            created_at REAL NOT NULL,
+            cache_date TEXT NOT NULL,
+            papers_count INTEGER NOT NULL,
+            payload BLOB NOT NULL
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS leases (
+            name TEXT PRIMARY KEY,
+            owner TEXT NOT NULL,
+            expires_at REAL NOT NULL
+        )
+        """,
+    )
+
+    def __init__(self, path: str, keep_generations: int = 3):
+        super().__init__(path)
+        self.keep_generations = keep_generations
+
+    def latest_generation(self) -> Optional[int]:
+        """Get the id of the newest published generation"""
+        row = self._connect().execute("SELECT MAX(id) FROM generations").fetchone()
+        return row[0]
+
+    def load_generation(self, generation: int) -> Optional[Tuple[int, datetime, date, List[Dict]]]:
+        """Load a published generation as (id, created_at, cache_date, papers)"""
+        row = self._connect().execute(
+            "SELECT id, created_at, cache_date, payload FROM generations WHERE id = ?",
+            (generation,)
+        ).fetchone()
+        if row is None:
+            return None
+        return (
+            row[0],
+            datetime.fromtimestamp(row[1]),
+            date.fromisoformat(row[2]),
+            decode_papers(row[3])
+        )
+
+    def publish(self, papers: List[Dict], updated: datetime) -> int:
+        """Publish papers as a new generation and return its id"""
+        payload = encode_papers(papers)
+        with self.transaction() as conn:
+            cursor = conn.execute(
+                "INSERT INTO generations (created_at, cache_date, papers_count, payload) VALUES (?, ?, ?, ?)",
+                (updated.timestamp(), updated.date().isoformat(), len(papers), payload)
+            )
+            generation = cursor.lastrowid
+            conn.execute("DELETE FROM generations WHERE id <= ?", (generation - self.keep_generations,))
+        return generation
+
+    def acquire_lease(self, name: str, owner: str, ttl_seconds: float) -> bool:
+        """Take or renew the named lease unless another owner holds an unexpired one"""
+        now = time.time()
+        with self.transaction() as conn:
+            conn.execute(
+                """
+                INSERT INTO leases (name, owner, expires_at) VALUES (?, ?, ?)
+                ON CONFLICT(name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at
+                WHERE leases.owner = excluded.owner OR leases.expires_at < ?
+                """,
+                (name, owner, now + ttl_seconds, now)
+            )
+            row = conn.execute("SELECT owner FROM leases WHERE name = ?", (name,)).fetchone()
+        return row is not None and row[0] == owner
+
+    def release_lease(self, name: str, owner: str) -> None:
+        """Release the named lease if `owner` holds it"""
+        self._connect().execute("DELETE FROM leases WHERE name = ? AND owner = ?", (name, owner))
+
+    def lease_owner(self, name: str) -> Optional[str]:
+        """Get the current holder of an unexpired lease"""
+        row = self._connect().execute(
+            "SELECT owner FROM leases WHERE name = ? AND expires_at >= ?", (name, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+
+class SharedCacheManager(CacheManager):
+    """Cache manager whose generations are published to and read from a SharedStore
+
+    The memory budget is global: workers run with the same budget, and a worker that evicts
+    publishes the papers it kept as a new generation, so every worker serves the same papers.
+    """
+
+    FETCH_LEASE = 'fetcher'
+
+    def __init__(self, store_path: str, cache_duration_minutes: int = 30,
+                 poll_interval_seconds: float = 1.0, lease_seconds: float = 120,
+                 wait_seconds: float = 35, memory_budget_bytes: Optional[int] = None,
+                 eviction_policy: str = 'lru'):
+        super().__init__(cache_duration_minutes, memory_budget_bytes, eviction_policy)
+        self.store = SharedStore(store_path)
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self.poll_interval_seconds = poll_interval_seconds
+        self.lease_seconds = lease_seconds
+        self.wait_seconds = wait_seconds
+        self._last_poll = 0.0
+        # Request threads and the live feed poller sync concurrently; installs happen one at a time
+        self._sync_lock = threading.Lock()
+
+    def sync(self, force: bool = False) -> None:
+        """Load the newest published generation if it is newer than the local copy"""
+        now = time.monotonic()
+        if not force and now - self._last_poll < self.poll_interval_seconds:
+            return
+        self._last_poll = now
+
+        with self._sync_lock:
+            latest = self.store.latest_generation()
+            if latest is None or latest <= self.cache['generation']:
+                return
+
+            record = self.store.load_generation(latest)
+            if record is None:
+                return
+            generation, updated, cache_date, papers = record
+            # Published papers already fit the shared budget; fitting again only evicts here when this
+            # worker's derived structures measure larger than the publisher's
+            self.cache['papers'] = self.fit_budget(papers)
+            self.cache['last_updated'] = updated
+            self.cache['cache_date'] = cache_date
+            self.cache['generation'] = generation
+
+    def is_cache_valid(self) -> bool:
+        """Check if the newest shared generation is still valid"""
+        self.sync()
+        return super().is_cache_valid()
+
+    def update_cache(self, papers: List[Dict]) -> List[Dict]:
+        """Publish papers as a new shared generation and return the ones kept within the memory budget"""
+        self.load_papers(papers, datetime.now())
+        papers = self.cache['papers']
+        print(f"Published generation {self.cache['generation']} with {len(papers)} papers to {self.store.path}")
+        return papers
+
+    def load_papers(self, papers: List[Dict], updated: datetime) -> None:
+        """Publish papers fetched at `updated` as a new shared generation"""
+        with self._sync_lock:
+            papers = self.fit_budget(papers)
+            generation = self.store.publish(papers, updated)
+
+            self.cache['papers'] = papers
+            self.cache['last_updated'] = updated
+            self.cache['cache_date'] = updated.date()
+            self.cache['generation'] = generation
+
+    def get_generation(self) -> int:
+        """Get the newest shared generation"""
+        self.sync()
+        return super().get_generation()
+
+    def get_latest_papers(self) -> List[Dict]:
+        """Get the newest shared papers, even if they have expired"""
+        self.sync(force=True)
+        return self.cache['papers']
+
+    def wait_for_papers(self) -> List[Dict]:
+        """Get the newest shared papers, waiting for the fetcher only while nothing was published yet"""
+        papers = self.get_latest_papers()
+        if papers:
+            return papers
+        deadline = time.monotonic() + self.wait_seconds
+        # Stop waiting as soon as no worker is fetching, rather than sleeping out the deadline
+        while time.monotonic() < deadline and self.is_fetching():
+            time.sleep(0.5)
+            papers = self.get_latest_papers()
+            if papers:
+                return papers
+        return self.get_latest_papers()
+
+    def acquire_fetch_lock(self) -> bool:
+        """Become the fetching worker unless another thread or worker is already fetching"""
+        # The lease is held per process, so threads of this worker also coordinate locally
+        if not self._fetch_lock.acquire(blocking=False):
+            return False
+        try:
+            if self.store.acquire_lease(self.FETCH_LEASE, self.owner, self.lease_seconds):
+                return True
+        except Exception:
+            self._fetch_lock.release()
+            raise
+        self._fetch_lock.release()
+        return False
+
+    def release_fetch_lock(self) -> None:
+        """Release the fetcher lease"""
+        try:
+            self.store.release_lease(self.FETCH_LEASE, self.owner)
+        finally:
+            self._fetch_lock.release()
+
+    def is_fetching(self) -> bool:
+        """Check whether any worker holds the fetcher lease"""
+        return self._fetch_lock.locked() or self.store.lease_owner(self.FETCH_LEASE) is not None
+
+    def get_cache_info(self) -> Dict:
+        """Get cache status information including the shared store state"""
+        info = super().get_cache_info()
+        info['shared_store'] = self.store.path
+        info['fetcher'] = self.store.lease_owner(self.FETCH_LEASE)
+        info['worker'] = self.owner
+        return info
+
+    def clear_cache(self) -> None:
+        """Publish an empty generation so every worker drops its papers"""
+        self.update_cache([])
+        print("Shared cache cleared manually")
@@ -0,0 +1,315 @@
+"""
+Cache Snapshot - Versioned binary export/import of cached papers
+
+Layout (little-endian):
+  preamble   magic b"AXSN", u16 version, u8 compression, u8 reserved, u32 metadata length
+  metadata   UTF-8 JSON: generation, last_updated, papers, strings, raw/body sizes, crc32
+  body       compressed with `compression`:
+               u32 string count, then u32-length-prefixed UTF-8 strings (authors and categories)
+               u32 paper count, then per paper:
+                 u8 flags, i64 published epoch microseconds, i16 UTC offset minutes,
+                 u16 author count, u16 category count, u32 byte lengths of the five text fields,
+                 u32 string-table indices, then the UTF-8 arxiv_id, title, abstract,
+                 published_date_str and extras JSON back to back
+"""
+import gzip
+import json
+import mmap
+import os
+import struct
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Optional, Tuple
+
+
+SNAPSHOT_MAGIC = b"AXSN"
+SNAPSHOT_VERSION = 1
+
+PREAMBLE = struct.Struct("<4sHBxI")
+COUNT = struct.Struct("<I")
+RECORD = struct.Struct("<BqhHH5I")
+
+HAS_DATE = 0x01
+
+# Text fields stored in every record, in order, followed by the extras JSON
+TEXT_FIELDS = ('arxiv_id', 'title', 'abstract', 'published_date_str')
+
+# Fields with a dedicated slot in each record; anything else goes into the extras JSON
+RECORD_FIELDS = ('arxiv_id', 'title', 'abstract', 'published_date', 'published_date_str', 'authors', 'categories')
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Metadata keys every snapshot carries, with the JSON types their values may have
+METADATA_FIELDS = {
+    'generation': (int,),
+    'last_updated': (int, float, type(None)),
+    'papers': (int,),
+    'strings': (int,),
+    'raw_size': (int,),
+    'body_size': (int,),
+    'crc32': (int,),
+}
+
+# zstd is optional; Python 3.14 ships compression.zstd, older versions need the zstandard package
+_zstd = None
+
+
+class SnapshotError(Exception):
+    """Raised for files that are not snapshots, are corrupt, or use an unsupported version"""
+    pass
+
+
+def _load_zstd():
+    global _zstd
+    if _zstd is None:
+        try:
+            from compression import zstd
+            _zstd = (zstd.compress, zstd.decompress)
+        except ImportError:
+            try:
+                import zstandard
+                _zstd = (zstandard.ZstdCompressor(level=9).compress, zstandard.ZstdDecompressor().decompress)
+            except ImportError:
+                _zstd = False
+    return _zstd
+
+
+def available_compressions() -> List[str]:
+    """Compression codecs usable in this environment"""
+    return ['none', 'gzip'] + (['zstd'] if _load_zstd() else [])
+
+
+def _compress(codec: str, data: bytes) -> bytes:
+    if codec == 'none':
+        return data
+    if codec == 'gzip':
+        return gzip.compress(data, compresslevel=6, mtime=0)
+    if codec == 'zstd' and _load_zstd():
+        return _zstd[0](data)
+    raise SnapshotError(f"Unsupported compression: {codec}")
+
+
+def _decompress(codec: str, data) -> bytes:
+    if codec == 'none':
+        return data
+    if codec == 'gzip':
+        return gzip.decompress(data)
+    if codec == 'zstd' and _load_zstd():
+        return _zstd[1](data)
+    raise SnapshotError(f"Unsupported compression: {codec}")
+
+
+CODECS = ('none', 'gzip', 'zstd')
+
+
+def _pack_str(out: list, value: str) -> None:
+    """Append a u32-length-prefixed UTF-8 string"""
+    data = value.encode('utf-8')
+    out.append(COUNT.pack(len(data)))
+    out.append(data)
+
+
+def _encode_body(papers: List[Dict]) -> Tuple[bytes, int]:
+    """Serialize papers with authors and categories interned in a string table"""
+    strings = {}
+    records = []
+    for paper in papers:
+        authors = [strings.setdefault(name, len(strings)) for name in paper.get('authors', [])]
+        categories = [strings.setdefault(cat, len(strings)) for cat in paper.get('categories', [])]
+
+        published = paper.get('published_date')
+        flags, micros, offset = 0, 0, 0
+        if published is not None:
+            flags |= HAS_DATE
+            delta = published - EPOCH if published.tzinfo else published.replace(tzinfo=timezone.utc) - EPOCH
+            micros = (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+            utc_offset = published.utcoffset()
+            offset = int(utc_offset.total_seconds() // 60) if utc_offset else 0
+
+        extras = {key: value for key, value in paper.items() if key not in RECORD_FIELDS}
+        texts = [(paper.get(field) or "").encode('utf-8') for field in TEXT_FIELDS]
+        texts.append(json.dumps(extras, separators=(',', ':'), default=str).encode() if extras else b"")
+
+        records.append(RECORD.pack(flags, micros, offset, len(authors), len(categories), *map(len, texts)))
+        indices = authors + categories
+        if indices:
+            records.append(struct.pack(f"<{len(indices)}I", *indices))
+        records.extend(texts)
+
+    table = [COUNT.pack(len(strings))]
+    for value in strings:
+        _pack_str(table, value)
+    return b"".join(table + [COUNT.pack(len(papers))] + records), len(strings)
+
+
+def _decode_body(body) -> Tuple[List[Dict], int]:
+    """Parse a decompressed body back into paper dicts"""
+    with memoryview(body) as view:
+        return _decode_records(view)
+
+
+def _decode_records(view: memoryview) -> Tuple[List[Dict], int]:
+    unpack_count = COUNT.unpack_from
+    unpack_record = RECORD.unpack_from
+    record_size = RECORD.size
+
+    (string_count,) = unpack_count(view, 0)
+    pos = 4
+    strings = []
+    for _ in range(string_count):
+        (length,) = unpack_count(view, pos)
+        pos += 4
+        strings.append(str(view[pos:pos + length], 'utf-8'))
+        pos += length
+
+    (paper_count,) = unpack_count(view, pos)
+    pos += 4
+    papers = []
+    for _ in range(paper_count):
+        (flags, micros, offset, author_count, category_count,
+         id_len, title_len, abstract_len, date_len, extras_len) = unpack_record(view, pos)
+        pos += record_size
+        index_count = author_count + category_count
+        indices = struct.unpack_from(f"<{index_count}I", view, pos) if index_count else ()
+        pos += 4 * index_count
+
+        end = pos + id_len
+        arxiv_id = str(view[pos:end], 'utf-8')
+        pos, end = end, end + title_len
+        title = str(view[pos:end], 'utf-8')
+        pos, end = end, end + abstract_len
+        abstract = str(view[pos:end], 'utf-8')
+        pos, end = end, end + date_len
+        date_str = str(view[pos:end], 'utf-8')
+        pos, end = end, end + extras_len
+        extras = view[pos:end] if extras_len else None
+        pos = end
+
+        published = None
+        if flags & HAS_DATE:
+            published = EPOCH + timedelta(microseconds=micros)
+            if offset:
+                published = published.astimezone(timezone(timedelta(minutes=offset)))
+        paper = {
+            'title': title,
+            'authors': [strings[i] for i in indices[:author_count]],
+            'abstract': abstract,
+            'published_date': published,
+            'published_date_str': date_str,
+            'arxiv_id': arxiv_id,
+            'categories': [strings[i] for i in indices[author_count:]],
+        }
+        if extras is not None:
+            paper.update(json.loads(str(extras, 'utf-8')))
+        papers.append(paper)
+    return papers, string_count
+
+
+def encode_snapshot(papers: List[Dict], generation: int = 0, last_updated: Optional[datetime] = None,
+                    compression: str = 'gzip') -> bytes:
+    """Serialize papers and cache metadata into snapshot bytes"""
+    if compression not in CODECS:
+        raise SnapshotError(f"Unknown compression: {compression}")
+    raw, string_count = _encode_body(papers)
+    body = _compress(compression, raw)
+    metadata = json.dumps({
+        'generation': generation,
+        'last_updated': last_updated.timestamp() if last_updated else None,
+        'created_at': time.time(),
+        'papers': len(papers),
+        'strings': string_count,
+        'raw_size': len(raw),
+        'body_size': len(body),
+        'crc32': zlib.crc32(raw),
+    }, separators=(',', ':')).encode()
+    preamble = PREAMBLE.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, CODECS.index(compression), len(metadata))
+    return preamble + metadata + body
+
+
+def _read_header(buffer) -> Tuple[Dict, int]:
+    """Validate the preamble and return (metadata, body offset)"""
+    if len(buffer) < PREAMBLE.size:
+        raise SnapshotError("File is too short to be a snapshot")
+    magic, version, codec, metadata_size = PREAMBLE.unpack_from(buffer, 0)
+    if magic != SNAPSHOT_MAGIC:
+        raise SnapshotError("Not a cache snapshot")
+    if version != SNAPSHOT_VERSION:
+        raise SnapshotError(f"Unsupported snapshot version {version} (expected {SNAPSHOT_VERSION})")
+    if codec >= len(CODECS):
+        raise SnapshotError(f"Unknown compression code {codec}")
+    start = PREAMBLE.size
+    try:
+        metadata = json.loads(bytes(buffer[start:start + metadata_size]))
+    except ValueError as e:
+        raise SnapshotError(f"Corrupt snapshot metadata: {e}")
+    if not isinstance(metadata, dict):
+        raise SnapshotError("Corrupt snapshot metadata: not a JSON object")
+    for key, types in METADATA_FIELDS.items():
+        if key not in metadata:
+            raise SnapshotError(f"Corrupt snapshot metadata: missing {key!r}")
+        # bool is an int subclass but never a valid count or size
+        if not isinstance(metadata[key], types) or isinstance(metadata[key], bool):
+            raise SnapshotError(f"Corrupt snapshot metadata: {key!r} is {type(metadata[key]).__name__}")
+    metadata['version'] = version
+    metadata['compression'] = CODECS[codec]
+    return metadata, start + metadata_size
+
+
+def decode_snapshot(buffer) -> Tuple[Dict, List[Dict]]:
+    """Parse snapshot bytes (or any buffer) into (metadata, papers)"""
+    metadata, offset = _read_header(buffer)
+    # Views must be released before an mmap'ed buffer can be closed
+    with memoryview(buffer) as whole, whole[offset:offset + metadata['body_size']] as body:
+        if len(body) != metadata['body_size']:
+            raise SnapshotError("Truncated snapshot body")
+        try:
+            raw = _decompress(metadata['compression'], body)
+        except (OSError, EOFError, zlib.error) as e:
+            raise SnapshotError(f"Corrupt snapshot body: {e}")
+        if zlib.crc32(raw) != metadata['crc32']:
+            raise SnapshotError("Snapshot checksum mismatch")
+        try:
+            papers, _ = _decode_body(raw)
+        except (struct.error, UnicodeDecodeError, IndexError, ValueError) as e:
+            raise SnapshotError(f"Corrupt snapshot records: {e}")
+    return metadata, papers
+
+
+def write_snapshot(path: str, papers: List[Dict], generation: int = 0,
+                   last_updated: Optional[datetime] = None, compression: str = 'gzip') -> Dict:
+    """Atomically write a snapshot file and return its metadata"""
+    data = encode_snapshot(papers, generation, last_updated, compression)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    metadata, _ = _read_header(data)
+    metadata['file_size'] = len(data)
+    return metadata
+
+
+def read_snapshot_info(path: str) -> Dict:
+    """Read a snapshot's metadata without decoding its papers"""
+    with open(path, 'rb') as f:
+        head = f.read(PREAMBLE.size)
+        if len(head) == PREAMBLE.size:
+            head += f.read(PREAMBLE.unpack(head)[3])
+        metadata, _ = _read_header(head)
+    metadata['file_size'] = os.path.getsize(path)
+    return metadata
+
+
+def load_snapshot(path: str) -> Tuple[Dict, List[Dict]]:
+    """Memory-map a snapshot file and decode it into (metadata, papers)"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise SnapshotError("Empty snapshot file")
+        # Uncompressed snapshots are parsed straight from the page cache without a read copy
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            metadata, papers = decode_snapshot(mapped)
+    metadata['file_size'] = os.path.getsize(path)
+    return metadata, papers
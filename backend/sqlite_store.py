@@ -0,0 +1,49 @@
+"""
+SQLite Store - Base for SQLite files shared by threads and worker processes
+"""
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Tuple
+
+
+class SQLiteStore:
+    """SQLite file in WAL mode with one connection per thread; subclasses list their tables in `schema`"""
+
+    schema: Tuple[str, ...] = ()
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        with self.transaction() as conn:
+            for statement in self.schema:
+                conn.execute(statement)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection to the store"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA busy_timeout=10000")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run the block in a write transaction, committing on success and rolling back on error"""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
@@ -0,0 +1,193 @@
+"""
+Tracing - Pluggable spans around the fetch, parse, filter and render stages
+"""
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+
+# Span currently open in this context, used as the parent of new spans
+_current_span = ContextVar('current_span', default=None)
+
+# (name, duration_ms) pairs collected for the Server-Timing header of the current request
+_request_timings = ContextVar('request_timings', default=None)
+
+
+class Span:
+    """A timed operation with OpenTelemetry-style ids and attributes"""
+
+    def __init__(self, name: str, parent: Optional['Span'] = None, attributes: Optional[Dict] = None):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent else None
+        self.attributes = dict(attributes or {})
+        self.error = None
+        self.start_ns = time.time_ns()
+        self._start = time.perf_counter()
+        self.end_ns = None
+        self.duration_ms = 0.0
+
+    def set_attribute(self, key: str, value) -> None:
+        """Attach an attribute to the span"""
+        self.attributes[key] = value
+
+    def end(self) -> None:
+        """Stop timing the span"""
+        self.duration_ms = (time.perf_counter() - self._start) * 1000
+        self.end_ns = time.time_ns()
+
+
+class SpanExporter:
+    """Receives finished spans; the base class discards them"""
+
+    def export(self, span: Span) -> None:
+        pass
+
+
+def _otlp_value(value) -> Dict:
+    """Encode an attribute value as an OTLP AnyValue"""
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+
+class FileSpanExporter(SpanExporter):
+    """Appends spans to a file as OTLP/JSON lines, readable by the OpenTelemetry collector file receiver"""
+
+    def __init__(self, path: str, service_name: str = "follow-research"):
+        self.path = path
+        self.service_name = service_name
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, 'a', buffering=1)
+
+    def export(self, span: Span) -> None:
+        otlp_span = {
+            'traceId': span.trace_id,
+            'spanId': span.span_id,
+            'name': span.name,
+            'kind': 1,
+            'startTimeUnixNano': str(span.start_ns),
+            'endTimeUnixNano': str(span.end_ns),
+            'attributes': [{'key': k, 'value': _otlp_value(v)} for k, v in span.attributes.items()],
+            'status': {'code': 2, 'message': span.error} if span.error else {}
+        }
+        if span.parent_id:
+            otlp_span['parentSpanId'] = span.parent_id
+        record = {
+            'resourceSpans': [{
+                'resource': {'attributes': [{'key': 'service.name', 'value': {'stringValue': self.service_name}}]},
+                'scopeSpans': [{'scope': {'name': 'follow_research'}, 'spans': [otlp_span]}]
+            }]
+        }
+        line = json.dumps(record, separators=(',', ':'))
+        with self._lock:
+            self._file.write(line + '\n')
+
+
+class Tracer:
+    """Creates spans; without an exporter or an active request it does nothing"""
+
+    def __init__(self, exporter: Optional[SpanExporter] = None):
+        self.exporter = exporter
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        """Time the enclosed block as a span named `name`"""
+        timings = _request_timings.get()
+        if self.exporter is None and timings is None:
+            yield None
+            return
+
+        span = Span(name, _current_span.get(), attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except Exception as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.end()
+            _current_span.reset(token)
+            if timings is not None:
+                timings.append((name, span.duration_ms))
+            if self.exporter is not None:
+                self.exporter.export(span)
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """Get the process-wide tracer"""
+    return _tracer
+
+
+def set_tracer(tracer: Tracer) -> None:
+    """Replace the process-wide tracer"""
+    global _tracer
+    _tracer = tracer
+
+
+def span(name: str, **attributes):
+    """Open a span on the process-wide tracer"""
+    return _tracer.span(name, **attributes)
+
+
+def traced(name: str):
+    """Decorator wrapping every call of a function in a span"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _tracer.span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def format_server_timing(timings: List[Tuple[str, float]]) -> str:
+    """Summarize stage timings as a Server-Timing header value, summing repeated stages"""
+    totals = {}
+    for name, duration_ms in timings:
+        totals[name] = totals.get(name, 0.0) + duration_ms
+    return ", ".join(f"{name};dur={duration:.2f}" for name, duration in totals.items())
+
+
+class ServerTimingMiddleware:
+    """ASGI middleware wrapping each request in a root span and reporting stages in Server-Timing"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        timings = []
+        timings_token = _request_timings.set(timings)
+
+        async def send_with_timing(message):
+            if message['type'] == 'http.response.start' and timings:
+                headers = list(message.get('headers', []))
+                headers.append((b'server-timing', format_server_timing(timings).encode()))
+                message = {**message, 'headers': headers}
+            await send(message)
+
+        try:
+            with _tracer.span('http.request', method=scope['method'], path=scope['path']):
+                await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_timings.reset(timings_token)
@@ -0,0 +1,87 @@
+"""
+Columnar Benchmark - Per-dict filtering and sorting versus the NumPy PaperTable
+
+Builds synthetic paper lists and times a date window + category filter + sort
+with both paths.
+
+Usage: python benchmarks/columnar_benchmark.py [--sizes 10000 50000 100000] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.columnar import PaperTable
+
+
+CATEGORIES = ['cs.AI', 'cs.LG', 'cs.CL', 'cs.CV', 'cs.NE', 'stat.ML', 'cs.RO', 'cs.IR', 'cs.HC', 'cs.CR']
+
+
+def make_papers(count: int, seed: int = 0) -> list:
+    """Generate `count` synthetic papers spread over the last year"""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            'arxiv_id': f"http://arxiv.org/abs/{2400 + i // 100000}.{i % 100000:05d}v1",
+            'title': f"Paper {rng.random():.8f}",
+            'authors': [f"Author {j}" for j in range(rng.randint(1, 12))],
+            'published_date': now - timedelta(seconds=rng.randint(0, 365 * 86400)),
+            'categories': rng.sample(CATEGORIES, rng.randint(1, 3)),
+        }
+        for i in range(count)
+    ]
+
+
+def dict_path(papers: list, since: date, categories: set) -> list:
+    """Baseline: Python loop filter on whole UTC days followed by a sort on the tz-aware datetimes"""
+    selected = [
+        paper for paper in papers
+        if paper['published_date'].date() >= since and categories.intersection(paper['categories'])
+    ]
+    selected.sort(key=lambda paper: paper['published_date'], reverse=True)
+    return selected
+
+
+def best_of(func, repeat: int) -> float:
+    """Best wall time of `repeat` calls, in milliseconds"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark columnar vs per-dict paper filtering")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 50000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'papers':>8} {'dict ms':>10} {'table ms':>10} {'speedup':>8} {'build ms':>10}")
+    for size in args.sizes:
+        papers = make_papers(size)
+        since = (datetime.now(timezone.utc) - timedelta(days=30)).date()
+        categories = {'cs.CL', 'cs.CV'}
+
+        started = time.perf_counter()
+        table = PaperTable(papers)
+        build_ms = (time.perf_counter() - started) * 1000
+
+        # Both paths must select the same papers in the same order, ties included
+        expected = [paper['arxiv_id'] for paper in dict_path(papers, since, categories)]
+        actual = [papers[i]['arxiv_id'] for i in table.select(sorted(categories), since=since, sort_by='date').tolist()]
+        assert expected == actual, "Columnar selection differs from the per-dict path"
+
+        dict_ms = best_of(lambda: dict_path(papers, since, categories), args.repeat)
+        table_ms = best_of(lambda: table.select(sorted(categories), since=since, sort_by='date'), args.repeat)
+        print(f"{size:>8} {dict_ms:>10.2f} {table_ms:>10.2f} {dict_ms / table_ms:>7.1f}x {build_ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
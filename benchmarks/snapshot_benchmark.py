@@ -0,0 +1,65 @@
+"""
+Snapshot Benchmark - Load time and size of binary cache snapshots versus parsing arXiv Atom XML
+
+Renders synthetic Atom feeds with scripts/mock_arxiv.py, then compares parsing them with
+ArxivService.parse_xml_response against loading the same papers from snapshot files.
+
+Usage: python benchmarks/snapshot_benchmark.py [--sizes 1000 5000 20000] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "scripts"))
+
+from backend.arxiv_service import ArxivService
+from backend.snapshot import available_compressions, load_snapshot, write_snapshot
+from mock_arxiv import MockArxivServer
+
+
+def best_of(func, repeat: int) -> float:
+    """Best wall time of `repeat` calls, in milliseconds"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark snapshot loading against Atom XML parsing")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    service = ArxivService()
+    directory = tempfile.mkdtemp()
+    print(f"{'papers':>8} {'format':>10} {'size KB':>10} {'load ms':>10} {'speedup':>8}")
+    for size in args.sizes:
+        mock = MockArxivServer(papers=size)
+        xml = mock.render_feed("", 0, size)
+        mock.httpd.server_close()
+        papers = service.parse_xml_response(xml)
+
+        xml_ms = best_of(lambda: service.parse_xml_response(xml), args.repeat)
+        print(f"{size:>8} {'xml':>10} {len(xml.encode()) / 1024:>10.0f} {xml_ms:>10.1f} {'1.0x':>8}")
+
+        for compression in available_compressions():
+            path = os.path.join(directory, f"{size}.{compression}.snapshot")
+            metadata = write_snapshot(path, papers, 1, datetime.now(), compression)
+            _, loaded = load_snapshot(path)
+            assert loaded == papers, "Snapshot round trip changed the papers"
+
+            load_ms = best_of(lambda: load_snapshot(path), args.repeat)
+            print(f"{size:>8} {compression:>10} {metadata['file_size'] / 1024:>10.0f} "
+                  f"{load_ms:>10.1f} {xml_ms / load_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
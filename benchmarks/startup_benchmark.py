@@ -0,0 +1,82 @@
+"""
+Startup Benchmark - Time from process start to the first successful request
+
+Starts the app under uvicorn, polls /healthz until it answers and reports the
+median over several runs. Exits non-zero if the median exceeds the budget.
+
+Usage: python benchmarks/startup_benchmark.py [--runs 5] [--budget 2.0]
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Seconds from process start to the first /healthz response
+DEFAULT_BUDGET_SECONDS = 2.0
+
+
+def free_port() -> int:
+    """Get an unused local TCP port"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def time_to_first_request(timeout_seconds: float = 30) -> float:
+    """Start one app process and measure how long until /healthz answers"""
+    port = free_port()
+    url = f"http://127.0.0.1:{port}/healthz"
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app:app", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        while time.perf_counter() - started < timeout_seconds:
+            if process.poll() is not None:
+                raise RuntimeError(f"App exited with code {process.returncode}")
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except OSError:
+                time.sleep(0.01)
+        raise TimeoutError(f"App did not answer {url} within {timeout_seconds}s")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark app time-to-first-request")
+    parser.add_argument("--runs", type=int, default=5, help="Number of cold starts to time")
+    parser.add_argument("--budget", type=float,
+                        default=float(os.environ.get("STARTUP_BUDGET_SECONDS", DEFAULT_BUDGET_SECONDS)),
+                        help="Maximum allowed median time-to-first-request in seconds")
+    args = parser.parse_args()
+
+    timings = []
+    for run in range(args.runs):
+        elapsed = time_to_first_request()
+        timings.append(elapsed)
+        print(f"run {run + 1}: {elapsed * 1000:.0f} ms")
+
+    median = statistics.median(timings)
+    print(f"median: {median * 1000:.0f} ms  min: {min(timings) * 1000:.0f} ms  "
+          f"max: {max(timings) * 1000:.0f} ms  budget: {args.budget * 1000:.0f} ms")
+
+    if median > args.budget:
+        print("FAIL: time-to-first-request exceeds the startup budget")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
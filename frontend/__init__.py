@@ -3,6 +3,8 @@ Frontend package for Daily AI Research Feed
 """
 from .components import *
 from .styles import get_app_styles
+from .streaming import stream_page
+from .live import LiveFeed, get_live_updates_script
 
 __all__ = [
     'create_paper_card', 
@@ -10,6 +12,13 @@ __all__ = [
     'create_empty_stats_section',
     'create_filter_section', 
     'create_empty_papers_message',
+    'create_related_papers',
+    'create_refresh_status',
+    'create_feed_header',
+    'create_saved_feeds_section',
     'get_category_display_name',
-    'get_app_styles'
+    'get_app_styles',
+    'get_live_updates_script',
+    'stream_page',
+    'LiveFeed'
 ]
\ No newline at end of file
@@ -1,6 +1,8 @@
 """
 Frontend Components - UI components for the Daily AI Research Feed
 """
+from typing import Optional
+from urllib.parse import quote
 from fasthtml.common import *
 
 
@@ -81,15 +83,89 @@ def create_paper_card(paper: dict) -> Article:
         ),
         Div(
             Span(paper.get('published_date_str', 'Unknown date'), cls="paper-date"),
-            A("View on arXiv", href=arxiv_link, target="_blank", cls="arxiv-btn"),
+            Div(
+                Button("🔗 Related", cls="related-btn",
+                       hx_get=f"/related?arxiv_id={quote(paper.get('arxiv_id', ''), safe='')}",
+                       hx_target="next .related-papers", hx_swap="innerHTML"),
+                A("View on arXiv", href=arxiv_link, target="_blank", cls="arxiv-btn"),
+                cls="paper-actions"
+            ),
             cls="paper-meta"
         ),
+        Div(cls="related-papers"),
         cls="paper-card"
     )
 
 
+def create_related_papers(related: list, pending: bool = False) -> Div:
+    """Create the list of papers similar to a card's paper"""
+    if not related and pending:
+        return Div(P("Related papers are still being computed, try again in a moment.", cls="related-empty"))
+    if not related:
+        return Div(P("No related papers found in the current feed.", cls="related-empty"))
+    
+    items = []
+    for paper, score in related:
+        arxiv_url = paper.get('arxiv_id', '')
+        arxiv_link = arxiv_url if 'arxiv.org' in arxiv_url else f"https://arxiv.org/abs/{arxiv_url}"
+        items.append(Li(
+            A(paper.get('title', 'Untitled'), href=arxiv_link, target="_blank"),
+            Span(f"{score:.0%}", cls="related-score")
+        ))
+    
+    return Div(
+        Div("Related papers", cls="related-title"),
+        Ul(*items, cls="related-list")
+    )
+
+
+def create_refresh_status(since_generation: int, refreshing: bool = True, updated: bool = False,
+                          reload: bool = False, retry_after: Optional[int] = None) -> Div:
+    """Create the refresh indicator that polls until a newer cache generation lands"""
+    if updated:
+        return Div("✨ New papers are added to the top of the list", id="refresh-status", cls="refresh-status")
+    if retry_after is not None:
+        return Div(f"⏸️ Refreshed recently, try again in {retry_after}s", id="refresh-status", cls="refresh-status")
+    if not refreshing:
+        return Div("✅ Already up to date", id="refresh-status", cls="refresh-status")
+    
+    # Pages without a card grid cannot receive pushed cards and reload instead
+    return Div(
+        "⏳ Fetching new papers...",
+        hx_get=f"/refresh/status?since={since_generation}{'&reload=1' if reload else ''}",
+        hx_trigger="every 2s",
+        hx_swap="outerHTML",
+        id="refresh-status",
+        cls="refresh-status"
+    )
+
+
+def create_refresh_button(label: str, reload: bool = False) -> Form:
+    """Create the refresh button; htmx swaps the reply into the refresh indicator, plain forms redirect"""
+    return Form(
+        Button(label, type="submit", cls="refresh-btn"),
+        method="post",
+        action="/refresh",
+        hx_post=f"/refresh{'?reload=1' if reload else ''}",
+        hx_target="#refresh-status",
+        hx_swap="outerHTML",
+        cls="refresh-form"
+    )
+
+
+def create_refresh_indicator(refreshing_since: Optional[int], retry_after: Optional[int] = None,
+                             reload: bool = False) -> Div:
+    """Create the indicator shown under the refresh button, an empty placeholder when idle"""
+    if refreshing_since is not None:
+        return create_refresh_status(refreshing_since, reload=reload)
+    if retry_after is not None:
+        return create_refresh_status(0, refreshing=False, retry_after=retry_after)
+    return Div(id="refresh-status")
+
+
 def create_stats_section(total_papers: int, all_papers_count: int, categories_count: int, 
-                        cache_age_minutes: int, category: str = None) -> Section:
+                        cache_age_minutes: int, category: str = None,
+                        refreshing_since: Optional[int] = None, retry_after: Optional[int] = None) -> Section:
     """Create the stats section with glittery header"""
     return Section(
         Div(
@@ -125,14 +201,15 @@ def create_stats_section(total_papers: int, all_papers_count: int, categories_co
                 cls="stats-grid"
             ),
             P(f"{'🔍 ' + get_category_display_name(category) if category and category != 'all' else '🌟 Latest from arXiv'}"),
-            A("🔄 Refresh", href="/refresh", role="button", cls="refresh-btn"),
+            create_refresh_button("🔄 Refresh"),
+            create_refresh_indicator(refreshing_since, retry_after),
             cls="stats-content"
         ),
         cls="stats-section"
     )
 
 
-def create_empty_stats_section() -> Section:
+def create_empty_stats_section(refreshing_since: Optional[int] = None, retry_after: Optional[int] = None) -> Section:
     """Create stats section for empty state"""
     return Section(
         Div(
@@ -158,7 +235,8 @@ def create_empty_stats_section() -> Section:
                 cls="stats-grid"
             ),
             P("🚀 Initialize your collection"),
-            A("🔄 Fetch Papers", href="/refresh", role="button", cls="refresh-btn"),
+            create_refresh_button("🔄 Fetch Papers", reload=True),
+            create_refresh_indicator(refreshing_since, retry_after, reload=True),
             cls="stats-content"
         ),
         cls="stats-section"
@@ -185,6 +263,8 @@ def create_filter_section(categories: set, current_category: str = None) -> Sect
                   cls=f"filter-badge {'active' if is_active else ''}")
             )
     
+    filter_badges.append(A("⭐ Saved Feeds", href="/feeds", cls="filter-badge"))
+    
     return Section(
         Div("Research Categories", cls="filter-title"),
         Div(*filter_badges, cls="filter-badges"),
@@ -192,10 +272,83 @@ def create_filter_section(categories: set, current_category: str = None) -> Sect
     )
 
 
+def describe_feed(feed: dict) -> str:
+    """Summarize a saved feed definition in one line"""
+    parts = []
+    if feed.get('categories'):
+        parts.append(" or ".join(get_category_display_name(cat) for cat in feed['categories']))
+    interests = [f'"{keyword}"' for keyword in feed.get('keywords', [])] + feed.get('authors', [])
+    if interests:
+        parts.append(" or ".join(interests))
+    return " · ".join(parts)
+
+
+def create_feed_header(feed: dict, total_papers: int) -> Section:
+    """Create the header section of a saved feed page"""
+    return Section(
+        Div(
+            Div("⭐", cls="header-icon"),
+            H2(Span(feed['name'], cls="glitter-text")),
+            Div(
+                Div(
+                    Span(str(total_papers), cls="stat-number"),
+                    Div("📄 Papers", cls="stat-label"),
+                    cls="stat-item"
+                ),
+                cls="stats-grid"
+            ),
+            P(describe_feed(feed)),
+            A("← All papers", href="/", role="button", cls="refresh-btn"),
+            cls="stats-content"
+        ),
+        cls="stats-section"
+    )
+
+
+def create_saved_feeds_section(feeds: list, categories: set, error: str = None) -> Section:
+    """Create the saved feeds list and the form for a new feed"""
+    rows = [
+        Li(
+            A(feed['name'], href=f"/feeds/{feed['id']}", cls="saved-feed-name"),
+            Span(f"{count} papers", cls="saved-feed-count"),
+            Div(describe_feed(feed), cls="saved-feed-definition"),
+            Form(
+                Button("Delete", type="submit", cls="saved-feed-delete"),
+                method="post", action=f"/feeds/{feed['id']}/delete"
+            ),
+            cls="saved-feed"
+        )
+        for feed, count in feeds
+    ]
+    
+    category_options = [
+        Label(Input(type="checkbox", name="categories", value=cat), get_category_display_name(cat),
+              cls="saved-feed-category")
+        for cat in sorted(categories | set(CATEGORY_NAMES))
+    ]
+    
+    return Section(
+        Div("Saved Feeds", cls="filter-title"),
+        Ul(*rows, cls="saved-feeds") if rows else P("No saved feeds yet."),
+        Form(
+            Div("New feed", cls="filter-title"),
+            P(error, cls="saved-feed-error") if error else None,
+            Input(name="name", placeholder="Feed name", required=True),
+            Fieldset(Legend("Categories (any)"), *category_options),
+            Textarea(name="keywords", placeholder="Keywords, one per line (all words of a line must appear)", rows=3),
+            Textarea(name="authors", placeholder="Authors to follow, one per line", rows=3),
+            Button("Save feed", type="submit"),
+            method="post", action="/feeds", cls="saved-feed-form"
+        ),
+        cls="filter-section"
+    )
+
+
 def create_empty_papers_message() -> Div:
     """Create message for when no papers are found in category"""
     return Div(
         H3("No Research Papers Available"),
         P("No papers found in the selected category. Try a different filter or refresh the collection."),
+        cls="empty-papers",
         style="text-align: center; padding: 2rem; color: var(--text-muted);"
     )
\ No newline at end of file
@@ -0,0 +1,145 @@
+"""
+Live Updates - Push the cards of newly arrived papers to open pages over server-sent events
+"""
+import asyncio
+import contextvars
+from typing import AsyncIterator, Dict, List, Optional
+from fasthtml.common import *
+from .components import create_paper_card
+from backend.broadcast import Broadcaster, RESYNC_EVENT, format_event
+from backend.tracing import span
+
+
+# Topic of pages showing every category
+ALL_TOPIC = 'all'
+
+# Tells EventSource to wait 5 seconds before reconnecting after a dropped connection
+RETRY_EVENT = "retry: 5000\n\n"
+
+# Keeps idle connections open through proxies that drop silent streams
+KEEPALIVE_EVENT = ": keepalive\n\n"
+
+# Prepends pushed cards to the grid; events at or below the rendered generation are ignored
+LIVE_UPDATES_SCRIPT = """
+document.addEventListener('DOMContentLoaded', () => {
+    const grid = document.querySelector('.grid-container[data-generation]');
+    if (!grid || !window.EventSource) return;
+    let generation = Number(grid.dataset.generation);
+    const category = new URLSearchParams(location.search).get('category') || 'all';
+    const source = new EventSource(`/events?category=${encodeURIComponent(category)}&since=${generation}`);
+    source.addEventListener('papers', (event) => {
+        const eventGeneration = Number(event.lastEventId);
+        if (eventGeneration <= generation) return;
+        generation = eventGeneration;
+        grid.querySelector('.empty-papers')?.remove();
+        grid.insertAdjacentHTML('afterbegin', event.data);
+        if (window.htmx) htmx.process(grid);
+    });
+    source.addEventListener('reload', () => { source.close(); location.reload(); });
+});
+"""
+
+
+def get_live_updates_script() -> Script:
+    """Get the client script subscribing the page to pushed cards"""
+    return Script(LIVE_UPDATES_SCRIPT)
+
+
+class LiveFeed:
+    """Watches PaperService for new cache generations and publishes only the new cards per topic"""
+
+    def __init__(self, paper_service, broadcaster: Optional[Broadcaster] = None,
+                 poll_interval_seconds: float = 1.0, keepalive_seconds: float = 15.0,
+                 max_push_papers: int = 100, shutdown_event: Optional[asyncio.Event] = None):
+        self.paper_service = paper_service
+        self.broadcaster = broadcaster or Broadcaster()
+        self.poll_interval_seconds = poll_interval_seconds
+        self.keepalive_seconds = keepalive_seconds
+        self.max_push_papers = max_push_papers
+        self.shutdown_event = shutdown_event
+        self.generation = None
+        self.known_ids = set()
+        self._task = None
+
+    async def start(self) -> None:
+        """Record the current generation and start the watcher task if it is not running"""
+        if self.generation is None:
+            await self.check()
+        if self._task is None or self._task.done():
+            # A fresh context keeps the watcher's spans out of the request that happened to start it
+            self._task = asyncio.get_running_loop().create_task(self._watch(), context=contextvars.Context())
+
+    async def _watch(self) -> None:
+        while not (self.shutdown_event and self.shutdown_event.is_set()):
+            try:
+                await self.check()
+            except Exception as e:
+                print(f"Live feed check failed: {e}")
+            try:
+                if self.shutdown_event:
+                    await asyncio.wait_for(self.shutdown_event.wait(), self.poll_interval_seconds)
+                else:
+                    await asyncio.sleep(self.poll_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+        self.broadcaster.close()
+
+    async def check(self) -> int:
+        """Publish cards for papers that are new in the current generation and return how many"""
+        generation, papers = await asyncio.to_thread(self.paper_service.get_current_generation)
+        if generation == self.generation:
+            return 0
+
+        first_check = self.generation is None
+        new_papers = [paper for paper in papers if paper.get('arxiv_id') not in self.known_ids]
+        self.generation = generation
+        self.known_ids = {paper.get('arxiv_id') for paper in papers}
+        if first_check or not new_papers:
+            return 0
+
+        topics = list(self.broadcaster.topics)
+        if len(new_papers) > self.max_push_papers:
+            # Large turnovers (e.g. a new day) are cheaper to reload than to push card by card
+            for topic in topics:
+                self.broadcaster.publish(topic, RESYNC_EVENT)
+            return len(new_papers)
+
+        # Each card is rendered once, then shared by every topic it belongs to
+        cards = await asyncio.to_thread(self._render_cards, new_papers) if topics else []
+        for topic in topics:
+            html = "".join(
+                card for paper, card in zip(new_papers, cards)
+                if topic == ALL_TOPIC or topic in paper.get('categories', [])
+            )
+            if html:
+                self.broadcaster.publish(topic, format_event("papers", html, generation))
+        return len(new_papers)
+
+    def _render_cards(self, papers: List[Dict]) -> List[str]:
+        with span("render.live_cards", papers=len(papers)):
+            return [to_xml(create_paper_card(paper)) for paper in papers]
+
+    async def stream(self, category: Optional[str] = None, since: Optional[int] = None) -> AsyncIterator[str]:
+        """Yield server-sent events for one client until it disconnects or the server shuts down"""
+        await self.start()
+        topic = category if category and category != 'all' else ALL_TOPIC
+        queue = self.broadcaster.subscribe(topic)
+        try:
+            yield RETRY_EVENT
+            if since is not None and since < self.generation:
+                # The page predates the current generation and its delta is gone; start over
+                yield RESYNC_EVENT
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), self.keepalive_seconds)
+                except asyncio.TimeoutError:
+                    message = KEEPALIVE_EVENT
+                if message is None:
+                    return
+                yield message
+        finally:
+            self.broadcaster.unsubscribe(topic, queue)
+
+    def get_status(self) -> Dict:
+        """Get the watched generation and broadcaster counters"""
+        return {'generation': self.generation, **self.broadcaster.get_status()}
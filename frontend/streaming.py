@@ -0,0 +1,50 @@
+"""
+Streaming Renderer - Incremental HTML rendering for large paper lists
+"""
+from typing import Dict, Iterator, List, Optional, Sequence
+from fasthtml.common import *
+from .components import create_paper_card, create_empty_papers_message
+from backend.tracing import span
+
+
+# Marker swapped out of the serialized page shell so cards can be streamed in its place
+CARDS_PLACEHOLDER = "<!--paper-cards-->"
+
+# Number of paper cards serialized per flushed chunk
+DEFAULT_CHUNK_SIZE = 25
+
+
+def render_page_shell(req, title: str, sections: Sequence, generation: Optional[int] = None) -> tuple:
+    """Serialize the full page around an empty papers container, split at the cards slot"""
+    body = Main(
+        H1(title),
+        *sections,
+        Div(NotStr(CARDS_PLACEHOLDER), cls="grid-container", data_generation=generation),
+        cls="container"
+    )
+    page = to_xml(respond(req, [Title(title)], body))
+    head, tail = page.split(CARDS_PLACEHOLDER, 1)
+    return head, tail
+
+
+def iter_card_chunks(papers: List[Dict], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """Yield serialized paper cards in chunks of `chunk_size`"""
+    if not papers:
+        yield to_xml(create_empty_papers_message())
+        return
+
+    for start in range(0, len(papers), chunk_size):
+        chunk = papers[start:start + chunk_size]
+        with span("render.cards", papers=len(chunk)):
+            html = "".join(to_xml(create_paper_card(paper)) for paper in chunk)
+        yield html
+
+
+def stream_page(req, title: str, sections: Sequence, papers: List[Dict],
+                chunk_size: int = DEFAULT_CHUNK_SIZE, generation: Optional[int] = None) -> Iterator[str]:
+    """Generate the page as HTML chunks: head and header sections first, then cards"""
+    with span("render.shell"):
+        head, tail = render_page_shell(req, title, sections, generation)
+    yield head
+    yield from iter_card_chunks(papers, chunk_size)
+    yield tail
@@ -113,6 +113,55 @@ def get_app_styles() -> Style:
         color: white;
         text-decoration: none;
     }
+    .paper-actions {
+        display: flex;
+        gap: 0.5rem;
+        align-items: center;
+    }
+    .related-btn {
+        font-size: 0.875rem;
+        padding: 0.5rem 1rem;
+        margin: 0;
+        width: auto;
+        background: var(--card-bg);
+        color: var(--accent-blue);
+        border: 1px solid var(--accent-blue);
+        border-radius: 0.5rem;
+        font-weight: 500;
+    }
+    .related-btn:hover {
+        background: var(--accent-blue);
+        color: white;
+    }
+    .related-papers:not(:empty) {
+        margin-top: 1rem;
+        padding-top: 1rem;
+        border-top: 1px dashed var(--card-border);
+    }
+    .related-title {
+        font-size: 0.875rem;
+        font-weight: 600;
+        color: var(--text-primary);
+        margin-bottom: 0.5rem;
+    }
+    .related-list {
+        margin: 0;
+        padding-left: 1.25rem;
+        font-size: 0.875rem;
+    }
+    .related-list li {
+        margin-bottom: 0.25rem;
+    }
+    .related-score {
+        margin-left: 0.5rem;
+        font-size: 0.75rem;
+        color: var(--text-muted);
+    }
+    .related-empty {
+        font-size: 0.875rem;
+        color: var(--text-muted);
+        margin: 0;
+    }
     .stats-section {
         background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
         border-radius: 0.75rem;
@@ -315,7 +364,12 @@ def get_app_styles() -> Style:
         margin-bottom: 2rem;
         font-size: 1.1rem;
     }
+    .refresh-form {
+        display: inline-block;
+        margin: 0;
+    }
     .refresh-btn {
+        width: auto;
         background-color: rgba(255, 255, 255, 0.2);
         border: 2px solid rgba(255, 255, 255, 0.3);
         color: white;
@@ -331,6 +385,50 @@ def get_app_styles() -> Style:
         color: white;
         transform: translateY(-2px);
     }
+    .refresh-status {
+        margin-top: 1rem;
+        font-size: 0.9rem;
+        opacity: 0.85;
+    }
+    .saved-feeds {
+        list-style: none;
+        padding: 0;
+        margin-bottom: 2rem;
+    }
+    .saved-feed {
+        display: flex;
+        flex-wrap: wrap;
+        align-items: center;
+        gap: 0.75rem;
+        padding: 0.75rem 0;
+        border-bottom: 1px solid var(--card-border);
+    }
+    .saved-feed-name {
+        font-weight: 600;
+    }
+    .saved-feed-count {
+        color: var(--text-muted);
+        font-size: 0.9rem;
+    }
+    .saved-feed-definition {
+        flex-basis: 100%;
+        color: var(--text-muted);
+        font-size: 0.85rem;
+    }
+    .saved-feed form {
+        margin: 0;
+    }
+    .saved-feed-delete {
+        padding: 0.25rem 0.75rem;
+        font-size: 0.8rem;
+    }
+    .saved-feed-category {
+        display: inline-block;
+        margin-right: 1rem;
+    }
+    .saved-feed-error {
+        color: #dc2626;
+    }
     .grid-container {
         display: flex;
         flex-direction: column;
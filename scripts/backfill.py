@@ -0,0 +1,98 @@
+"""
+Backfill CLI - Build a local corpus of arXiv AI papers by walking submission dates backward
+
+Progress is checkpointed with every batch; rerunning the same command resumes an interrupted
+job. Requests go through the shared rate limiter (one every 3 seconds by default).
+
+Usage:
+  python scripts/backfill.py run data/corpus.sqlite3 --since 2024-01-01 [--until 2024-06-30]
+  python scripts/backfill.py run data/corpus.sqlite3 --since 2024-01-01 --api-url http://127.0.0.1:8099/api/query --rate 20
+  python scripts/backfill.py status data/corpus.sqlite3
+"""
+import argparse
+import os
+import signal
+import sys
+from datetime import date, datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.arxiv_service import ArxivService
+from backend.backfill import BackfillJob, CorpusStore
+from backend.resilience import ARXIV_RATE_LIMITER, TokenBucket
+
+
+def run(args) -> None:
+    """Run or resume a backfill job"""
+    store = CorpusStore(args.corpus)
+    rate_limiter = TokenBucket(args.rate) if args.rate else ARXIV_RATE_LIMITER
+    service = ArxivService(rate_limiter=rate_limiter, base_url=args.api_url)
+    job = BackfillJob(service, store, since=args.since, until=args.until, job=args.job,
+                      window_days=args.window_days, page_size=args.page_size,
+                      batch_size=args.batch_size, max_retries=args.max_retries)
+
+    # SIGTERM finishes the batch in flight and leaves a checkpoint to resume from
+    signal.signal(signal.SIGTERM, lambda *_: job.stop())
+    try:
+        state = job.run(restart=args.restart)
+    except KeyboardInterrupt:
+        state = job.state
+        print("Interrupted; rerun the same command to resume")
+        if state is None:
+            return
+    remaining = "" if state['status'] == 'complete' else f", next window ends {state['cursor'][:10]}"
+    print(f"Job {args.job}: {state['status']}, {state['papers']} papers fetched{remaining}; "
+          f"corpus holds {store.count()} papers")
+    if state['status'] == 'failed':
+        sys.exit(1)
+
+
+def status(args) -> None:
+    """Print the corpus size and every job's checkpoint"""
+    store = CorpusStore(args.corpus)
+    oldest, newest = store.date_range()
+    print(f"Corpus:    {args.corpus}")
+    print(f"Papers:    {store.count()}")
+    if oldest:
+        print(f"Published: {oldest:%Y-%m-%d %H:%M} to {newest:%Y-%m-%d %H:%M} UTC")
+    for job, state, updated_at in store.list_checkpoints():
+        print(f"Job {job}: {state['status']} {state['since']} to {state['until']}, "
+              f"{state['windows']} windows and {state['papers']} papers done, "
+              f"cursor {state['cursor'][:10]} (offset {state['offset']}), "
+              f"updated {datetime.fromtimestamp(updated_at):%Y-%m-%d %H:%M:%S}")
+        if state.get('error'):
+            print(f"  last error: {state['error']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill a local corpus of arXiv AI papers")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run or resume a backfill job")
+    run_parser.add_argument("corpus", help="SQLite corpus file")
+    run_parser.add_argument("--since", type=date.fromisoformat, required=True, help="Oldest day to fetch")
+    run_parser.add_argument("--until", type=date.fromisoformat, help="Newest day to fetch (default: today, UTC)")
+    run_parser.add_argument("--job", default="default", help="Checkpoint name")
+    run_parser.add_argument("--restart", action="store_true", help="Ignore the job's checkpoint and start over")
+    run_parser.add_argument("--window-days", type=int, default=1, help="Days of submissions per query")
+    run_parser.add_argument("--page-size", type=int, default=200, help="Papers per API request")
+    run_parser.add_argument("--batch-size", type=int, default=100, help="Papers per store transaction")
+    run_parser.add_argument("--max-retries", type=int, default=5, help="Consecutive failures before giving up")
+    run_parser.add_argument("--rate", type=float, help="API requests per second (default: arXiv's 1 per 3 s)")
+    run_parser.add_argument("--api-url", default=os.environ.get('ARXIV_API_URL'),
+                            help="arXiv API endpoint, e.g. scripts/mock_arxiv.py (default: ARXIV_API_URL or arXiv)")
+    run_parser.set_defaults(func=run)
+
+    status_parser = commands.add_parser("status", help="Describe a corpus and its jobs")
+    status_parser.add_argument("corpus", help="SQLite corpus file")
+    status_parser.set_defaults(func=status)
+
+    args = parser.parse_args()
+    try:
+        args.func(args)
+    except ValueError as e:
+        sys.exit(str(e))
+
+
+if __name__ == "__main__":
+    main()
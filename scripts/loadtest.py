@@ -0,0 +1,254 @@
+"""
+Load Test - Drive the app at a target request rate against a mock arXiv API
+
+Starts scripts/mock_arxiv.py in-process and the app under uvicorn pointed at it,
+replays a weighted mix of routes at a fixed arrival rate and reports throughput,
+latency percentiles and upstream (mock arXiv) call counts. Latency is measured
+from each request's scheduled start, so a stalled server cannot hide queueing delay.
+With --app-url an already running app is loaded instead; no mock is started and
+the report leaves out upstream calls, which the script cannot see.
+
+Usage:
+  python scripts/loadtest.py --rps 50 --duration 30
+  python scripts/loadtest.py --rps 50 --duration 30 --json results.json
+  python scripts/loadtest.py --rps 50 --duration 30 --baseline results.json
+  python scripts/loadtest.py --rps 50 --duration 30 --app-url 127.0.0.1:5001
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_arxiv import MockArxivServer
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MIX = "/=50,/?category=cs.CV=25,/?category=cs.CL=10,/debug=13,POST /refresh=2"
+
+
+def parse_mix(spec: str) -> list:
+    """Parse '[METHOD ]path=weight,...' into (route, weight) pairs; paths may contain '='"""
+    mix = []
+    for item in spec.split(","):
+        path, _, weight = item.rpartition("=")
+        mix.append((path, float(weight)))
+    return mix
+
+
+def free_port() -> int:
+    """Get an unused local TCP port"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def start_app(port: int, arxiv_url: str, workers: int) -> subprocess.Popen:
+    """Start the app under uvicorn and wait until /healthz answers"""
+    env = dict(os.environ, ARXIV_API_URL=arxiv_url)
+    if workers > 1:
+        env.setdefault("SHARED_CACHE_PATH", os.path.join(tempfile.mkdtemp(), "cache.sqlite3"))
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=ROOT, env=env
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/healthz", timeout=1):
+                return process
+        except OSError:
+            time.sleep(0.05)
+    process.terminate()
+    raise RuntimeError("App did not become healthy within 30s")
+
+
+class LoadGenerator:
+    """Open-loop load generator issuing requests at a fixed arrival rate"""
+
+    def __init__(self, host: str, port: int, mix: list, rps: float, duration: float, workers: int):
+        self.host = host
+        self.port = port
+        self.paths = [path for path, _ in mix]
+        self.weights = [weight for _, weight in mix]
+        self.rps = rps
+        self.duration = duration
+        self.workers = workers
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _connection(self) -> http.client.HTTPConnection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = http.client.HTTPConnection(self.host, self.port, timeout=60)
+            self._local.conn = conn
+        return conn
+
+    def _request(self, route: str, scheduled: float) -> None:
+        method, _, path = route.rpartition(" ")
+        try:
+            conn = self._connection()
+            conn.request(method or "GET", path)
+            response = conn.getresponse()
+            response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException):
+            self._local.conn = None
+            status = 'error'
+        elapsed_ms = (time.perf_counter() - scheduled) * 1000
+        with self._lock:
+            self.latencies[route].append(elapsed_ms)
+            self.statuses[route][status] += 1
+
+    def run(self) -> float:
+        """Issue requests for the configured duration and return the wall time taken"""
+        rng = random.Random(0)
+        interval = 1.0 / self.rps
+        total = int(self.rps * self.duration)
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for i in range(total):
+                scheduled = started + i * interval
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                pool.submit(self._request, rng.choices(self.paths, self.weights)[0], scheduled)
+        return time.perf_counter() - started
+
+
+def summarize(generator: LoadGenerator, wall_seconds: float, upstream: dict = None) -> dict:
+    """Collect throughput, latency percentiles and upstream calls, when known, into a report"""
+    routes = {}
+    all_latencies = []
+    for path in generator.paths:
+        latencies = generator.latencies.get(path, [])
+        all_latencies.extend(latencies)
+        routes[path] = {
+            'requests': len(latencies),
+            'statuses': {str(k): v for k, v in generator.statuses[path].items()},
+            'p50_ms': percentile(latencies, 50),
+            'p90_ms': percentile(latencies, 90),
+            'p99_ms': percentile(latencies, 99),
+            'max_ms': max(latencies, default=0.0),
+        }
+    ok = sum(v for counts in generator.statuses.values() for k, v in counts.items()
+             if isinstance(k, int) and k < 400)
+    report = {
+        'target_rps': generator.rps,
+        'duration_s': round(wall_seconds, 2),
+        'requests': len(all_latencies),
+        'throughput_rps': round(ok / wall_seconds, 2) if wall_seconds else 0.0,
+        'p50_ms': percentile(all_latencies, 50),
+        'p90_ms': percentile(all_latencies, 90),
+        'p99_ms': percentile(all_latencies, 99),
+        'max_ms': max(all_latencies, default=0.0),
+    }
+    if upstream is not None:
+        report['upstream_calls'] = upstream['calls']
+        report['upstream_errors'] = upstream['errors']
+    report['routes'] = routes
+    return report
+
+
+def print_report(report: dict, baseline: dict = None) -> None:
+    """Print a report, with deltas against a baseline report if given"""
+    def delta(key):
+        if not baseline or key not in baseline or key not in report:
+            return ""
+        before, after = baseline[key], report[key]
+        change = (after - before) / before * 100 if before else 0.0
+        return f"  ({before:.1f} -> {change:+.0f}%)"
+
+    print(f"\nRequests: {report['requests']} in {report['duration_s']}s at target {report['target_rps']} rps")
+    print(f"Throughput: {report['throughput_rps']:.1f} rps{delta('throughput_rps')}")
+    for key in ('p50_ms', 'p90_ms', 'p99_ms', 'max_ms'):
+        print(f"{key[:-3]:>10}: {report[key]:8.1f} ms{delta(key)}")
+    if 'upstream_calls' in report:
+        print(f"Upstream arXiv calls: {report['upstream_calls']} "
+              f"(errors: {report['upstream_errors']}){delta('upstream_calls')}")
+
+    print(f"\n{'route':<24} {'reqs':>6} {'p50':>8} {'p90':>8} {'p99':>8}  statuses")
+    for path, route in report['routes'].items():
+        print(f"{path:<24} {route['requests']:>6} {route['p50_ms']:>8.1f} {route['p90_ms']:>8.1f} "
+              f"{route['p99_ms']:>8.1f}  {route['statuses']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the app against a mock arXiv API")
+    parser.add_argument("--rps", type=float, default=20, help="Target requests per second")
+    parser.add_argument("--duration", type=float, default=20, help="Seconds of load")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Weighted routes as '[METHOD ]path=weight,...'")
+    parser.add_argument("--concurrency", type=int, default=64, help="Client threads")
+    parser.add_argument("--app-workers", type=int, default=1, help="uvicorn workers for the app")
+    parser.add_argument("--app-url", help="Load an already running app instead (host:port); no mock is started")
+    parser.add_argument("--mock-papers", type=int, default=5000, help="Mock corpus size")
+    parser.add_argument("--mock-latency", type=float, default=0.3, help="Mock arXiv latency in seconds")
+    parser.add_argument("--mock-jitter", type=float, default=0.1, help="Mock arXiv latency jitter in seconds")
+    parser.add_argument("--mock-error-rate", type=float, default=0.0, help="Fraction of mock calls failing")
+    parser.add_argument("--json", help="Write the report to this file")
+    parser.add_argument("--baseline", help="Compare with a report written by --json")
+    args = parser.parse_args()
+
+    mock = process = None
+    if args.app_url:
+        # The running app talks to whatever arXiv it was configured with, so upstream calls are unknown
+        host, _, port = args.app_url.rpartition(":")
+        port = int(port)
+    else:
+        mock = MockArxivServer(papers=args.mock_papers, spacing=timedelta(minutes=1), latency=args.mock_latency,
+                               jitter=args.mock_jitter, error_rate=args.mock_error_rate).start()
+        print(f"Mock arXiv API on {mock.url}")
+        host, port = "127.0.0.1", free_port()
+        process = start_app(port, mock.url, args.app_workers)
+        print(f"App on http://{host}:{port} ({args.app_workers} worker(s))")
+
+    try:
+        generator = LoadGenerator(host, port, parse_mix(args.mix), args.rps, args.duration, args.concurrency)
+        wall_seconds = generator.run()
+        report = summarize(generator, wall_seconds, mock.get_stats() if mock else None)
+    finally:
+        if process:
+            process.terminate()
+            process.wait()
+        if mock:
+            mock.stop()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
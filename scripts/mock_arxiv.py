@@ -0,0 +1,187 @@
+"""
+Mock arXiv API - Local stand-in for export.arxiv.org/api/query serving synthetic Atom feeds
+
+The corpus is deterministic: paper i is published `i * spacing` before the server
+started, so paging and submittedDate ranges behave like the real API. Latency,
+corpus size and error rate are configurable, and every call is counted.
+
+Usage: python scripts/mock_arxiv.py [--port 8099] [--papers 5000] [--latency 0.2] [--error-rate 0.0]
+"""
+import argparse
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from xml.sax.saxutils import escape
+
+
+CATEGORIES = ['cs.AI', 'cs.LG', 'cs.CL', 'cs.CV', 'cs.NE', 'stat.ML', 'cs.RO', 'cs.IR']
+
+WORDS = """learning neural network transformer attention language vision model diffusion graph
+reinforcement policy agent benchmark dataset training inference robust efficient scalable sparse
+representation generative contrastive retrieval reasoning alignment multimodal segmentation detection
+optimization gradient federated privacy causal probabilistic bayesian kernel embedding""".split()
+
+DATE_RANGE = re.compile(r"submittedDate:\[(\d{12}) TO (\d{12})\]")
+
+
+class MockArxivServer:
+    """Threaded HTTP server answering arXiv API queries from a synthetic corpus"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, papers: int = 5000,
+                 spacing: timedelta = timedelta(minutes=5), latency: float = 0.0,
+                 jitter: float = 0.0, error_rate: float = 0.0, seed: int = 0):
+        self.papers = papers
+        self.spacing = spacing
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.epoch = datetime.now(timezone.utc).replace(microsecond=0)
+        self.calls = 0
+        self.errors = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread = None
+
+        handler = self._make_handler()
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/api/query"
+
+    def start(self) -> 'MockArxivServer':
+        """Serve in a background thread"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Shut the server down"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def get_stats(self) -> dict:
+        """Get the number of API calls and injected errors"""
+        with self._lock:
+            return {'calls': self.calls, 'errors': self.errors}
+
+    def published_at(self, index: int) -> datetime:
+        """Publication time of paper `index`; lower indices are newer"""
+        return self.epoch - index * self.spacing
+
+    def index_range(self, start_date: datetime, end_date: datetime) -> range:
+        """Indices of papers published within [start_date, end_date]"""
+        seconds = self.spacing.total_seconds()
+        first = max(0, int(-((self.epoch - end_date).total_seconds() // -seconds)))
+        last = min(self.papers, int((self.epoch - start_date).total_seconds() // seconds) + 1)
+        return range(first, max(first, last))
+
+    def render_entry(self, index: int) -> str:
+        """Serialize paper `index` as an Atom entry"""
+        rng = random.Random(index)
+        title = " ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 10))).capitalize()
+        abstract = " ".join(rng.choice(WORDS) for _ in range(rng.randint(80, 160)))
+        published = self.published_at(index).strftime("%Y-%m-%dT%H:%M:%SZ")
+        authors = "".join(f"<author><name>Author {rng.randint(1, 5000)}</name></author>"
+                          for _ in range(rng.randint(1, 8)))
+        categories = "".join(f'<category term="{cat}" scheme="http://arxiv.org/schemas/atom"/>'
+                             for cat in rng.sample(CATEGORIES, rng.randint(1, 3)))
+        return (
+            f"<entry><id>http://arxiv.org/abs/mock.{index:07d}v1</id>"
+            f"<updated>{published}</updated><published>{published}</published>"
+            f"<title>{escape(title)}</title><summary>{escape(abstract)}</summary>"
+            f"{authors}{categories}</entry>"
+        )
+
+    def render_feed(self, query: str, start: int, max_results: int) -> str:
+        """Build the Atom response for a query page"""
+        indices = range(self.papers)
+        match = DATE_RANGE.search(query)
+        if match:
+            low, high = (datetime.strptime(value, "%Y%m%d%H%M").replace(tzinfo=timezone.utc)
+                         for value in match.groups())
+            indices = self.index_range(low, high + timedelta(seconds=59))
+        page = indices[start:start + max_results]
+        entries = "".join(self.render_entry(i) for i in page)
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<feed xmlns="http://www.w3.org/2005/Atom" '
+            'xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/" '
+            'xmlns:arxiv="http://arxiv.org/schemas/atom">'
+            f"<title>Mock arXiv query</title>"
+            f"<opensearch:totalResults>{len(indices)}</opensearch:totalResults>"
+            f"<opensearch:startIndex>{start}</opensearch:startIndex>"
+            f"<opensearch:itemsPerPage>{len(page)}</opensearch:itemsPerPage>"
+            f"{entries}</feed>"
+        )
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path != "/api/query":
+                    self.send_error(404)
+                    return
+
+                with server._lock:
+                    server.calls += 1
+                    fail = server._random.random() < server.error_rate
+                    if fail:
+                        server.errors += 1
+                    delay = server.latency + server._random.uniform(0, server.jitter)
+                if delay:
+                    time.sleep(delay)
+                if fail:
+                    self.send_error(503, "Injected failure")
+                    return
+
+                params = parse_qs(url.query)
+                body = server.render_feed(
+                    params.get('search_query', [''])[0],
+                    int(params.get('start', ['0'])[0]),
+                    int(params.get('max_results', ['10'])[0])
+                ).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/atom+xml; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a mock arXiv API server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--papers", type=int, default=5000, help="Corpus size")
+    parser.add_argument("--spacing-minutes", type=float, default=5, help="Minutes between papers")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of calls answered with 503")
+    args = parser.parse_args()
+
+    server = MockArxivServer(args.host, args.port, args.papers, timedelta(minutes=args.spacing_minutes),
+                             args.latency, args.jitter, args.error_rate)
+    print(f"Mock arXiv API listening on {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"Served {server.get_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Import Profiler - Show which imports dominate application startup
+
+Usage: python scripts/profile_imports.py [--module app] [--top 20]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def profile_imports(module: str) -> list:
+    """Import `module` in a fresh interpreter and return (self_us, cumulative_us, name) rows"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), name.rstrip()))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile import time of the application")
+    parser.add_argument("--module", default="app", help="Module to import (default: app)")
+    parser.add_argument("--top", type=int, default=20, help="Number of imports to list")
+    args = parser.parse_args()
+
+    rows = profile_imports(args.module)
+    total_us = max(cumulative for _, cumulative, _ in rows)
+    print(f"Importing {args.module}: {total_us / 1000:.1f} ms")
+
+    print(f"\nTop {args.top} by cumulative time:")
+    for self_us, cumulative_us, name in sorted(rows, key=lambda r: r[1], reverse=True)[:args.top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+
+    print(f"\nTop {args.top} by self time:")
+    for self_us, cumulative_us, name in sorted(rows, key=lambda r: r[0], reverse=True)[:args.top]:
+        print(f"  {self_us / 1000:8.1f} ms  {name.strip()}")
+
+
+if __name__ == "__main__":
+    main()
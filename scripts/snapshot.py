@@ -0,0 +1,116 @@
+"""
+Cache Snapshot CLI - Create and inspect binary cache snapshots
+
+Snapshots seed a cache without calling arXiv (set CACHE_SNAPSHOT_PATH to load one at startup).
+
+Usage:
+  python scripts/snapshot.py create data/cache.snapshot --from-arxiv [--days-back 2] [--max-results 100]
+  python scripts/snapshot.py create data/cache.snapshot --from-xml response.xml
+  python scripts/snapshot.py create data/cache.snapshot --from-url http://other-host:5001
+  python scripts/snapshot.py inspect data/cache.snapshot
+"""
+import argparse
+import os
+import sys
+import time
+import urllib.request
+from collections import Counter
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.arxiv_service import ArxivService
+from backend.resilience import ArxivFetchError
+from backend.snapshot import (
+    SnapshotError, available_compressions, decode_snapshot, load_snapshot, read_snapshot_info, write_snapshot
+)
+
+
+def create(args) -> None:
+    """Write a snapshot from arXiv, a saved Atom response or a running app"""
+    if args.from_url:
+        url = f"{args.from_url.rstrip('/')}/api/snapshot?compression={args.compression}"
+        with urllib.request.urlopen(url, timeout=60) as response:
+            data = response.read()
+        metadata, papers = decode_snapshot(data)
+        updated = datetime.fromtimestamp(metadata['last_updated']) if metadata['last_updated'] else None
+        generation = metadata['generation']
+    elif args.from_xml:
+        with open(args.from_xml, encoding='utf-8') as f:
+            papers = ArxivService().parse_xml_response(f.read())
+        updated = datetime.fromtimestamp(os.path.getmtime(args.from_xml))
+        generation = 0
+    else:
+        service = ArxivService(base_url=os.environ.get('ARXIV_API_URL'))
+        papers = service.get_daily_ai_papers(days_back=args.days_back, max_results=args.max_results)
+        updated = datetime.now()
+        generation = 0
+
+    metadata = write_snapshot(args.output, papers, generation, updated, args.compression)
+    print(f"Wrote {metadata['papers']} papers to {args.output} "
+          f"({metadata['file_size']:,} bytes, {metadata['compression']})")
+
+
+def inspect(args) -> None:
+    """Print a snapshot's header, contents summary and load time"""
+    info = read_snapshot_info(args.snapshot)
+    started = time.perf_counter()
+    _, papers = load_snapshot(args.snapshot)
+    load_ms = (time.perf_counter() - started) * 1000
+
+    def timestamp(value):
+        return datetime.fromtimestamp(value).strftime("%Y-%m-%d %H:%M:%S") if value else "-"
+
+    print(f"File:          {args.snapshot}")
+    print(f"Version:       {info['version']}")
+    print(f"Compression:   {info['compression']}")
+    print(f"Size:          {info['file_size']:,} bytes ({info['raw_size']:,} uncompressed, "
+          f"{info['raw_size'] / max(info['body_size'], 1):.1f}x)")
+    print(f"Generation:    {info['generation']}")
+    print(f"Cache updated: {timestamp(info['last_updated'])}")
+    print(f"Created:       {timestamp(info['created_at'])}")
+    print(f"Papers:        {info['papers']}")
+    print(f"String table:  {info['strings']} authors and categories")
+    print(f"Load time:     {load_ms:.1f} ms")
+
+    dates = [paper['published_date'] for paper in papers if paper.get('published_date')]
+    if dates:
+        print(f"Published:     {min(dates):%Y-%m-%d %H:%M} to {max(dates):%Y-%m-%d %H:%M}")
+    categories = Counter(cat for paper in papers for cat in paper.get('categories', []))
+    if categories:
+        print("Categories:    " + ", ".join(f"{cat} ({count})" for cat, count in categories.most_common(8)))
+    for paper in papers[:args.papers]:
+        print(f"  {paper.get('arxiv_id')}  {paper.get('title', '')[:80]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create and inspect binary cache snapshots")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    create_parser = commands.add_parser("create", help="Write a snapshot")
+    create_parser.add_argument("output", help="Snapshot file to write")
+    source = create_parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--from-arxiv", action="store_true", help="Fetch from the arXiv API (or ARXIV_API_URL)")
+    source.add_argument("--from-xml", help="Parse a saved arXiv Atom response")
+    source.add_argument("--from-url", help="Download from a running app's /api/snapshot")
+    create_parser.add_argument("--compression", default="gzip", choices=available_compressions())
+    create_parser.add_argument("--days-back", type=int, default=2)
+    create_parser.add_argument("--max-results", type=int, default=100)
+    create_parser.set_defaults(func=create)
+
+    inspect_parser = commands.add_parser("inspect", help="Describe a snapshot")
+    inspect_parser.add_argument("snapshot", help="Snapshot file to read")
+    inspect_parser.add_argument("--papers", type=int, default=5, help="Number of papers to list")
+    inspect_parser.set_defaults(func=inspect)
+
+    args = parser.parse_args()
+    try:
+        args.func(args)
+    except SnapshotError as e:
+        sys.exit(f"Invalid snapshot: {e}")
+    except ArxivFetchError as e:
+        sys.exit(f"Could not get papers: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Shared fixtures - The app wired to an in-process mock arXiv API and temporary data files
+"""
+import os
+import sys
+from datetime import timedelta
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "scripts"))
+
+from mock_arxiv import MockArxivServer
+
+
+@pytest.fixture(scope="session")
+def mock_arxiv_api():
+    server = MockArxivServer(papers=400, spacing=timedelta(minutes=10)).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture(scope="session")
+def app_module(mock_arxiv_api, tmp_path_factory):
+    """app.py configured from the environment, as in production, before its first import"""
+    data = tmp_path_factory.mktemp("data")
+    os.environ.update(
+        ARXIV_API_URL=mock_arxiv_api.url,
+        SAVED_FEEDS_PATH=str(data / "feeds.sqlite3"),
+        REFRESH_MIN_INTERVAL_SECONDS='3600',
+    )
+    import app
+    return app
+
+
+@pytest.fixture(scope="session")
+def client(app_module):
+    """One started app for the session; arXiv calls share a process-wide 1-per-3s rate limit"""
+    from starlette.testclient import TestClient
+    with TestClient(app_module.app) as client:
+        yield client
@@ -0,0 +1,106 @@
+"""
+Columnar tests - The NumPy table and the per-paper fallback select and sort identically, ties included
+"""
+import itertools
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from backend import serializer
+from backend.columnar import numpy_available
+from backend.paper_service import PaperService
+from backend.serializer import PaperSnapshot
+
+CATEGORIES = ['cs.AI', 'cs.LG', 'cs.CL']
+DAY = datetime(2026, 10, 1, 12, tzinfo=timezone.utc)
+
+
+def make_papers() -> list:
+    """Papers with shared dates, titles differing only in case, equal author counts and missing dates"""
+    papers = []
+    for i in range(40):
+        papers.append({
+            'arxiv_id': f"p{i:02d}",
+            'title': ["Graphs", "graphs", "Agents", "Vision"][i % 4],
+            'abstract': "about graphs" if i % 3 else "about agents",
+            'authors': [f"Author {j}" for j in range(i % 3 + 1)],
+            'published_date': None if i % 7 == 0 else DAY - timedelta(days=i % 5, hours=i % 2),
+            'categories': [CATEGORIES[i % 3]] + (['cs.AI'] if i % 4 == 0 else []),
+        })
+    return papers
+
+
+def reference(papers, category, since, until, sort_by, descending) -> list:
+    """Plain Python definition of the selection: filters, then a stable sort with missing dates last"""
+    indices = [
+        i for i, paper in enumerate(papers)
+        if (not category or category in paper['categories'])
+        and (not since or (paper['published_date'] and paper['published_date'].date() >= since))
+        and (not until or (paper['published_date'] and paper['published_date'].date() <= until))
+    ]
+    if sort_by == 'date':
+        dated = [i for i in indices if papers[i]['published_date']]
+        undated = [i for i in indices if not papers[i]['published_date']]
+        return sorted(dated, key=lambda i: papers[i]['published_date'], reverse=descending) + undated
+    if sort_by == 'title':
+        return sorted(indices, key=lambda i: papers[i]['title'].lower(), reverse=descending)
+    if sort_by == 'authors':
+        return sorted(indices, key=lambda i: len(papers[i]['authors']), reverse=descending)
+    return indices
+
+
+QUERIES = list(itertools.product(
+    [None, 'cs.AI', 'cs.CL', 'cs.XX'],
+    [None, (DAY - timedelta(days=2)).date()],
+    [None, (DAY - timedelta(days=1)).date()],
+    [None, 'date', 'title', 'authors'],
+    [True, False],
+))
+
+
+@pytest.fixture(params=['numpy', 'fallback'])
+def snapshot(request, monkeypatch):
+    if request.param == 'numpy' and not numpy_available():
+        pytest.skip("numpy is not installed")
+    if request.param == 'fallback':
+        monkeypatch.setattr(serializer, 'numpy_available', lambda: False)
+    snapshot = PaperSnapshot(make_papers(), generation=1)
+    assert (snapshot.table is not None) == (request.param == 'numpy')
+    return snapshot
+
+
+@pytest.mark.parametrize("category, since, until, sort_by, descending", QUERIES)
+def test_select_matches_reference(snapshot, category, since, until, sort_by, descending):
+    expected = reference(snapshot.papers, category, since, until, sort_by, descending)
+    assert snapshot.select(category, since, until, sort_by=sort_by, descending=descending) == expected
+
+
+def test_descending_ties_keep_cache_order(snapshot):
+    # "Graphs" and "graphs" tie ignoring case; every tie stays in cache order when sorting descending
+    by_title = [snapshot.papers[i]['arxiv_id'] for i in snapshot.select(sort_by='title', descending=True)]
+    vision = [paper['arxiv_id'] for paper in snapshot.papers if paper['title'] == "Vision"]
+    graphs = [paper['arxiv_id'] for paper in snapshot.papers if paper['title'].lower() == "graphs"]
+    assert by_title[:len(vision)] == vision
+    assert by_title[len(vision):len(vision) + len(graphs)] == graphs
+
+
+def test_all_categories(snapshot):
+    assert snapshot.all_categories() == set(CATEGORIES)
+
+
+def test_service_category_filter_uses_the_snapshot(monkeypatch):
+    service = PaperService()
+    papers = make_papers()
+    service.cache_manager.update_cache(papers)
+    current = service.get_snapshot().papers
+
+    calls = []
+    select = PaperSnapshot.select
+    monkeypatch.setattr(PaperSnapshot, 'select',
+                        lambda self, *args, **kwargs: calls.append(args) or select(self, *args, **kwargs))
+    assert service.filter_papers_by_category(current, 'cs.AI') == [p for p in papers if 'cs.AI' in p['categories']]
+    assert calls == [('cs.AI',)]
+    # Lists that are not the current generation are filtered paper by paper
+    subset = papers[:5]
+    assert service.filter_papers_by_category(subset, 'cs.LG') == [p for p in subset if 'cs.LG' in p['categories']]
+    assert len(calls) == 1
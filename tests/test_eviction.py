@@ -0,0 +1,108 @@
+"""
+Eviction tests - Policy order, fixed versus per-paper derived costs, the 90% headroom and bounded retries
+"""
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from backend.cache_manager import EVICTION_TARGET_RATIO, CacheManager
+from backend.eviction import make_eviction_policy
+from backend.paper_service import PaperService
+
+EPOCH = datetime(2026, 10, 1, tzinfo=timezone.utc)
+
+# Bytes of a derived structure that do not depend on the papers, such as a fitted vocabulary
+FIXED_BYTES = 200_000
+
+
+def make_papers(count: int) -> list:
+    """Equal-sized papers, p0 the oldest publication"""
+    return [{'arxiv_id': f"p{i:02d}", 'title': "t" * 50, 'abstract': "a" * 500, 'authors': ["A"],
+             'categories': ['cs.AI'], 'published_date': EPOCH + timedelta(hours=i)}
+            for i in range(count)]
+
+
+def access(policy, *arxiv_ids):
+    for arxiv_id in arxiv_ids:
+        policy.record_access([arxiv_id])
+        # Monotonic clocks can repeat a reading on fast machines
+        time.sleep(0.002)
+
+
+@pytest.mark.parametrize("name, expected", [
+    # Never served first (oldest publication breaking the tie), then least recently served
+    ('lru', ['p00', 'p02', 'p01', 'p03']),
+    # Fewest hits first, then least recent
+    ('lfu', ['p00', 'p03', 'p01', 'p02']),
+    # Oldest publications first, whatever was served
+    ('age', ['p00', 'p01', 'p02', 'p03']),
+])
+def test_eviction_order(name, expected):
+    papers = make_papers(4)
+    policy = make_eviction_policy(name)
+    policy.retain({paper['arxiv_id'] for paper in papers})
+    access(policy, 'p02', 'p02', 'p02', 'p01', 'p01', 'p03')
+    assert [papers[i]['arxiv_id'] for i in policy.eviction_order(papers)] == expected
+
+
+def budgeted_cache(policy: str, papers: list) -> CacheManager:
+    """A cache holding `papers` whose derived structure costs FIXED_BYTES plus twice the papers"""
+    cache = CacheManager(eviction_policy=policy)
+    cache.register_derived('index', lambda: FIXED_BYTES + 2 * cache.memory['papers_bytes'], lambda: FIXED_BYTES)
+    cache.update_cache(papers)
+    return cache
+
+
+@pytest.mark.parametrize("policy", ['lru', 'lfu', 'age'])
+def test_eviction_follows_policy_and_leaves_headroom(policy):
+    papers = make_papers(40)
+    cache = budgeted_cache(policy, papers)
+    access(cache.eviction_policy, 'p05', 'p05', 'p30', 'p01')
+    order = [papers[i]['arxiv_id'] for i in cache.eviction_policy.eviction_order(papers)]
+
+    paper_bytes = cache.memory['papers_bytes']
+    budget = FIXED_BYTES + 3 * paper_bytes * 0.6
+    cache.memory_budget_bytes = budget
+    assert cache.check_budget()
+
+    kept = {paper['arxiv_id'] for paper in cache.get_latest_papers()}
+    evicted = len(papers) - len(kept)
+    assert 0 < evicted < len(papers)
+    assert kept == set(order[evicted:])
+
+    # The kept papers and what is derived from them fill at most 90% of the budget, and evicting
+    # one paper fewer would not have
+    per_paper = paper_bytes / len(papers)
+    projected = FIXED_BYTES + 3 * cache.memory['papers_bytes']
+    assert projected <= budget * EVICTION_TARGET_RATIO
+    assert projected + 3 * per_paper > budget * EVICTION_TARGET_RATIO
+
+
+def test_fixed_costs_do_not_compound_across_generations():
+    cache = budgeted_cache('age', make_papers(40))
+    cache.memory_budget_bytes = FIXED_BYTES + 3 * cache.memory['papers_bytes'] * 0.6
+    assert cache.check_budget()
+    kept = cache.get_latest_papers()
+    evictions = cache.memory['evictions']
+
+    # Refitting the kept papers, as a new generation or another worker would, evicts nothing more
+    # even though the fixed part is now large next to the papers
+    assert cache.fit_budget(kept) == kept
+    assert not cache.check_budget()
+    assert cache.memory['evictions'] == evictions
+
+
+def test_budget_retry_is_bounded(monkeypatch):
+    service = PaperService()
+    service.cache_manager.update_cache(make_papers(10))
+    monkeypatch.setattr(service, '_sync_embeddings', lambda: None)
+    calls = []
+    # A cache that reports itself over budget after every build
+    monkeypatch.setattr(service.cache_manager, 'check_budget', lambda: calls.append(1) or True)
+
+    assert service.get_snapshot().size == 10
+    assert len(calls) == 1
+    calls.clear()
+    assert service.get_feed().xml
+    assert len(calls) <= 2
@@ -0,0 +1,98 @@
+"""
+Atom feed tests - Required entry elements, absolute feed ids, entry reuse and conditional GETs on /feed.xml
+"""
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+from backend.feed_builder import ATOM_NS, AtomFeedBuilder
+
+NS = {'atom': ATOM_NS}
+UPDATED = datetime(2026, 10, 18, 9, 30, tzinfo=timezone.utc)
+
+PAPERS = [
+    {'arxiv_id': "http://arxiv.org/abs/2410.00001v1", 'title': "Dated", 'abstract': "a & b",
+     'authors': ["Ada"], 'categories': ['cs.AI'], 'published_date': UPDATED - timedelta(hours=3)},
+    {'arxiv_id': "http://arxiv.org/abs/2410.00002v1", 'title': "Undated <draft>", 'abstract': "",
+     'authors': [], 'categories': ['cs.AI'], 'published_date': None},
+]
+
+
+def entries(xml: str) -> list:
+    return ET.fromstring(xml).findall('atom:entry', NS)
+
+
+def test_every_entry_has_id_title_and_updated():
+    document = AtomFeedBuilder().build(PAPERS, generation=1, updated=UPDATED)
+    for entry in entries(document.xml):
+        for element in ('id', 'title', 'updated'):
+            assert entry.find(f'atom:{element}', NS) is not None, element
+    dated, undated = entries(document.xml)
+    assert dated.findtext('atom:updated', namespaces=NS) == (UPDATED - timedelta(hours=3)).isoformat()
+    # Undated papers fall back to the feed's own updated time
+    assert undated.findtext('atom:updated', namespaces=NS) == UPDATED.isoformat()
+    assert undated.find('atom:published', NS) is None
+    assert undated.findtext('atom:title', namespaces=NS) == "Undated <draft>"
+
+
+def test_feed_id_is_absolute_against_the_base_url():
+    builder = AtomFeedBuilder()
+    feed = ET.fromstring(builder.build(PAPERS, 1, UPDATED, base_url="https://papers.example/").xml)
+    assert feed.findtext('atom:id', namespaces=NS) == "https://papers.example/feed.xml"
+    assert feed.find('atom:link', NS).get('href') == "https://papers.example/feed.xml"
+
+    feed = ET.fromstring(builder.build(PAPERS, 1, UPDATED, category='cs.AI', base_url="https://papers.example/").xml)
+    assert feed.findtext('atom:id', namespaces=NS) == "https://papers.example/feed.xml?category=cs.AI"
+
+
+def test_entries_are_reused_across_generations_and_base_urls():
+    builder = AtomFeedBuilder()
+    first = builder.build(PAPERS, 1, UPDATED, base_url="http://a/")
+    assert builder.build(PAPERS, 1, UPDATED, base_url="http://a/") is first
+
+    # Another host gets its own ids over the same serialized entries
+    other = builder.build(PAPERS, 1, UPDATED, base_url="http://b/")
+    assert ET.fromstring(other.xml).findtext('atom:id', namespaces=NS) == "http://b/feed.xml"
+    cached = builder._entries['all']
+    second = builder.build(PAPERS[:1], 2, UPDATED + timedelta(hours=1), base_url="http://b/")
+    assert builder._entries['all'][PAPERS[0]['arxiv_id']] is cached[PAPERS[0]['arxiv_id']]
+    assert len(entries(second.xml)) == 1
+    assert second.etag != first.etag
+
+
+def test_feed_over_http_uses_the_request_base_url(client):
+    response = client.get('/feed.xml')
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('application/atom+xml')
+    feed = ET.fromstring(response.text)
+    assert feed.findtext('atom:id', namespaces=NS) == "http://testserver/feed.xml"
+    assert entries(response.text)
+
+
+def test_conditional_get_with_if_none_match(client):
+    etag = client.get('/feed.xml').headers['etag']
+    response = client.get('/feed.xml', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.headers['etag'] == etag
+    assert response.content == b""
+    assert client.get('/feed.xml', headers={'If-None-Match': '"feed-all-g0"'}).status_code == 200
+    # Tags are per category
+    assert client.get('/feed.xml', params={'category': 'cs.AI'}, headers={'If-None-Match': etag}).status_code == 200
+
+
+def test_conditional_get_with_if_modified_since(client):
+    last_modified = client.get('/feed.xml').headers['last-modified']
+    assert client.get('/feed.xml', headers={'If-Modified-Since': last_modified}).status_code == 304
+
+    later = format_datetime(datetime.now(timezone.utc) + timedelta(days=1), usegmt=True)
+    assert client.get('/feed.xml', headers={'If-Modified-Since': later}).status_code == 304
+
+    earlier = format_datetime(datetime(2000, 1, 1, tzinfo=timezone.utc), usegmt=True)
+    assert client.get('/feed.xml', headers={'If-Modified-Since': earlier}).status_code == 200
+    assert client.get('/feed.xml', headers={'If-Modified-Since': "not a date"}).status_code == 200
+
+
+def test_if_none_match_takes_precedence_over_if_modified_since(client):
+    last_modified = client.get('/feed.xml').headers['last-modified']
+    response = client.get('/feed.xml', headers={'If-None-Match': '"stale"', 'If-Modified-Since': last_modified})
+    assert response.status_code == 200
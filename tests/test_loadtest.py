@@ -0,0 +1,87 @@
+"""
+Load test harness tests - Reports with and without the mock arXiv API, and --app-url runs
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import loadtest
+from loadtest import LoadGenerator, parse_mix, print_report, summarize
+
+
+class OkHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def do_POST(self):
+        self.send_response(202 if self.path == "/refresh" else 404)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def serve():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OkHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def generator_with(latencies: list) -> LoadGenerator:
+    generator = LoadGenerator("127.0.0.1", 0, [("/", 1)], rps=10, duration=1, workers=1)
+    generator.latencies['/'] = latencies
+    generator.statuses['/'][200] = len(latencies)
+    return generator
+
+
+def test_report_with_upstream_counts(capsys):
+    report = summarize(generator_with([1.0, 2.0]), 1.0, {'calls': 3, 'errors': 1})
+    assert (report['upstream_calls'], report['upstream_errors']) == (3, 1)
+    print_report(report)
+    assert "Upstream arXiv calls: 3 (errors: 1)" in capsys.readouterr().out
+
+
+def test_report_without_upstream_counts(capsys):
+    report = summarize(generator_with([1.0, 2.0]), 1.0)
+    assert 'upstream_calls' not in report and 'upstream_errors' not in report
+    # A baseline taken against the mock still compares on the keys both reports have
+    print_report(report, baseline={**report, 'throughput_rps': 1.0, 'upstream_calls': 5})
+    out = capsys.readouterr().out
+    assert "Upstream" not in out
+    assert "(1.0 -> +100%)" in out
+
+
+def test_app_url_does_not_start_the_mock(tmp_path, monkeypatch):
+    server = serve()
+    try:
+        for name in ('MockArxivServer', 'start_app'):
+            monkeypatch.setattr(loadtest, name,
+                                lambda *args, name=name, **kwargs: pytest.fail(f"--app-url started {name}"))
+        output = tmp_path / "report.json"
+        monkeypatch.setattr('sys.argv', ['loadtest.py', '--app-url', f"127.0.0.1:{server.server_port}",
+                                         '--rps', '20', '--duration', '0.5', '--mix', '/=1', '--json', str(output)])
+        loadtest.main()
+    finally:
+        server.shutdown()
+    report = json.loads(output.read_text())
+    assert report['routes']['/']['statuses'] == {'200': 10}
+    assert 'upstream_calls' not in report
+
+
+
+def test_mix_routes_can_name_a_method():
+    assert parse_mix("/=5,POST /refresh=1,/?q=a=b=2") == [("/", 5.0), ("POST /refresh", 1.0), ("/?q=a=b", 2.0)]
+    server = serve()
+    try:
+        generator = LoadGenerator("127.0.0.1", server.server_port, [("POST /refresh", 1)], rps=20, duration=0.25,
+                                  workers=2)
+        generator.run()
+    finally:
+        server.shutdown()
+    assert generator.statuses["POST /refresh"] == {202: 5}
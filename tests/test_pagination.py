@@ -0,0 +1,118 @@
+"""
+Pagination tests - Cursor round trips over /api/papers in JSON and NDJSON, stale cursors and ETags
+"""
+import json
+
+import pytest
+
+from backend.serializer import encode_cursor
+
+
+def all_ids(client, **params) -> list:
+    body = client.get('/api/papers', params={**params, 'limit': 500, 'fields': 'arxiv_id'}).json()
+    assert body['next_cursor'] is None
+    return [paper['arxiv_id'] for paper in body['papers']]
+
+
+def walk_json(client, limit: int, **params) -> list:
+    ids, cursor = [], None
+    while True:
+        query = {**params, 'limit': limit, 'fields': 'arxiv_id', **({'cursor': cursor} if cursor else {})}
+        body = client.get('/api/papers', params=query).json()
+        assert body['count'] == len(body['papers']) <= limit
+        ids.extend(paper['arxiv_id'] for paper in body['papers'])
+        cursor = body['next_cursor']
+        if cursor is None:
+            return ids
+
+
+def ndjson_ids(response) -> list:
+    return [json.loads(line)['arxiv_id'] for line in response.text.splitlines()]
+
+
+@pytest.mark.parametrize("params", [{}, {'sort': 'title', 'order': 'desc'}, {'category': 'cs.AI', 'sort': 'date'}])
+def test_json_cursor_round_trip(client, params):
+    expected = all_ids(client, **params)
+    assert len(expected) > 7
+    assert walk_json(client, 7, **params) == expected
+
+
+def test_ndjson_streams_every_match_without_limit(client):
+    response = client.get('/api/papers', params={'format': 'ndjson', 'fields': 'arxiv_id'})
+    assert response.headers['content-type'].startswith('application/x-ndjson')
+    assert 'x-next-cursor' not in response.headers
+    assert ndjson_ids(response) == all_ids(client)
+
+
+@pytest.mark.parametrize("params", [{}, {'sort': 'authors', 'order': 'asc'}])
+def test_ndjson_cursor_round_trip(client, params):
+    ids, cursor = [], None
+    while True:
+        query = {**params, 'format': 'ndjson', 'fields': 'arxiv_id', 'limit': 9,
+                 **({'cursor': cursor} if cursor else {})}
+        response = client.get('/api/papers', params=query)
+        page = ndjson_ids(response)
+        assert len(page) <= 9
+        ids.extend(page)
+        cursor = response.headers.get('x-next-cursor')
+        if cursor is None:
+            break
+    assert ids == all_ids(client, **params)
+
+
+def test_ndjson_with_accept_header_pages_too(client):
+    response = client.get('/api/papers', params={'limit': 3}, headers={'Accept': 'application/x-ndjson'})
+    assert len(ndjson_ids(response)) == 3
+    assert response.headers['x-next-cursor']
+
+
+def test_cursor_from_an_older_generation_gets_409(client, app_module):
+    body = client.get('/api/papers', params={'limit': 5}).json()
+    cursor = body['next_cursor']
+    assert cursor
+
+    cache = app_module.paper_service.cache_manager
+    cache.update_cache(cache.get_latest_papers())
+    generation = cache.get_generation()
+    assert generation == body['generation'] + 1
+
+    for params in ({'cursor': cursor, 'limit': 5}, {'cursor': cursor, 'limit': 5, 'format': 'ndjson'}):
+        response = client.get('/api/papers', params=params)
+        assert response.status_code == 409
+        assert response.json()['generation'] == generation
+    # The first page of the new generation works and its cursor does too
+    cursor = client.get('/api/papers', params={'limit': 5}).json()['next_cursor']
+    assert client.get('/api/papers', params={'limit': 5, 'cursor': cursor}).status_code == 200
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "!!", encode_cursor(-1, 1)])
+def test_malformed_cursor_gets_400(client, cursor):
+    assert client.get('/api/papers', params={'cursor': cursor}).status_code == 400
+
+
+@pytest.mark.parametrize("params, headers", [
+    ({'limit': 5}, {}),
+    ({'limit': 5, 'format': 'ndjson'}, {}),
+    ({'category': 'cs.AI'}, {'Accept': 'application/x-ndjson'}),
+])
+def test_etag_round_trip(client, params, headers):
+    response = client.get('/api/papers', params=params, headers=headers)
+    etag = response.headers['etag']
+    assert response.headers['vary'] == 'Accept'
+
+    response = client.get('/api/papers', params=params, headers={**headers, 'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers['etag'] == etag
+
+    # Another page or format is a different representation
+    other = client.get('/api/papers', params={**params, 'limit': 6}, headers={**headers, 'If-None-Match': etag})
+    assert other.status_code == 200
+    assert other.headers['etag'] != etag
+
+
+def test_json_and_ndjson_etags_differ(client):
+    json_tag = client.get('/api/papers', params={'limit': 5}).headers['etag']
+    ndjson_tag = client.get('/api/papers', params={'limit': 5},
+                            headers={'Accept': 'application/x-ndjson'}).headers['etag']
+    assert json_tag != ndjson_tag
@@ -0,0 +1,64 @@
+"""
+Refresh tests - /refresh only starts work on POST, and throttled requests say how long to wait
+"""
+import pytest
+
+HTMX = {'HX-Request': 'true'}
+
+
+@pytest.fixture
+def no_refresh(app_module, monkeypatch):
+    monkeypatch.setattr(app_module.paper_service, 'request_refresh',
+                        lambda: pytest.fail("a refresh was requested"))
+
+
+def test_get_does_not_start_a_refresh(client, no_refresh):
+    for headers in ({}, HTMX, {'Accept': 'application/json'}):
+        response = client.get('/refresh', headers=headers, follow_redirects=False)
+        assert response.status_code == 405
+
+
+def test_refresh_buttons_post(client, no_refresh):
+    page = client.get('/').text
+    assert 'action="/refresh"' in page and 'method="post"' in page and 'hx-post="/refresh"' in page
+    assert 'href="/refresh"' not in page
+
+
+def test_throttled_post(client, app_module):
+    # The suite runs with a one hour interval, so the warm start throttles every request
+    assert app_module.paper_service.request_refresh()['status'] == 'throttled'
+
+    response = client.post('/refresh', headers={'Accept': 'application/json'})
+    assert response.status_code == 429
+    retry_after = int(response.headers['retry-after'])
+    assert 0 < retry_after <= 3600
+    assert response.json()['retry_after_seconds'] == retry_after
+
+    response = client.post('/refresh', headers=HTMX)
+    assert response.status_code == 200
+    assert response.headers['retry-after']
+    assert 'id="refresh-status"' in response.text
+    assert "try again in" in response.text and 'hx-get' not in response.text
+
+    response = client.post('/refresh', follow_redirects=False)
+    assert response.status_code == 303
+    location = response.headers['location']
+    assert location.startswith('/?retry_after=')
+    assert f"try again in {location.split('=')[1]}s" in client.get(location).text
+
+
+def test_started_post_polls_for_the_new_generation(client, app_module, monkeypatch):
+    service = app_module.paper_service
+    generation = service.cache_manager.get_generation()
+    monkeypatch.setattr(service, 'request_refresh',
+                        lambda: {'status': 'started', 'generation': generation, 'retry_after_seconds': 0})
+
+    response = client.post('/refresh', headers=HTMX)
+    assert response.status_code == 200
+    assert f'hx-get="/refresh/status?since={generation}"' in response.text
+    assert 'retry-after' not in response.headers
+    assert f'/refresh/status?since={generation}&amp;reload=1' in client.post('/refresh?reload=1', headers=HTMX).text
+
+    response = client.post('/refresh', follow_redirects=False)
+    assert (response.status_code, response.headers['location']) == (303, '/')
+    assert client.post('/refresh', headers={'Accept': 'application/json'}).status_code == 202
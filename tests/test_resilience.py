@@ -0,0 +1,131 @@
+"""
+Resilience tests - Circuit breaker transitions around bad arXiv responses and non-blocking reads of
+the last known good papers while a fetch is in flight
+"""
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from backend.arxiv_service import ArxivService
+from backend.cache_manager import CacheManager
+from backend.resilience import ArxivFetchError, CircuitBreaker, TokenBucket
+
+FEED = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<feed xmlns="http://www.w3.org/2005/Atom">'
+    '<entry><id>http://arxiv.org/abs/2401.00001v1</id><title>A paper</title>'
+    '<summary>About things</summary><published>{published}</published>'
+    '<author><name>Ada</name></author><category term="cs.AI"/></entry>'
+    '</feed>'
+)
+
+
+class ScriptedArxiv:
+    """HTTP server answering each request with the next (status, body) from a script"""
+
+    def __init__(self):
+        self.script = []
+        self.calls = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.calls += 1
+                status, body = server.script.pop(0)
+                data = body.encode()
+                self.send_response(status)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/api/query"
+
+
+@pytest.fixture
+def arxiv():
+    server = ScriptedArxiv()
+    yield server
+    server.httpd.shutdown()
+    server.httpd.server_close()
+
+
+def feed_now() -> str:
+    return FEED.format(published=time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()))
+
+
+def test_breaker_recovers_after_an_empty_half_open_trial(arxiv):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout_seconds=0.05)
+    service = ArxivService(circuit_breaker=breaker, rate_limiter=TokenBucket(1000), base_url=arxiv.url)
+
+    # closed -> open after two failed calls
+    arxiv.script = [(503, "down"), (503, "down")]
+    for _ in range(2):
+        with pytest.raises(ArxivFetchError):
+            service.get_daily_ai_papers()
+    assert breaker.get_status()['state'] == CircuitBreaker.OPEN
+
+    # Open: calls fail fast without reaching arXiv
+    with pytest.raises(ArxivFetchError):
+        service.get_daily_ai_papers()
+    assert arxiv.calls == 2
+
+    # half-open trial answered 200 with an empty body: a failure that reopens the circuit
+    time.sleep(0.06)
+    arxiv.script = [(200, "")]
+    with pytest.raises(ArxivFetchError):
+        service.get_daily_ai_papers()
+    assert arxiv.calls == 3
+    assert breaker.get_status()['state'] == CircuitBreaker.OPEN
+
+    # The next trial is allowed and closes the circuit
+    time.sleep(0.06)
+    arxiv.script = [(200, feed_now())]
+    papers = service.get_daily_ai_papers()
+    assert [paper['arxiv_id'] for paper in papers] == ["http://arxiv.org/abs/2401.00001v1"]
+    assert breaker.get_status()['state'] == CircuitBreaker.CLOSED
+    assert breaker.get_status()['failures'] == 0
+
+
+def test_malformed_body_counts_as_failure(arxiv):
+    breaker = CircuitBreaker(failure_threshold=5)
+    service = ArxivService(circuit_breaker=breaker, rate_limiter=TokenBucket(1000), base_url=arxiv.url)
+    arxiv.script = [(200, "<html>maintenance</html>")]
+    with pytest.raises(ArxivFetchError):
+        service.get_daily_ai_papers()
+    assert breaker.get_status()['failures'] == 1
+
+
+def test_waiters_get_cached_papers_without_blocking_on_a_fetch():
+    cache = CacheManager()
+    cache.update_cache([{'arxiv_id': 'a'}])
+    assert cache.acquire_fetch_lock()
+    try:
+        started = time.monotonic()
+        assert cache.wait_for_papers() == [{'arxiv_id': 'a'}]
+        assert time.monotonic() - started < 0.1
+    finally:
+        cache.release_fetch_lock()
+
+
+def test_cold_waiters_wait_for_the_fetch():
+    cache = CacheManager()
+    assert cache.acquire_fetch_lock()
+
+    def fetch():
+        time.sleep(0.1)
+        cache.update_cache([{'arxiv_id': 'b'}])
+        cache.release_fetch_lock()
+
+    threading.Thread(target=fetch).start()
+    assert cache.wait_for_papers() == [{'arxiv_id': 'b'}]
@@ -0,0 +1,121 @@
+"""
+Saved feed tests - Incremental evaluation across generations and validation of the JSON API
+"""
+import random
+
+import pytest
+
+from backend.saved_feeds import FeedStore, SavedFeeds, normalize_author, text_terms
+
+CATEGORIES = ['cs.AI', 'cs.LG', 'cs.CL', 'cs.CV']
+WORDS = ['graph', 'neural', 'language', 'model', 'vision', 'robust', 'agent', 'policy', 'sparse', 'kernel']
+AUTHORS = ['Ada Lovelace', 'Alan Turing', 'Grace Hopper', 'Edsger Dijkstra']
+
+
+def make_paper(i: int) -> dict:
+    rng = random.Random(i)
+    return {
+        'arxiv_id': f"p{i}",
+        'title': " ".join(rng.sample(WORDS, 3)),
+        'abstract': " ".join(rng.choices(WORDS, k=12)),
+        'authors': rng.sample(AUTHORS, rng.randint(1, 2)),
+        'categories': rng.sample(CATEGORIES, rng.randint(1, 2)),
+    }
+
+
+def matches(feed: dict, paper: dict) -> bool:
+    """Reference definition of a saved feed match, one paper at a time"""
+    if feed['categories'] and not set(feed['categories']) & set(paper['categories']):
+        return False
+    if not (feed['keywords'] or feed['authors']):
+        return True
+    terms = text_terms(f"{paper['title']} {paper['abstract']}")
+    authors = {normalize_author(author) for author in paper['authors']}
+    return (any(set(keyword.split()) <= terms for keyword in feed['keywords'])
+            or any(normalize_author(author) in authors for author in feed['authors']))
+
+
+def expected_ids(feed: dict, papers: list) -> list:
+    return [paper['arxiv_id'] for paper in papers if matches(feed, paper)]
+
+
+@pytest.fixture
+def saved_feeds(tmp_path):
+    return SavedFeeds(FeedStore(str(tmp_path / "feeds.sqlite3")), poll_interval_seconds=0)
+
+
+def test_results_follow_added_and_dropped_papers(saved_feeds):
+    store = saved_feeds.store
+    feeds = [
+        store.save_feed("categories", categories=['cs.AI', 'cs.CL']),
+        store.save_feed("keywords", keywords=['graph neural', 'Vision']),
+        store.save_feed("authors in category", categories=['cs.LG'], authors=['alan  TURING']),
+    ]
+
+    generations = [
+        [make_paper(i) for i in range(0, 60)],
+        [make_paper(i) for i in range(20, 90)],    # drops 0-19, adds 60-89
+        [make_paper(i) for i in range(85, 95)],    # drops almost everything
+        [make_paper(i) for i in range(0, 120)],    # brings dropped papers back
+    ]
+    for generation, papers in enumerate(generations, start=1):
+        saved_feeds.sync(papers, generation)
+        for feed in feeds:
+            assert saved_feeds.get_result_ids(feed['id']) == expected_ids(feed, papers)
+        assert set(saved_feeds.index.keys_by_id) == {paper['arxiv_id'] for paper in papers}
+
+
+def test_edited_and_deleted_feeds_are_reevaluated(saved_feeds):
+    store = saved_feeds.store
+    papers = [make_paper(i) for i in range(50)]
+    feed = store.save_feed("f", categories=['cs.AI'])
+    saved_feeds.sync(papers, 1)
+    assert saved_feeds.get_result_ids(feed['id']) == expected_ids(feed, papers)
+
+    edited = store.save_feed("f", keywords=['sparse kernel'], feed_id=feed['id'])
+    saved_feeds.sync(papers, 1)
+    assert saved_feeds.get_result_ids(feed['id']) == expected_ids(edited, papers)
+
+    store.delete_feed(feed['id'])
+    saved_feeds.sync(papers, 1)
+    assert saved_feeds.get_result_ids(feed['id']) is None
+
+
+def test_memory_accounting_returns_to_zero_when_the_cache_empties(saved_feeds):
+    saved_feeds.store.save_feed("f", categories=['cs.AI'])
+    saved_feeds.sync([make_paper(i) for i in range(40)], 1)
+    assert saved_feeds.index.nbytes > 0
+    saved_feeds.sync([], 2)
+    assert saved_feeds.index.nbytes == 0
+
+
+@pytest.mark.parametrize("body, content_type", [
+    (b'{"name": "x", "categories": ["cs.AI"', 'application/json'),
+    (b'not json at all', 'application/json'),
+    (b'["cs.AI"]', 'application/json'),
+    (b'"cs.AI"', 'application/json'),
+    (b'\xff\xfe', 'application/json'),
+    (b'{"name": "x", "categories": "cs.AI"}', 'application/json'),
+    (b'{"name": "x", "categories": 5}', 'application/json'),
+    (b'{"name": 3, "categories": ["cs.AI"]}', 'application/json'),
+    (b'{"name": "x", "keywords": ["graph", 2]}', 'application/json'),
+    (b'{"name": "x"}', 'application/json'),
+    (b'{"name": "x", "categories": ["cs.AI"]', 'text/plain'),
+])
+def test_create_feed_rejects_bad_bodies(client, body, content_type):
+    response = client.post('/api/feeds', content=body, headers={'Content-Type': content_type})
+    assert response.status_code == 400
+    assert 'error' in response.json()
+
+
+def test_create_feed_round_trip(client):
+    response = client.post('/api/feeds', json={'name': 'AI', 'categories': ['cs.AI'], 'keywords': ['graph']})
+    assert response.status_code == 201
+    feed_id = response.json()['id']
+    assert response.headers['location'] == f"/api/feeds/{feed_id}"
+
+    saved = client.get(f"/api/feeds/{feed_id}").json()
+    assert saved['name'] == 'AI'
+    assert saved['categories'] == ['cs.AI']
+    assert client.delete(f"/api/feeds/{feed_id}").status_code in (200, 204)
+    assert client.get(f"/api/feeds/{feed_id}").status_code == 404
@@ -0,0 +1,123 @@
+"""
+Shared cache tests - Fetch leases between workers, published generations and the global memory budget
+"""
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from backend.shared_cache import SharedCacheManager
+
+
+def make_papers(start: int, count: int) -> list:
+    return [{'arxiv_id': f"p{i}", 'title': f"Paper {i}", 'abstract': "x" * 200, 'categories': ['cs.AI']}
+            for i in range(start, start + count)]
+
+
+@pytest.fixture
+def workers(tmp_path):
+    """Two cache managers on one store, as two worker processes would hold them"""
+    path = str(tmp_path / "cache.sqlite3")
+    managers = []
+    for name in ("worker-a", "worker-b"):
+        manager = SharedCacheManager(path, poll_interval_seconds=0, lease_seconds=60, wait_seconds=5)
+        # In-process workers share a pid, so give each its own lease owner
+        manager.owner = name
+        managers.append(manager)
+    return managers
+
+
+def test_only_one_worker_holds_the_fetch_lease(workers):
+    a, b = workers
+    assert a.acquire_fetch_lock()
+    assert not b.acquire_fetch_lock()
+    assert b.is_fetching()
+    assert b.get_cache_info()['fetcher'] == "worker-a"
+
+    a.release_fetch_lock()
+    assert not b.is_fetching()
+    assert b.acquire_fetch_lock()
+    b.release_fetch_lock()
+
+
+def test_expired_lease_is_taken_over(workers):
+    a, b = workers
+    a.lease_seconds = 0.05
+    assert a.acquire_fetch_lock()
+    time.sleep(0.1)
+    # worker-a stalled without releasing; its lease lapses and worker-b becomes the fetcher
+    assert not b.is_fetching()
+    assert b.acquire_fetch_lock()
+    b.release_fetch_lock()
+
+
+def test_published_generation_reaches_other_workers(workers):
+    a, b = workers
+    a.update_cache(make_papers(0, 10))
+    assert b.get_generation() == a.get_generation()
+    assert [paper['arxiv_id'] for paper in b.get_latest_papers()] == [f"p{i}" for i in range(10)]
+    assert b.is_cache_valid()
+
+
+def test_cold_worker_waits_for_the_fetcher(workers):
+    a, b = workers
+    assert a.acquire_fetch_lock()
+
+    def fetch():
+        time.sleep(0.2)
+        a.update_cache(make_papers(0, 3))
+        a.release_fetch_lock()
+
+    threading.Thread(target=fetch).start()
+    assert [paper['arxiv_id'] for paper in b.wait_for_papers()] == ["p0", "p1", "p2"]
+
+
+def test_budget_eviction_is_published_to_every_worker(workers):
+    a, b = workers
+    papers = make_papers(0, 50)
+    a.update_cache(papers)
+    b.get_latest_papers()
+
+    # A derived structure grows past the budget after the generation was installed
+    paper_bytes = a.memory['papers_bytes']
+    a.memory_budget_bytes = b.memory_budget_bytes = paper_bytes * 2
+    for manager in workers:
+        manager.register_derived('index', lambda: paper_bytes * 2)
+    generation = a.get_generation()
+
+    assert a.check_budget()
+    kept = [paper['arxiv_id'] for paper in a.get_latest_papers()]
+    assert 0 < len(kept) < len(papers)
+    assert a.get_generation() == generation + 1
+    assert [paper['arxiv_id'] for paper in b.get_latest_papers()] == kept
+    assert b.get_generation() == a.get_generation()
+
+
+def test_concurrent_syncs_never_install_an_older_generation(workers):
+    a, b = workers
+    done = threading.Event()
+    observed = [[] for _ in range(4)]
+
+    def reader(generations):
+        while not done.is_set():
+            b.sync(force=True)
+            generations.append(b.cache['generation'])
+
+    readers = [threading.Thread(target=reader, args=(generations,)) for generations in observed]
+    for thread in readers:
+        thread.start()
+    # Both workers publish; worker-b installs its own generations while its readers sync
+    for i in range(20):
+        if i % 2:
+            b.load_papers(make_papers(i, 5), datetime.now())
+        else:
+            a.update_cache(make_papers(i, 5))
+    done.set()
+    for thread in readers:
+        thread.join()
+
+    for generations in observed:
+        assert generations == sorted(generations)
+    assert b.get_generation() == a.store.latest_generation()
+    assert [paper['arxiv_id'] for paper in b.get_latest_papers()] == [f"p{i}" for i in range(19, 24)]
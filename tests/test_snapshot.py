@@ -0,0 +1,167 @@
+"""
+Snapshot tests - Binary round trips, rejection of truncated or corrupt files and the /api/snapshot ETag
+"""
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from backend.paper_service import PaperService
+from backend.snapshot import (
+    PREAMBLE, SnapshotError, available_compressions, decode_snapshot, encode_snapshot, load_snapshot,
+    read_snapshot_info, write_snapshot
+)
+
+UPDATED = datetime(2026, 10, 18, 9, 30)
+
+PAPERS = [
+    {'arxiv_id': "http://arxiv.org/abs/2410.00001v1", 'title': "Graphs", 'abstract': "About graphs",
+     'authors': ["Ada Lovelace", "Alan Turing"], 'categories': ['cs.AI', 'cs.LG'],
+     'published_date': datetime(2026, 10, 17, 12, 0, 1, 250, tzinfo=timezone.utc),
+     'published_date_str': "2026-10-17T12:00:01Z"},
+    {'arxiv_id': "http://arxiv.org/abs/2410.00002v2", 'title': "Sprachmodelle für Übersetzung", 'abstract': "",
+     'authors': ["Ada Lovelace"], 'categories': ['cs.CL'],
+     'published_date': datetime(2026, 10, 17, 8, tzinfo=timezone(timedelta(hours=-5))),
+     'published_date_str': "2026-10-17T08:00:00-05:00", 'pdf_url': "http://arxiv.org/pdf/2410.00002v2"},
+    {'arxiv_id': "http://arxiv.org/abs/2410.00003v1", 'title': "Undated", 'abstract': "No date",
+     'authors': [], 'categories': [], 'published_date': None, 'published_date_str': ""},
+]
+
+
+def metadata_end(data: bytes) -> int:
+    """Offset where the metadata JSON ends and the body starts"""
+    return PREAMBLE.size + PREAMBLE.unpack_from(data, 0)[3]
+
+
+def rebuild(data: bytes, **changes) -> bytes:
+    """Rewrite a snapshot's metadata JSON, keeping its preamble fields and body"""
+    magic, version, codec, _ = PREAMBLE.unpack_from(data, 0)
+    metadata = json.loads(data[PREAMBLE.size:metadata_end(data)])
+    metadata.update(changes)
+    for key in [key for key, value in changes.items() if value is ...]:
+        del metadata[key]
+    encoded = json.dumps(metadata).encode()
+    return PREAMBLE.pack(magic, version, codec, len(encoded)) + encoded + data[metadata_end(data):]
+
+
+@pytest.mark.parametrize("compression", available_compressions())
+def test_round_trip(compression):
+    data = encode_snapshot(PAPERS, generation=7, last_updated=UPDATED, compression=compression)
+    metadata, papers = decode_snapshot(data)
+    assert papers == PAPERS
+    assert papers[1]['published_date'].utcoffset() == timedelta(hours=-5)
+    assert metadata['generation'] == 7
+    assert metadata['papers'] == len(PAPERS)
+    assert metadata['compression'] == compression
+    assert datetime.fromtimestamp(metadata['last_updated']) == UPDATED
+
+
+def test_file_round_trip_and_info(tmp_path):
+    path = str(tmp_path / "cache.snapshot")
+    written = write_snapshot(path, PAPERS, generation=3, last_updated=UPDATED)
+    metadata, papers = load_snapshot(path)
+    assert papers == PAPERS
+    info = read_snapshot_info(path)
+    assert info['file_size'] == written['file_size'] == metadata['file_size']
+    assert info['crc32'] == written['crc32']
+
+
+@pytest.mark.parametrize("compression", ['none', 'gzip'])
+@pytest.mark.parametrize("length", [
+    pytest.param(lambda data: PREAMBLE.size - 2, id="preamble"),
+    pytest.param(lambda data: metadata_end(data) - 5, id="metadata"),
+    pytest.param(lambda data: metadata_end(data) + 30, id="body"),
+    pytest.param(lambda data: len(data) - 1, id="last-byte"),
+])
+def test_truncated_snapshot_is_rejected(compression, length):
+    data = encode_snapshot(PAPERS, compression=compression)
+    with pytest.raises(SnapshotError):
+        decode_snapshot(data[:length(data)])
+
+
+def test_empty_and_foreign_files_are_rejected(tmp_path):
+    empty = tmp_path / "empty.snapshot"
+    empty.write_bytes(b"")
+    with pytest.raises(SnapshotError):
+        load_snapshot(str(empty))
+    with pytest.raises(SnapshotError, match="Not a cache snapshot"):
+        decode_snapshot(b"<?xml version='1.0'?><feed/>" + b"\0" * 16)
+
+
+def test_checksum_mismatch_is_rejected():
+    data = bytearray(encode_snapshot(PAPERS, compression='none'))
+    # Flip one byte of the last paper's abstract text; the record still parses but the CRC does not match
+    position = data.rindex(b"No date")
+    data[position] ^= 0x20
+    with pytest.raises(SnapshotError, match="checksum"):
+        decode_snapshot(bytes(data))
+
+
+@pytest.mark.parametrize("changes", [
+    {'generation': "7"},
+    {'papers': True},
+    {'body_size': 1.5},
+    {'crc32': None},
+    {'last_updated': "yesterday"},
+    {'raw_size': ...},
+    {'strings': [1]},
+])
+def test_bad_metadata_types_are_rejected(changes):
+    data = rebuild(encode_snapshot(PAPERS, generation=7, last_updated=UPDATED), **changes)
+    with pytest.raises(SnapshotError, match="metadata"):
+        decode_snapshot(data)
+
+
+def test_metadata_that_is_not_an_object_is_rejected():
+    data = encode_snapshot(PAPERS)
+    magic, version, codec, _ = PREAMBLE.unpack_from(data, 0)
+    metadata = b"[1, 2, 3]"
+    data = PREAMBLE.pack(magic, version, codec, len(metadata)) + metadata + data[metadata_end(data):]
+    with pytest.raises(SnapshotError, match="not a JSON object"):
+        decode_snapshot(data)
+
+
+def test_body_size_beyond_the_file_is_rejected():
+    data = encode_snapshot(PAPERS)
+    body_size = json.loads(data[PREAMBLE.size:metadata_end(data)])['body_size']
+    with pytest.raises(SnapshotError, match="Truncated"):
+        decode_snapshot(rebuild(data, body_size=body_size + 100))
+
+
+def test_corrupt_snapshot_does_not_stop_a_warm_start(tmp_path):
+    path = tmp_path / "cache.snapshot"
+    path.write_bytes(encode_snapshot(PAPERS)[:-20])
+    service = PaperService(snapshot_path=str(path))
+    assert service.warm_start() is None
+    assert service.cache_manager.get_latest_papers() == []
+
+
+def test_api_snapshot_round_trip_and_etag(client, app_module):
+    papers = client.get('/api/papers', params={'limit': 500}).json()['papers']
+    assert papers
+    generation = app_module.paper_service.cache_manager.get_generation()
+
+    response = client.get('/api/snapshot')
+    assert response.status_code == 200
+    etag = response.headers['etag']
+    assert etag == f'"snapshot-{generation}-gzip"'
+    metadata, snapshot_papers = decode_snapshot(response.content)
+    assert metadata['generation'] == generation
+    assert [paper['arxiv_id'] for paper in snapshot_papers] == [paper['arxiv_id'] for paper in papers]
+
+    response = client.get('/api/snapshot', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    # The tag names the compression, so another encoding is sent in full
+    response = client.get('/api/snapshot', params={'compression': 'none'}, headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert decode_snapshot(response.content)[1] == snapshot_papers
+
+    assert client.get('/api/snapshot', params={'compression': 'lz4'}).status_code == 400
+
+
+def test_api_snapshot_does_not_fetch(client, app_module, monkeypatch):
+    monkeypatch.setattr(app_module.paper_service, 'get_papers',
+                        lambda *args, **kwargs: pytest.fail("the snapshot export fetched from arXiv"))
+    assert client.get('/api/snapshot').status_code == 200
+
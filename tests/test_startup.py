@@ -0,0 +1,31 @@
+"""
+Startup tests - Importing the app stays cheap and a fresh server answers within the startup budget
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from benchmarks.startup_benchmark import DEFAULT_BUDGET_SECONDS, ROOT, time_to_first_request
+
+# Modules that must not load before the first request
+HEAVY_MODULES = ('IPython', 'requests', 'numpy', 'uvicorn')
+
+
+def test_import_builds_no_services_and_skips_heavy_modules():
+    script = (
+        "import json, sys, app\n"
+        f"print(json.dumps({{'services': [app.paper_service is not None, app.live_feed is not None],"
+        f" 'heavy': [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))"
+    )
+    result = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True,
+                            check=True)
+    report = json.loads(result.stdout.splitlines()[-1])
+    assert report == {'services': [False, False], 'heavy': []}
+
+
+def test_time_to_first_request_within_budget():
+    budget = float(os.environ.get("STARTUP_BUDGET_SECONDS", DEFAULT_BUDGET_SECONDS))
+    timings = [time_to_first_request() for _ in range(3)]
+    assert statistics.median(timings) <= budget, f"startup took {timings} s, budget {budget} s"